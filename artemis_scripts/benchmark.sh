@@ -4,7 +4,16 @@
 DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" >/dev/null 2>&1 && pwd )"
 source "$DIR/variables.sh"
 
+# Raw timings are kept so runs can be compared statistically
+RESULTS=".benchmarks/latest.json"
+mkdir -p .benchmarks
+
 # Populate BENCHMARK with the benchmark command
-BENCHMARK="poetry run pytest --benchmark-only tests/"
+BENCHMARK="poetry run pytest --benchmark-only --benchmark-json=$RESULTS --benchmark-save-data tests/"
 echo "Running benchmark command: $BENCHMARK"
-eval $BENCHMARK
+eval $BENCHMARK || exit $?
+
+# Record the run and fail on significant slowdowns against the previous run
+HISTORY="poetry run python -m llm_benchmark.bench.history"
+eval $HISTORY record $RESULTS || exit $?
+eval $HISTORY compare
@@ -1,6 +1,26 @@
 import sys
 import os
 
+import pytest
+
 # Ensure the src/ directory is on sys.path so pytest can import
 # llm_benchmark without requiring a full package installation.
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
+
+pytest_plugins = ["llm_benchmark.bench.memory", "pytester"]
+
+
+def pytest_configure(config):
+    # Read by llm_benchmark.bench.runner, which keeps these tests unpinned
+    config.addinivalue_line(
+        "markers", "multiprocess: benchmark that starts worker processes"
+    )
+
+
+@pytest.fixture
+def benchmark(request):
+    # Replaces pytest-benchmark's fixture to add tracemalloc measurements and
+    # budgets under --benchmark-memory
+    from llm_benchmark.bench.memory import benchmark_fixture
+
+    yield from benchmark_fixture(request)
@@ -1,132 +1,285 @@
+import contextlib
+import io
 import logging
+import logging.handlers
 import os
-from llm_benchmark.algorithms.primes import Primes
-from llm_benchmark.algorithms.sort import Sort
-from llm_benchmark.control.double import DoubleForLoop
-from llm_benchmark.control.single import SingleForLoop
-from llm_benchmark.generator.gen_list import GenList
-from llm_benchmark.sql.query import SqlQuery
-from llm_benchmark.datastructures.dslist import DsList
-from llm_benchmark.strings.strops import StrOps
+import queue
+import sys
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import llm_benchmark
+
+if TYPE_CHECKING:
+    import argparse
 
 # ============================================================================
 # LOGGING CONFIGURATION
 # ============================================================================
 
-# Create logs directory if it doesn't exist
 LOGS_DIR = "logs"
-if not os.path.exists(LOGS_DIR):
-    os.makedirs(LOGS_DIR, exist_ok=True)
 
 # Configure logging format
 LOG_FORMAT = "%(asctime)s - %(levelname)s - %(funcName)s - %(message)s"
 LOG_DATEFORMAT = "%Y-%m-%d %H:%M:%S"
 
-# Initialize root logger
-logger = logging.getLogger()
-logger.setLevel(logging.DEBUG)
+# Default level, overridable without code changes
+LOG_LEVEL = os.environ.get("LLM_BENCHMARK_LOG_LEVEL", "INFO")
+
+# Rotate main.log at 10 MiB and keep 3 old files
+LOG_MAX_BYTES = 10 << 20
+LOG_BACKUP_COUNT = 3
+
+logger = logging.getLogger(__name__)
+
+
+class BatchingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that flushes in batches instead of per record.
+
+    The file is flushed once capacity records are pending, when a record at
+    flush_level or above arrives, when flush_interval seconds have passed
+    since the last flush (checked as records arrive) and on close. Sizes for
+    rotation are counted in characters.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int = LOG_MAX_BYTES,
+        backup_count: int = LOG_BACKUP_COUNT,
+        capacity: int = 256,
+        flush_interval: float = 1.0,
+        flush_level: int = logging.ERROR,
+    ) -> None:
+        super().__init__(
+            filename, maxBytes=max_bytes, backupCount=backup_count, delay=True
+        )
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self._pending = 0
+        self._size = 0
+        self._last_flush = time.monotonic()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+                self._size = self.stream.tell()
+            # Track the size instead of using shouldRollover(), which seeks
+            # and so flushes on every record
+            if 0 < self.maxBytes < self._size + len(msg) and self._size:
+                self.doRollover()
+                self.stream = self._open()
+                self._size = 0
+            self.stream.write(msg)
+            self._size += len(msg)
+            self._pending += 1
+            if (
+                self._pending >= self.capacity
+                or record.levelno >= self.flush_level
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        super().flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+
+class LogListener(logging.handlers.QueueListener):
+    """QueueListener that flushes and closes its handlers when stopped."""
+
+    def stop(self) -> None:
+        super().stop()
+        for handler in self.handlers:
+            handler.close()
+
+
+def configure_logging(
+    logs_dir: str = LOGS_DIR,
+    level: Union[int, str] = LOG_LEVEL,
+    console: bool = True,
+    max_bytes: int = LOG_MAX_BYTES,
+    backup_count: int = LOG_BACKUP_COUNT,
+) -> LogListener:
+    """Send root logger output to logs_dir/main.log and the console
+
+    Log calls only put the record on a queue; a QueueListener thread
+    formats it and does the file and console I/O. Called from main() rather
+    than at import time, so importing this module creates no files and
+    leaves existing handlers alone.
+
+    Args:
+        logs_dir (str): Directory of the log file, created if missing
+        level (Union[int, str]): Root logger level, e.g. "DEBUG"
+        console (bool): Also write records to stderr
+        max_bytes (int): Size at which main.log is rotated
+        backup_count (int): Number of rotated files kept
+
+    Returns:
+        LogListener: The started listener; stop() it to flush and close the
+            handlers
+    """
+    os.makedirs(logs_dir, exist_ok=True)
+    formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATEFORMAT)
+
+    # Configure the handlers run by the listener thread
+    file_handler = BatchingRotatingFileHandler(
+        os.path.join(logs_dir, "main.log"), max_bytes, backup_count
+    )
+    file_handler.setFormatter(formatter)
+    handlers = [file_handler]
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = LogListener(log_queue, *handlers, respect_handler_level=True)
 
-# Remove any existing handlers to avoid duplicate logs
-logger.handlers.clear()
+    # Initialize root logger
+    root = logging.getLogger()
+    root.setLevel(level)
 
-# Configure FileHandler
-file_handler = logging.FileHandler(os.path.join(LOGS_DIR, "main.log"))
-file_handler.setLevel(logging.DEBUG)
-file_formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATEFORMAT)
-file_handler.setFormatter(file_formatter)
-logger.addHandler(file_handler)
+    # Remove any existing handlers to avoid duplicate logs
+    root.handlers.clear()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
 
-# Configure StreamHandler (console output)
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.DEBUG)
-console_formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATEFORMAT)
-console_handler.setFormatter(console_formatter)
-logger.addHandler(console_handler)
+    listener.start()
+    root.info("Logging infrastructure initialized")
+    return listener
 
-# Log initialization message
-logger.info("Logging infrastructure initialized")
 
+def single(n: int = 10):
+    SingleForLoop = llm_benchmark.SingleForLoop
 
-def single():
     print("SingleForLoop")
     print("-------------")
 
-    print(f"sum_range(10): {SingleForLoop.sum_range(10)}")
+    print(f"sum_range({n}): {SingleForLoop.sum_range(n)}")
     print(f"max_list([1, 2, 3]): {SingleForLoop.max_list([1, 2, 3])}")
-    print(f"sum_modulus(100, 3): {SingleForLoop.sum_modulus(100, 3)}")
+    print(f"sum_modulus({10 * n}, 3): {SingleForLoop.sum_modulus(10 * n, 3)}")
     print()
 
 
-def double():
+def double(n: int = 10, efficient: bool = False):
+    DoubleForLoop = llm_benchmark.DoubleForLoop
+    GenList = llm_benchmark.GenList
+    # The efficient variants draw random numbers in bulk into typed arrays
+    random_list = GenList.fast_random_list if efficient else GenList.random_list
+    random_matrix = (
+        GenList.random_compact_matrix if efficient else GenList.random_matrix
+    )
+
     print("DoubleForLoop")
     print("-------------")
 
-    print(f"sum_square(10): {DoubleForLoop.sum_square(10)}")
-    print(f"sum_triangle(10): {DoubleForLoop.sum_triangle(10)}")
+    print(f"sum_square({n}): {DoubleForLoop.sum_square(n)}")
+    print(f"sum_triangle({n}): {DoubleForLoop.sum_triangle(n)}")
     print(
-        f"count_pairs(random_list(30, 10)): {DoubleForLoop.count_pairs(GenList.random_list(30, 10))}"
+        f"count_pairs(random_list({3 * n}, 10)): {DoubleForLoop.count_pairs(random_list(3 * n, 10))}"
     )
     print(
-        "count_duplicates(10, 10)",
-        DoubleForLoop.count_duplicates(
-            GenList.random_list(10, 2), GenList.random_list(10, 2)
-        ),
+        f"count_duplicates({n}, {n})",
+        DoubleForLoop.count_duplicates(random_list(n, 2), random_list(n, 2)),
     )
     print(
-        f"sum_matrix(random_matrix(10, 10)): {DoubleForLoop.sum_matrix(GenList.random_matrix(10, 10))}"
+        f"sum_matrix(random_matrix({n}, 10)): {DoubleForLoop.sum_matrix(random_matrix(n, 10))}"
     )
     print()
 
 
-def sql():
+def sql(efficient: bool = False):
+    # Imported here: SqlQuery imports it anyway, only once this section runs
+    import sqlite3
+
+    SqlQuery = llm_benchmark.SqlQuery
+    db_path = llm_benchmark.sql.query.DB_PATH
+    # The efficient variant shares one connection instead of opening one per
+    # query
+    db = sqlite3.connect(db_path) if efficient else db_path
+
     print("SQL")
     print("---")
 
-    print(f"query_album('Presence'): {SqlQuery.query_album('Presence')}")
-    print(f"query_album('Roundabout'): {SqlQuery.query_album('Roundabout')}")
-    print()
+    try:
+        print(f"query_album('Presence'): {SqlQuery.query_album('Presence', db)}")
+        print(f"query_album('Roundabout'): {SqlQuery.query_album('Roundabout', db)}")
+        print()
 
-    print("join_albums()")
-    print(SqlQuery.join_albums()[0])
-    print()
+        print("join_albums()")
+        print(SqlQuery.join_albums(db)[0])
+        print()
 
-    print("top_invoices()")
-    print(SqlQuery.top_invoices())
-    print()
+        print("top_invoices()")
+        print(SqlQuery.top_invoices(db))
+        print()
+    finally:
+        if efficient:
+            db.close()
+
+
+def primes(n: int = 1700, efficient: bool = False):
+    Primes = llm_benchmark.Primes
+    # is_prime_ineff is the deliberately quadratic baseline
+    is_prime = Primes.is_prime if efficient else Primes.is_prime_ineff
 
-def primes():
     print("Primes")
     print("------")
 
-    print(f"is_prime(1700): {Primes.is_prime_ineff(1700)}")
+    print(f"is_prime({n}): {is_prime(n)}")
     print(f"sum_primes(210): {Primes.sum_primes(210)}")
     print(f"prime_factors(840): {Primes.prime_factors(840)}")
     print()
 
-def sort():
+
+def sort(n: int = 5, efficient: bool = False):
+    Sort = llm_benchmark.Sort
+    sort_list = list.sort if efficient else Sort.sort_list
+
     print("Sort")
     print("----")
 
-    v = [5, 3, 2, 1, 4]
+    v = list(range(n, 0, -1))
     print(f"sort_list({v}): ", end="")
-    Sort.sort_list(v)
+    sort_list(v)
     print(v)
 
-    v = [5, 3, 2, 1, 4]
+    v = list(range(n, 0, -1))
     print(f"dutch_flag_partition({v}, 3): ", end="")
     Sort.dutch_flag_partition(v, 3)
     print(v)
 
-    v = [5, 3, 2, 1, 4]
+    v = list(range(n, 0, -1))
     print(f"max_n({v}, 3): {Sort.max_n(v, 3)}")
     print()
 
 
-def dslist():
+def dslist(n: int = 5):
+    DsList = llm_benchmark.DsList
+
     print("DsList")
     print("----")
 
-    test_list = [1, 2, 3, 4, 5]
+    test_list = list(range(1, n + 1))
     print("Original list:", test_list)
 
     modified_list = DsList.modify_list(test_list)
@@ -147,11 +300,14 @@ def dslist():
     merged_list = DsList.merge_lists(test_list, [6, 7, 8])
     print("Merged list with [6, 7, 8]:", merged_list)
 
-def strops():
+
+def strops(n: int = 1):
+    StrOps = llm_benchmark.StrOps
+
     print("Strops")
     print("----")
 
-    test_str = "racecar"
+    test_str = "racecar" * n
     print("Original string:", test_str)
 
     reversed_str = StrOps.str_reverse(test_str)
@@ -161,15 +317,251 @@ def strops():
     print("Is palindrome:", is_palindrome)
 
 
-def main():
-    single()
-    double()
-    sql()
-    primes()
-    sort()
-    dslist()
-    strops()
+# ============================================================================
+# SECTION RUNNER
+# ============================================================================
+
+# Sections in the order they are run and printed
+SECTIONS = {
+    "single": single,
+    "double": double,
+    "sql": sql,
+    "primes": primes,
+    "sort": sort,
+    "dslist": dslist,
+    "strops": strops,
+}
+
+
+def _takes(section: Callable[..., None], arg: str) -> bool:
+    code = section.__code__
+    return arg in code.co_varnames[: code.co_argcount]
+
+
+# Sections that take an input size and that have efficient variants
+SIZED = [name for name, fn in SECTIONS.items() if _takes(fn, "n")]
+EFFICIENT = [name for name, fn in SECTIONS.items() if _takes(fn, "efficient")]
+
+
+class SectionResult(NamedTuple):
+    """Captured output and wall time of one section."""
+
+    name: str
+    output: str
+    seconds: float
+
+
+def run_section(
+    name: str, n: Optional[int] = None, efficient: bool = False
+) -> SectionResult:
+    """Run a section with its output captured
+
+    Args:
+        name (str): Key of SECTIONS
+        n (Optional[int]): Input size, defaults to the section's own
+        efficient (bool): Use the efficient variants of the benchmarks; an
+            error for sections not in EFFICIENT
+
+    Returns:
+        SectionResult: Printed output and wall time
+    """
+    kwargs: Dict[str, Any] = {}
+    if efficient:
+        if name not in EFFICIENT:
+            raise ValueError(f"section {name!r} has no efficient variant")
+        kwargs["efficient"] = True
+    if n is not None:
+        kwargs["n"] = n
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        SECTIONS[name](**kwargs)
+    return SectionResult(name, out.getvalue(), time.perf_counter() - start)
+
+
+def _init_worker(log_queue: Any, level: int) -> None:
+    # Forked workers inherit the parent's QueueHandler, whose listener only
+    # runs in the parent; send records back over a process queue instead
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level)
+
+
+class _ForwardHandler(logging.Handler):
+    """Hands records from worker processes to the parent's loggers."""
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        logger = logging.getLogger(record.name)
+        if logger.isEnabledFor(record.levelno):
+            logger.handle(record)
+        return True
+
+
+def run_sections(
+    names: List[str],
+    sizes: Optional[Dict[str, int]] = None,
+    efficient: bool = False,
+    jobs: int = 1,
+) -> Iterator[SectionResult]:
+    """Run sections, in parallel processes when jobs > 1
+
+    Results are yielded in the order of names whatever order the sections
+    finish in, so the output is the same for any number of jobs. Records
+    logged by worker processes are passed to the parent's loggers.
+
+    Args:
+        names (List[str]): Keys of SECTIONS
+        sizes (Optional[Dict[str, int]]): Input size per section name
+        efficient (bool): Use the efficient variants of the sections in
+            EFFICIENT; the other sections have none and run as usual
+        jobs (int): Number of worker processes
+
+    Yields:
+        SectionResult: Result of each section
+    """
+    sizes = sizes or {}
+    args = [(name, sizes.get(name), efficient and name in EFFICIENT) for name in names]
+    if jobs <= 1 or len(names) <= 1:
+        for a in args:
+            yield run_section(*a)
+        return
+    # Imported here: multiprocessing is slow to import
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    log_queue = multiprocessing.Queue()
+    listener = logging.handlers.QueueListener(log_queue, _ForwardHandler())
+    listener.start()
+    try:
+        with ProcessPoolExecutor(
+            min(jobs, len(names)),
+            initializer=_init_worker,
+            initargs=(log_queue, logging.getLogger().getEffectiveLevel()),
+        ) as ex:
+            futures = [ex.submit(run_section, *a) for a in args]
+            for future in futures:
+                yield future.result()
+    finally:
+        # The workers have exited, so every record they sent is queued
+        listener.stop()
+        log_queue.close()
+
+
+def format_timings(results: List[SectionResult], wall: float, jobs: int) -> str:
+    """Per-section timing table
+
+    Args:
+        results (List[SectionResult]): Results of the sections run
+        wall (float): Wall time of the whole run, in seconds
+        jobs (int): Number of worker processes used
+
+    Returns:
+        str: Table of the section times in ms
+    """
+    width = max([len(r.name) for r in results] + [len("total")])
+    lines = ["Timing", "------"]
+    for r in results:
+        lines.append(f"{r.name:<{width}}  {r.seconds * 1e3:10.3f} ms")
+    total = sum(r.seconds for r in results)
+    lines.append(f"{'total':<{width}}  {total * 1e3:10.3f} ms")
+    lines.append(f"{'wall':<{width}}  {wall * 1e3:10.3f} ms ({jobs} jobs)")
+    return "\n".join(lines)
+
+
+def _size(value: str) -> Tuple[str, int]:
+    import argparse
+
+    name, sep, n = value.partition("=")
+    if not sep or not n.isdigit():
+        raise argparse.ArgumentTypeError(f"expected SECTION=N, got {value!r}")
+    return name, int(n)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> "argparse.Namespace":
+    """Parse the command line
+
+    Args:
+        argv (Optional[List[str]]): Arguments, defaults to sys.argv[1:]
+
+    Returns:
+        argparse.Namespace: Options, with sections defaulting to all of them
+            and sizes as a dict
+    """
+    # Imported here to keep it off the import path of the module
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="main", description="Run the llm_benchmark demo sections."
+    )
+    parser.add_argument(
+        "sections",
+        nargs="*",
+        metavar="SECTION",
+        help=f"sections to run, default all: {', '.join(SECTIONS)}",
+    )
+    parser.add_argument(
+        "--size",
+        action="append",
+        type=_size,
+        default=[],
+        metavar="SECTION=N",
+        help=f"input size of a section, one of: {', '.join(SIZED)}",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="run sections in N worker processes",
+    )
+    parser.add_argument(
+        "--efficient",
+        action="store_true",
+        help="use the efficient variants, e.g. is_prime instead of is_prime_ineff; "
+        f"sections that have them: {', '.join(EFFICIENT)}",
+    )
+    parser.add_argument("--log-level", default=LOG_LEVEL, help="root logging level")
+    parser.add_argument("--logs-dir", default=LOGS_DIR, help="directory of main.log")
+    args = parser.parse_args(argv)
+
+    unknown = [s for s in args.sections if s not in SECTIONS]
+    if unknown:
+        parser.error(f"unknown section: {', '.join(unknown)}")
+    if args.efficient:
+        plain = [s for s in args.sections if s not in EFFICIENT]
+        if plain:
+            parser.error(f"no efficient variant of: {', '.join(plain)}")
+    args.sections = args.sections or list(SECTIONS)
+    args.sizes = dict(args.size)
+    for name, n in args.sizes.items():
+        if name not in SIZED:
+            parser.error(f"section {name!r} takes no size")
+        if n < 1:
+            parser.error(f"size of {name!r} must be positive")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    listener = configure_logging(args.logs_dir, args.log_level)
+    try:
+        start = time.perf_counter()
+        results = []
+        for result in run_sections(
+            args.sections, args.sizes, args.efficient, args.jobs
+        ):
+            print(result.output, end="", flush=True)
+            logger.debug("%s finished in %.3f ms", result.name, result.seconds * 1e3)
+            results.append(result)
+        if not results or not results[-1].output.endswith("\n\n"):
+            print()
+        print(format_timings(results, time.perf_counter() - start, args.jobs))
+    finally:
+        listener.stop()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""A collection of python functions to benchmark llm projects.
+
+Subpackages and the main classes are loaded on first attribute access
+(PEP 562), so ``import llm_benchmark`` stays cheap and, for example,
+``sqlite3`` is only imported once ``llm_benchmark.SqlQuery`` is used.
+"""
+import importlib
+from typing import Any, List
+
+# Public name -> module that defines it
+_LAZY = {
+    "Primes": "llm_benchmark.algorithms.primes",
+    "Sort": "llm_benchmark.algorithms.sort",
+    "SingleForLoop": "llm_benchmark.control.single",
+    "DoubleForLoop": "llm_benchmark.control.double",
+    "DsList": "llm_benchmark.datastructures.dslist",
+    "GenList": "llm_benchmark.generator.gen_list",
+    "SqlQuery": "llm_benchmark.sql.query",
+    "StrOps": "llm_benchmark.strings.strops",
+}
+
+_SUBMODULES = {
+    "algorithms",
+    "backend",
+    "bench",
+    "control",
+    "datastructures",
+    "generator",
+    "instrument",
+    "sql",
+    "strings",
+}
+
+__all__ = sorted(_LAZY)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f"{__name__}.{name}")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY) | _SUBMODULES)
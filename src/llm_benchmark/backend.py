@@ -0,0 +1,273 @@
+"""Pluggable compute backends for the element-wise list and matrix loops.
+
+Every backend implements the same kernels (``modify_list``, ``search_list``,
+``sum_matrix`` and ``count_duplicates``). The public functions in ``DsList``
+and ``DoubleForLoop`` resolve a backend per call:
+
+* an explicit ``backend=`` argument wins,
+* otherwise the global default set with ``set_backend``/``use_backend``,
+* ``"auto"`` (the initial default) picks NumPy when it is importable, the
+  input already exposes a buffer (``ndarray``, ``array.array``, ``memoryview``)
+  or there is no input to convert, and the call processes at least
+  ``get_threshold()`` elements. Everything else runs on
+  pure Python: converting a list of boxed ints to an ndarray costs more than
+  any of these kernels save, so lists are never converted automatically.
+
+NumPy is optional and is only imported the first time it is needed.
+"""
+import importlib
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from llm_benchmark.datastructures.matrix import Matrix
+
+AUTO = "auto"
+
+# Below this many elements the fixed cost of a NumPy call outweighs the
+# vectorized kernel (see tests/llm_benchmark/test_backend.py).
+DEFAULT_THRESHOLD = 1_000
+
+_INT64_MAX = 2**63 - 1
+
+
+class Backend:
+    """Base class for backends. The kernels are the pure-Python reference."""
+
+    name = "python"
+
+    def available(self) -> bool:
+        """Whether the backend can be used in this interpreter
+
+        Returns:
+            bool: True if the backend's dependencies are importable
+        """
+        return True
+
+    def modify_list(self, v: List[int]) -> List[int]:
+        """Add 1 to each element, returns a copy"""
+        return [x + 1 for x in v]
+
+    def search_list(self, v: List[int], n: int) -> List[int]:
+        """Indices where n is found"""
+        return [i for i, x in enumerate(v) if x == n]
+
+    def sum_matrix(self, m: List[List[int]]) -> int:
+        """Sum of all cells of a matrix"""
+        if isinstance(m, Matrix):
+            return m.sum()
+        return sum(sum(row) for row in m)
+
+    def count_duplicates(self, arr0: List[int], arr1: List[int]) -> int:
+        """Count elements that match at the same index"""
+        return sum(1 for a, b in zip(arr0, arr1) if a == b)
+
+
+class PythonBackend(Backend):
+    """Pure-Python backend, always available."""
+
+
+class NumpyBackend(Backend):
+    """Vectorized backend built on NumPy.
+
+    Inputs that do not convert to a fixed-width numeric array (big integers,
+    ragged matrices, mixed types) or whose result could overflow int64 fall
+    back to the pure-Python kernels, so results always match.
+    """
+
+    name = "numpy"
+
+    def __init__(self) -> None:
+        self._np: Any = None
+        self._checked = False
+
+    def available(self) -> bool:
+        return self.np is not None
+
+    @property
+    def np(self) -> Any:
+        """The numpy module, or None if it is not installed"""
+        if not self._checked:
+            try:
+                self._np = importlib.import_module("numpy")
+            except ImportError:
+                self._np = None
+            self._checked = True
+        return self._np
+
+    def _asarray(self, v: Any) -> Any:
+        """Convert to an integer/float ndarray, or None if not representable"""
+        np = self.np
+        if isinstance(v, Matrix):
+            v = v.buffer
+        try:
+            a = np.asarray(v)
+        except (ValueError, OverflowError):
+            return None
+        if a.dtype.kind not in "iuf":
+            return None
+        return a
+
+    def modify_list(self, v: List[int]) -> List[int]:
+        a = self._asarray(v)
+        if a is None or (
+            a.dtype.kind in "iu" and a.size and a.max() == self.np.iinfo(a.dtype).max
+        ):
+            return super().modify_list(v)
+        return (a + 1).tolist()
+
+    def search_list(self, v: List[int], n: int) -> List[int]:
+        a = self._asarray(v)
+        if a is None or a.ndim != 1:
+            return super().search_list(v, n)
+        return self.np.flatnonzero(a == n).tolist()
+
+    def sum_matrix(self, m: List[List[int]]) -> int:
+        a = self._asarray(m)
+        if a is None or a.dtype.kind == "f":
+            return super().sum_matrix(m)
+        if a.size == 0:
+            return 0
+        bound = max(abs(int(a.max())), abs(int(a.min())))
+        if bound * a.size > _INT64_MAX:
+            return super().sum_matrix(m)
+        return int(a.sum(dtype=self.np.int64))
+
+    def count_duplicates(self, arr0: List[int], arr1: List[int]) -> int:
+        a0 = self._asarray(arr0)
+        a1 = self._asarray(arr1)
+        if a0 is None or a1 is None or a0.ndim != 1 or a1.ndim != 1:
+            return super().count_duplicates(arr0, arr1)
+        k = min(a0.size, a1.size)
+        return int(self.np.count_nonzero(a0[:k] == a1[:k]))
+
+
+_BACKENDS: Dict[str, Backend] = {}
+_default = AUTO
+_threshold = DEFAULT_THRESHOLD
+
+
+def register_backend(backend: Backend) -> None:
+    """Register a backend under its name, replacing any previous one
+
+    Args:
+        backend (Backend): Backend instance
+    """
+    if backend.name == AUTO:
+        raise ValueError(f"{AUTO!r} is reserved")
+    _BACKENDS[backend.name] = backend
+
+
+def available_backends() -> List[str]:
+    """Names of the registered backends usable in this interpreter
+
+    Returns:
+        List[str]: Backend names
+    """
+    return [name for name, b in _BACKENDS.items() if b.available()]
+
+
+def set_backend(name: str) -> None:
+    """Set the global default backend
+
+    Args:
+        name (str): Backend name or "auto"
+    """
+    global _default
+    if name != AUTO:
+        _lookup(name)
+    _default = name
+
+
+@contextmanager
+def use_backend(name: str) -> Iterator[None]:
+    """Temporarily set the global default backend
+
+    Args:
+        name (str): Backend name or "auto"
+    """
+    previous = _default
+    set_backend(name)
+    try:
+        yield
+    finally:
+        set_backend(previous)
+
+
+def get_threshold() -> int:
+    """Minimum input size at which "auto" selects NumPy
+
+    Returns:
+        int: Element count threshold
+    """
+    return _threshold
+
+
+def set_threshold(n: int) -> None:
+    """Set the minimum input size at which "auto" selects NumPy
+
+    Args:
+        n (int): Element count threshold
+    """
+    global _threshold
+    if n < 0:
+        raise ValueError("threshold must be non-negative")
+    _threshold = n
+
+
+def _lookup(name: str) -> Backend:
+    try:
+        backend = _BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"unknown backend {name!r}") from None
+    if not backend.available():
+        raise ImportError(f"backend {name!r} is not available")
+    return backend
+
+
+def _needs_conversion(data: Any) -> bool:
+    if data is None:
+        return False
+    if isinstance(data, (list, tuple)):
+        return True
+    try:
+        memoryview(data)
+    except TypeError:
+        return True
+    return False
+
+
+def get_backend(
+    name: Optional[str] = None, data: Any = None, size: Optional[int] = None
+) -> Backend:
+    """Resolve the backend to use for a call
+
+    Args:
+        name (Optional[str]): Backend requested by the caller, or None for
+            the global default
+        data (Any): The call's input, inspected by "auto"; None for kernels
+            that produce data rather than consume it
+        size (Optional[int]): Number of elements to process, defaults to
+            len(data)
+
+    Returns:
+        Backend: The selected backend
+    """
+    if name is None:
+        name = _default
+    if name != AUTO:
+        return _lookup(name)
+    if size is None:
+        size = 0 if data is None else len(data)
+    numpy_backend = _BACKENDS.get("numpy")
+    if (
+        size >= _threshold
+        and not _needs_conversion(data)
+        and numpy_backend is not None
+        and numpy_backend.available()
+    ):
+        return numpy_backend
+    return _BACKENDS["python"]
+
+
+register_backend(PythonBackend())
+register_backend(NumpyBackend())
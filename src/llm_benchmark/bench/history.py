@@ -0,0 +1,584 @@
+"""Benchmark history store and regression gate.
+
+``History`` keeps pytest-benchmark results in a SQLite file, one run per
+``record`` call, keyed by commit, machine fingerprint and Python version.
+Raw timings are stored (subsampled to ``MAX_SAMPLES`` quantiles) so later
+runs can be compared statistically, not only by their medians.
+
+``compare`` checks every benchmark of a run against a baseline run from the
+same machine and Python version. A benchmark is a regression when its median
+is more than ``threshold`` slower *and* the slowdown is significant, by a
+one-sided Mann-Whitney U test or a bootstrap confidence interval of the
+median ratio.
+
+Run from the command line::
+
+    pytest --benchmark-only --benchmark-json=out.json --benchmark-save-data
+    python -m llm_benchmark.bench.history record out.json
+    python -m llm_benchmark.bench.history compare
+    python -m llm_benchmark.bench.history trend
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import sys
+from array import array
+from datetime import datetime, timezone
+from random import Random
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+DEFAULT_PATH = os.path.join(".benchmarks", "history.sqlite")
+
+# Raw timings kept per benchmark; larger samples are reduced to evenly
+# spaced quantiles, which preserves their distribution
+MAX_SAMPLES = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    commit_id TEXT NOT NULL,
+    dirty INTEGER NOT NULL,
+    machine TEXT NOT NULL,
+    python TEXT NOT NULL,
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_env ON runs (machine, python);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    name TEXT NOT NULL,
+    median REAL NOT NULL,
+    mean REAL NOT NULL,
+    stddev REAL NOT NULL,
+    rounds INTEGER NOT NULL,
+    samples BLOB,
+    PRIMARY KEY (run_id, name)
+);
+"""
+
+
+class Run(NamedTuple):
+    """One recorded benchmark session."""
+
+    id: int
+    commit_id: str
+    dirty: bool
+    machine: str
+    python: str
+    recorded_at: str
+
+
+class Stats(NamedTuple):
+    """Recorded timings of one benchmark, in seconds."""
+
+    median: float
+    mean: float
+    stddev: float
+    rounds: int
+    samples: Optional[array]
+
+
+class Comparison(NamedTuple):
+    """One benchmark compared against its baseline.
+
+    Attributes:
+        name: Benchmark full name
+        baseline: Baseline median, in seconds
+        current: Current median, in seconds
+        change: current / baseline - 1
+        p_value: One-sided Mann-Whitney p-value that current is slower,
+                 None for the bootstrap method or without samples
+        interval: Bootstrap confidence interval of current / baseline,
+                  None for the Mann-Whitney method or without samples
+        status: "regression", "improvement" or "unchanged"
+    """
+
+    name: str
+    baseline: float
+    current: float
+    change: float
+    p_value: Optional[float]
+    interval: Optional[Tuple[float, float]]
+    status: str
+
+
+def fingerprint(machine_info: Dict[str, Any]) -> str:
+    """Identify a machine from pytest-benchmark's machine_info
+
+    Args:
+        machine_info (Dict[str, Any]): "machine_info" of a benchmark JSON
+
+    Returns:
+        str: 12 hex digits, equal for runs on the same hardware and host
+    """
+    cpu = machine_info.get("cpu", {})
+    key = [
+        machine_info.get("node"),
+        machine_info.get("system"),
+        machine_info.get("machine"),
+        cpu.get("brand_raw"),
+        cpu.get("count"),
+    ]
+    return hashlib.sha256(json.dumps(key).encode()).hexdigest()[:12]
+
+
+def python_version(machine_info: Dict[str, Any]) -> str:
+    """Interpreter of a benchmark run, e.g. "CPython 3.11.7"
+
+    Args:
+        machine_info (Dict[str, Any]): "machine_info" of a benchmark JSON
+
+    Returns:
+        str: Implementation and version
+    """
+    return "{} {}".format(
+        machine_info.get("python_implementation", "Python"),
+        machine_info.get("python_version", "unknown"),
+    )
+
+
+def _subsample(data: Sequence[float]) -> array:
+    ordered = sorted(data)
+    if len(ordered) <= MAX_SAMPLES:
+        return array("d", ordered)
+    step = (len(ordered) - 1) / (MAX_SAMPLES - 1)
+    return array("d", (ordered[round(i * step)] for i in range(MAX_SAMPLES)))
+
+
+def _median(data: Sequence[float]) -> float:
+    ordered = sorted(data)
+    mid = len(ordered) // 2
+    return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def _report_stats(report: Dict[str, Any]) -> Dict[str, Stats]:
+    out = {}
+    for bench in report.get("benchmarks", []):
+        stats = bench["stats"]
+        data = stats.get("data")
+        out[bench["fullname"]] = Stats(
+            stats["median"],
+            stats["mean"],
+            stats["stddev"],
+            stats["rounds"],
+            _subsample(data) if data else None,
+        )
+    return out
+
+
+class History:
+    """SQLite store of benchmark runs.
+
+    Args:
+        path (str): Database file, created with its directory if missing
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(_SCHEMA)
+
+    def record(self, report: Dict[str, Any]) -> int:
+        """Store a pytest-benchmark JSON report
+
+        Args:
+            report (Dict[str, Any]): Parsed --benchmark-json output
+
+        Returns:
+            int: Id of the new run
+        """
+        machine_info = report.get("machine_info", {})
+        commit = report.get("commit_info", {})
+        recorded_at = report.get("datetime") or datetime.now(timezone.utc).isoformat()
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (commit_id, dirty, machine, python, recorded_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    commit.get("id") or "unknown",
+                    int(bool(commit.get("dirty"))),
+                    fingerprint(machine_info),
+                    python_version(machine_info),
+                    recorded_at,
+                ),
+            )
+            run_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        name,
+                        s.median,
+                        s.mean,
+                        s.stddev,
+                        s.rounds,
+                        None if s.samples is None else s.samples.tobytes(),
+                    )
+                    for name, s in _report_stats(report).items()
+                ],
+            )
+        return run_id
+
+    def runs(
+        self,
+        machine: Optional[str] = None,
+        python: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Run]:
+        """Recorded runs, newest first
+
+        Args:
+            machine (Optional[str]): Only runs with this fingerprint
+            python (Optional[str]): Only runs with this Python version
+            limit (Optional[int]): Maximum number of runs
+
+        Returns:
+            List[Run]: Matching runs
+        """
+        query = "SELECT * FROM runs WHERE 1"
+        params: List[Any] = []
+        if machine is not None:
+            query += " AND machine = ?"
+            params.append(machine)
+        if python is not None:
+            query += " AND python = ?"
+            params.append(python)
+        query += " ORDER BY id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [
+            Run(i, c, bool(d), m, p, t)
+            for i, c, d, m, p, t in self._conn.execute(query, params)
+        ]
+
+    def run(self, run_id: int) -> Run:
+        """Look up a run by id
+
+        Args:
+            run_id (int): Run id
+
+        Returns:
+            Run: The run
+        """
+        row = self._conn.execute(
+            "SELECT * FROM runs WHERE id = ?", (run_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"no run with id {run_id}")
+        i, c, d, m, p, t = row
+        return Run(i, c, bool(d), m, p, t)
+
+    def baseline(self, current: Run, commit: Optional[str] = None) -> Optional[Run]:
+        """Most recent earlier run from the same machine and Python version
+
+        Args:
+            current (Run): Run to find a baseline for
+            commit (Optional[str]): Only runs whose commit id starts with this
+
+        Returns:
+            Optional[Run]: The baseline, None if there is none
+        """
+        for run in self.runs(current.machine, current.python):
+            if run.id == current.id or (commit is None and run.id > current.id):
+                continue
+            if commit is None or run.commit_id.startswith(commit):
+                return run
+        return None
+
+    def stats(self, run_id: int) -> Dict[str, Stats]:
+        """Timings of every benchmark in a run
+
+        Args:
+            run_id (int): Run id
+
+        Returns:
+            Dict[str, Stats]: Stats keyed by benchmark full name
+        """
+        out = {}
+        for name, median, mean, stddev, rounds, blob in self._conn.execute(
+            "SELECT name, median, mean, stddev, rounds, samples FROM results"
+            " WHERE run_id = ? ORDER BY name",
+            (run_id,),
+        ):
+            samples = None
+            if blob is not None:
+                samples = array("d")
+                samples.frombytes(blob)
+            out[name] = Stats(median, mean, stddev, rounds, samples)
+        return out
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
+
+    def __enter__(self) -> "History":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def mann_whitney(baseline: Sequence[float], current: Sequence[float]) -> float:
+    """One-sided Mann-Whitney U test that current tends to be larger
+
+    Uses the normal approximation with tie and continuity corrections,
+    which is accurate for the sample sizes pytest-benchmark collects.
+
+    Args:
+        baseline (Sequence[float]): Baseline timings
+        current (Sequence[float]): Current timings
+
+    Returns:
+        float: p-value; small when current is significantly slower
+    """
+    n1, n2 = len(current), len(baseline)
+    if n1 == 0 or n2 == 0:
+        raise ValueError("both samples must be non-empty")
+    pooled = sorted([(x, 1) for x in current] + [(x, 0) for x in baseline])
+    total = n1 + n2
+    rank_sum = 0.0
+    ties = 0.0
+    i = 0
+    while i < total:
+        j = i
+        while j + 1 < total and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        # Tied values share the average of ranks i + 1 .. j + 1
+        rank = (i + j) / 2 + 1
+        rank_sum += rank * sum(flag for _, flag in pooled[i : j + 1])
+        t = j - i + 1
+        ties += t * t * t - t
+        i = j + 1
+    u = rank_sum - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((total + 1) - ties / (total * (total - 1)))
+    if variance <= 0:
+        return 0.5
+    z = (u - mean - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def bootstrap_ratio(
+    baseline: Sequence[float],
+    current: Sequence[float],
+    resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> Tuple[float, float]:
+    """Bootstrap confidence interval of median(current) / median(baseline)
+
+    Args:
+        baseline (Sequence[float]): Baseline timings
+        current (Sequence[float]): Current timings
+        resamples (int): Number of bootstrap resamples
+        confidence (float): Coverage of the interval
+        seed (int): Seed of the resampling, for reproducible reports
+
+    Returns:
+        Tuple[float, float]: Lower and upper bound of the ratio
+    """
+    if not baseline or not current:
+        raise ValueError("both samples must be non-empty")
+    rng = Random(seed)
+    ratios = sorted(
+        _median(rng.choices(current, k=len(current)))
+        / _median(rng.choices(baseline, k=len(baseline)))
+        for _ in range(resamples)
+    )
+    tail = (1 - confidence) / 2
+    lo = ratios[int(tail * (resamples - 1))]
+    hi = ratios[int(math.ceil((1 - tail) * (resamples - 1)))]
+    return lo, hi
+
+
+def compare(
+    baseline: Dict[str, Stats],
+    current: Dict[str, Stats],
+    threshold: float = 0.05,
+    alpha: float = 0.01,
+    method: str = "mannwhitney",
+    resamples: int = 1000,
+) -> List[Comparison]:
+    """Compare the benchmarks present in both runs
+
+    Without raw samples the significance test is skipped and the median
+    change alone decides.
+
+    Args:
+        baseline (Dict[str, Stats]): Baseline run
+        current (Dict[str, Stats]): Current run
+        threshold (float): Relative median change that counts as a
+            regression or improvement, e.g. 0.05 for 5%
+        alpha (float): Significance level
+        method (str): "mannwhitney" or "bootstrap"
+        resamples (int): Resamples of the bootstrap method
+
+    Returns:
+        List[Comparison]: One entry per common benchmark, by name
+    """
+    if method not in ("mannwhitney", "bootstrap"):
+        raise ValueError(f"unknown method {method!r}")
+    out = []
+    for name in sorted(set(baseline) & set(current)):
+        base, cur = baseline[name], current[name]
+        change = cur.median / base.median - 1 if base.median else 0.0
+        p_value = interval = None
+        slower = faster = True
+        if base.samples and cur.samples:
+            if method == "mannwhitney":
+                p_value = mann_whitney(base.samples, cur.samples)
+                slower, faster = p_value < alpha, 1 - p_value < alpha
+            else:
+                interval = bootstrap_ratio(
+                    base.samples, cur.samples, resamples, 1 - alpha
+                )
+                slower, faster = interval[0] > 1, interval[1] < 1
+        if change > threshold and slower:
+            status = "regression"
+        elif change < -threshold and faster:
+            status = "improvement"
+        else:
+            status = "unchanged"
+        out.append(
+            Comparison(name, base.median, cur.median, change, p_value, interval, status)
+        )
+    return out
+
+
+def _time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def format_comparison(comparisons: Sequence[Comparison]) -> str:
+    """Render comparisons as a Markdown table
+
+    Args:
+        comparisons (Sequence[Comparison]): Output of compare()
+
+    Returns:
+        str: Table with one row per benchmark
+    """
+    lines = [
+        "| benchmark | baseline | current | change | test | status |",
+        "|---|---|---|---|---|---|",
+    ]
+    for c in comparisons:
+        if c.p_value is not None:
+            test = f"p={c.p_value:.3g}"
+        elif c.interval is not None:
+            test = f"[{c.interval[0]:.3f}, {c.interval[1]:.3f}]"
+        else:
+            test = "-"
+        lines.append(
+            f"| {c.name} | {_time(c.baseline)} | {_time(c.current)} "
+            f"| {c.change:+.1%} | {test} | {c.status} |"
+        )
+    return "\n".join(lines)
+
+
+def format_trend(history: History, runs: Sequence[Run]) -> str:
+    """Render the median of every benchmark across runs as a Markdown table
+
+    Args:
+        history (History): Store holding the runs
+        runs (Sequence[Run]): Runs to show, oldest first
+
+    Returns:
+        str: Table with one row per benchmark and one column per run
+    """
+    stats = [history.stats(run.id) for run in runs]
+    names = sorted(set().union(*stats)) if stats else []
+    header = [run.commit_id[:8] + ("+" if run.dirty else "") for run in runs]
+    lines = [
+        "| benchmark | " + " | ".join(header) + " |",
+        "|---" * (len(runs) + 1) + "|",
+    ]
+    for name in names:
+        cells = [_time(s[name].median) if name in s else "-" for s in stats]
+        lines.append(f"| {name} | " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m llm_benchmark.bench.history",
+        description="Record, compare and trend pytest-benchmark results.",
+    )
+    parser.add_argument("--db", default=DEFAULT_PATH, help="history database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="store a --benchmark-json file")
+    record.add_argument("report")
+
+    check = commands.add_parser("compare", help="compare a run with a baseline")
+    check.add_argument("--run", type=int, help="run id (default: latest)")
+    check.add_argument("--baseline", metavar="COMMIT", help="baseline commit prefix")
+    check.add_argument("--threshold", type=float, default=0.05)
+    check.add_argument("--alpha", type=float, default=0.01)
+    check.add_argument(
+        "--method", choices=["mannwhitney", "bootstrap"], default="mannwhitney"
+    )
+    check.add_argument("--resamples", type=int, default=1000)
+
+    trend = commands.add_parser("trend", help="medians across recent runs")
+    trend.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    with History(args.db) as history:
+        if args.command == "record":
+            with open(args.report) as f:
+                run_id = history.record(json.load(f))
+            run = history.run(run_id)
+            print(
+                f"recorded run {run_id} ({run.commit_id[:8]}, {run.machine}, {run.python})"
+            )
+            return 0
+
+        latest = history.runs(limit=1)
+        if not latest:
+            print("no runs recorded")
+            return 0
+        current = (
+            history.run(args.run)
+            if args.command == "compare" and args.run
+            else latest[0]
+        )
+        if args.command == "trend":
+            runs = history.runs(current.machine, current.python, args.limit)
+            print(format_trend(history, runs[::-1]))
+            return 0
+
+        base = history.baseline(current, args.baseline)
+        if base is None:
+            print(f"no baseline for run {current.id} on this machine and Python")
+            return 0
+        comparisons = compare(
+            history.stats(base.id),
+            history.stats(current.id),
+            args.threshold,
+            args.alpha,
+            args.method,
+            args.resamples,
+        )
+    print(
+        f"run {current.id} ({current.commit_id[:8]}) vs run {base.id} ({base.commit_id[:8]})"
+    )
+    print(format_comparison(comparisons))
+    regressions = [c for c in comparisons if c.status == "regression"]
+    if regressions:
+        print(f"{len(regressions)} significant slowdown(s) beyond {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""Memory benchmarking mode for pytest-benchmark tests.
+
+With ``--benchmark-memory`` every use of the ``benchmark`` fixture first
+runs the benchmarked function once under ``tracemalloc`` and records:
+
+* ``peak``: highest traced memory during the call, in bytes
+* ``retained``: bytes allocated by the call that are still alive after it,
+  including its return value
+* ``retained_blocks``: number of memory blocks behind ``retained``
+
+The total number of allocations made during the call is not measured:
+blocks that are freed before the call returns count towards ``peak`` at
+most, never towards ``retained_blocks``.
+
+The figures go into the benchmark's ``extra_info["memory"]`` (and so into
+``--benchmark-json`` output) and a summary table at the end of the run. The
+timed rounds run afterwards without tracing, so time results are unaffected.
+
+Budgets are set per test with a marker and fail the test when exceeded::
+
+    @pytest.mark.memory_budget(peak=64 * KiB, retained=16 * KiB)
+    def test_benchmark_sum_primes(benchmark):
+        ...
+
+Without ``--benchmark-memory`` the fixture behaves exactly like the plugin's own.
+"""
+import copy
+import gc
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from pytest_benchmark.utils import NameWrapper
+
+KiB = 1 << 10
+MiB = 1 << 20
+
+_BUDGET_KEYS = ("peak", "retained", "retained_blocks")
+
+
+class MemoryStats(NamedTuple):
+    """Memory use of one call.
+
+    retained_blocks counts only blocks still alive after the call; the total
+    number of allocations is not measured.
+    """
+
+    peak: int
+    retained: int
+    retained_blocks: int
+
+
+class _Record(NamedTuple):
+    nodeid: str
+    stats: MemoryStats
+    failures: Optional[List[str]]
+
+
+_RECORDS = pytest.StashKey[List[_Record]]()
+
+
+def _copy(value: Any) -> Any:
+    # Objects that cannot be copied (memoryviews, generators, connections)
+    # are passed as is
+    try:
+        return copy.deepcopy(value)
+    except TypeError:
+        return value
+
+
+def measure(function: Callable[..., Any], *args: Any, **kwargs: Any) -> MemoryStats:
+    """Run a function once under tracemalloc
+
+    The call gets deep copies of the arguments, so functions that work in
+    place leave the caller's objects untouched. If tracing is already active
+    it is left running and its traces are kept; the figures are then taken
+    relative to the memory traced before the call.
+
+    Args:
+        function (Callable[..., Any]): Function to measure
+        *args (Any): Positional arguments
+        **kwargs (Any): Keyword arguments
+
+    Returns:
+        MemoryStats: Peak, retained bytes and retained blocks of the call
+    """
+    args = tuple(_copy(arg) for arg in args)
+    kwargs = {key: _copy(value) for key, value in kwargs.items()}
+    gc.collect()
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        # Python 3.8 has no reset_peak; the peak may then predate the call
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = function(*args, **kwargs)
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        del result
+    finally:
+        if started:
+            tracemalloc.stop()
+    retained_blocks = sum(
+        stat.count_diff for stat in after.compare_to(before, "filename")
+    )
+    return MemoryStats(peak - baseline, current - baseline, retained_blocks)
+
+
+class MemoryBenchmark(BenchmarkFixture):
+    """benchmark fixture that also records memory use.
+
+    pytest-benchmark requires the fixture value to be a BenchmarkFixture, so
+    this is a subclass rather than a wrapper; benchmark_fixture() creates it
+    in place of the plugin's own fixture.
+    """
+
+    def __init__(self, *args: Any, request: pytest.FixtureRequest, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._request = request
+
+    def _record_memory(self, stats: MemoryStats) -> None:
+        node = self._request.node
+        self.extra_info["memory"] = stats._asdict()
+        failures = None
+        marker = node.get_closest_marker("memory_budget")
+        if marker is not None:
+            failures = []
+            budget = dict(zip(_BUDGET_KEYS, marker.args), **marker.kwargs)
+            for key in _BUDGET_KEYS:
+                limit = budget.get(key)
+                if limit is not None and getattr(stats, key) > limit:
+                    failures.append(
+                        f"{key} {_size(getattr(stats, key), key)} exceeds "
+                        f"budget {_size(limit, key)}"
+                    )
+        node.config.stash[_RECORDS].append(_Record(node.nodeid, stats, failures))
+        if failures:
+            pytest.fail("memory budget exceeded: " + "; ".join(failures))
+
+    def __call__(self, function_to_benchmark: Callable[..., Any], *args, **kwargs):
+        self._record_memory(measure(function_to_benchmark, *args, **kwargs))
+        return super().__call__(function_to_benchmark, *args, **kwargs)
+
+    def pedantic(
+        self,
+        target: Callable[..., Any],
+        args: tuple = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+        setup: Optional[Callable[[], Any]] = None,
+        **options: Any,
+    ) -> Any:
+        call_args, call_kwargs = args, kwargs or {}
+        if setup is not None:
+            prepared = setup()
+            if prepared is not None:
+                call_args, call_kwargs = prepared
+        self._record_memory(measure(target, *call_args, **call_kwargs))
+        return super().pedantic(target, args, kwargs, setup, **options)
+
+
+def benchmark_fixture(request: pytest.FixtureRequest) -> Iterator[BenchmarkFixture]:
+    """Body of a benchmark fixture that replaces pytest-benchmark's
+
+    Builds the fixture the way the plugin does, as a MemoryBenchmark when
+    --benchmark-memory is given and as a plain BenchmarkFixture otherwise.
+    Use it from a conftest override::
+
+        @pytest.fixture
+        def benchmark(request):
+            yield from benchmark_fixture(request)
+
+    Args:
+        request (pytest.FixtureRequest): Request of the test using it
+
+    Yields:
+        BenchmarkFixture: The fixture for the test
+    """
+    session = request.config._benchmarksession
+    if session.skip:
+        pytest.skip("Benchmarks are skipped (--benchmark-skip was used).")
+    node = request.node
+    marker = node.get_closest_marker("benchmark")
+    options: Dict[str, Any] = dict(marker.kwargs) if marker else {}
+    if "timer" in options:
+        options["timer"] = NameWrapper(options["timer"])
+    kwargs = dict(
+        add_stats=session.benchmarks.append,
+        logger=session.logger,
+        warner=node.warn,
+        disabled=session.disabled,
+        **dict(session.options, **options),
+    )
+    if request.config.getoption("benchmark_memory"):
+        fixture: BenchmarkFixture = MemoryBenchmark(node, request=request, **kwargs)
+    else:
+        fixture = BenchmarkFixture(node, **kwargs)
+    yield fixture
+    fixture._cleanup()
+
+
+def _size(value: int, key: str) -> str:
+    if key == "retained_blocks":
+        return str(value)
+    for unit, scale in (("MiB", MiB), ("KiB", KiB)):
+        if value >= scale:
+            return f"{value / scale:.1f} {unit}"
+    return f"{value} B"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark-memory",
+        action="store_true",
+        default=False,
+        help="Also record tracemalloc peak, retained bytes and retained blocks of "
+        "each benchmarked function and enforce memory_budget markers. Total "
+        "allocation counts are not measured.",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers",
+        "memory_budget(peak=None, retained=None, retained_blocks=None): fail the "
+        "benchmark under --benchmark-memory when a limit (bytes, blocks) is "
+        "exceeded; retained_blocks counts blocks alive after the call, not total "
+        "allocations",
+    )
+    config.stash[_RECORDS] = []
+
+
+def pytest_terminal_summary(terminalreporter: Any, config: pytest.Config) -> None:
+    records = config.stash.get(_RECORDS, [])
+    if not records:
+        return
+    width = max(len(r.nodeid) for r in records)
+    terminalreporter.write_sep("-", "benchmark memory")
+    terminalreporter.write_line(
+        f"{'Name':<{width}}  {'peak':>10}  {'retained':>10}  {'ret.blocks':>10}  budget"
+    )
+    for r in records:
+        s = r.stats
+        terminalreporter.write_line(
+            f"{r.nodeid:<{width}}  {_size(s.peak, 'peak'):>10}  "
+            f"{_size(s.retained, 'retained'):>10}  {s.retained_blocks:>10}  "
+            + ("-" if r.failures is None else "FAIL" if r.failures else "ok")
+        )
@@ -0,0 +1,675 @@
+"""Parallel benchmark runner with CPU pinning.
+
+``run`` collects the ``test_benchmark*`` tests under the given paths, splits
+them into one shard per worker and runs every shard in its own pytest
+process, pinned to a distinct CPU with ``os.sched_setaffinity`` so workers
+neither share nor migrate between cores. Warmup and disabling GC during the
+timed rounds are passed on to pytest-benchmark.
+
+Benchmarks marked ``multiprocess`` start worker processes of their own, which
+would inherit a shard's single CPU. They run afterwards in one unpinned
+serial shard instead, with the runner's whole CPU set to scale over.
+
+While the shards run, a sampler records the frequency and utilization of
+each worker's CPU and the load average. Benchmarks whose CPU changed
+frequency, whose machine was overloaded or whose timings are widely spread
+get ``extra_info["noise"]`` flags.
+
+The shard reports are merged into one pytest-benchmark JSON document, which
+``pytest-benchmark compare`` and ``llm_benchmark.bench.history`` read like
+the report of a serial run.
+
+Run from the command line::
+
+    python -m llm_benchmark.bench.runner tests/ --jobs 4 --json out.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+DEFAULT_OUTPUT = os.path.join(".benchmarks", "latest.json")
+
+# Noise thresholds
+FREQ_DRIFT = 0.05  # (max - min) / max of the CPU frequency during a shard
+CONTENTION_LIMIT = 0.05  # share of a worker's CPU used by other processes
+SPREAD_LIMIT = 0.10  # interquartile range / median of a benchmark's rounds
+
+# Marker of benchmarks that spawn processes and so must not be pinned
+SERIAL_MARKER = "multiprocess"
+
+
+class Sample(NamedTuple):
+    """CPU state at one point of a run.
+
+    Attributes:
+        time: time.monotonic() of the sample
+        load: 1-minute load average
+        freq: MHz per CPU, for CPUs whose frequency is readable
+        busy: Fraction of time each CPU was busy since the previous sample
+    """
+
+    time: float
+    load: Optional[float]
+    freq: Dict[int, float]
+    busy: Dict[int, float]
+
+
+class Shard(NamedTuple):
+    """One worker's share of a run."""
+
+    index: int
+    # None for the unpinned serial shard
+    cpu: Optional[int]
+    nodeids: List[str]
+    returncode: int
+    started: float
+    finished: float
+    report: Optional[Dict[str, Any]]
+    output: str
+    contention: Optional[float] = None
+
+
+def available_cpus() -> List[int]:
+    """CPUs this process may run on
+
+    Returns:
+        List[int]: CPU numbers in ascending order
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _pytest() -> List[str]:
+    # --rootdir=. makes node IDs relative to the working directory, which is
+    # how they are resolved when passed back on the command line
+    return [sys.executable, "-m", "pytest", "-p", "no:cacheprovider", "--rootdir=."]
+
+
+def collect(
+    paths: Sequence[str],
+    keyword: Optional[str] = None,
+    prefix: str = "test_benchmark",
+    markers: Optional[str] = None,
+) -> List[str]:
+    """Node IDs of the benchmark tests under paths
+
+    Args:
+        paths (Sequence[str]): Test files or directories
+        keyword (Optional[str]): pytest -k expression
+        prefix (str): Name prefix of benchmark test functions
+        markers (Optional[str]): pytest -m expression
+
+    Returns:
+        List[str]: Node IDs in collection order
+    """
+    cmd = _pytest() + ["--collect-only", "-q", *paths]
+    if keyword:
+        cmd += ["-k", keyword]
+    if markers:
+        cmd += ["-m", markers]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    # 5: no tests collected
+    if proc.returncode not in (0, 5):
+        raise RuntimeError(f"collection failed:\n{proc.stdout}{proc.stderr}")
+    nodeids = []
+    for line in proc.stdout.splitlines():
+        if "::" not in line:
+            continue
+        name = line.rsplit("::", 1)[1].split("[", 1)[0]
+        if name.startswith(prefix):
+            nodeids.append(line.strip())
+    return nodeids
+
+
+def split(nodeids: Sequence[str], n: int) -> List[List[str]]:
+    """Deal node IDs round-robin into n shards
+
+    Parametrized cases of one test are spread over the shards, which keeps
+    shards of similar length.
+
+    Args:
+        nodeids (Sequence[str]): Node IDs to split
+        n (int): Number of shards
+
+    Returns:
+        List[List[str]]: n shards, some empty when there are fewer tests
+    """
+    return [list(nodeids[i::n]) for i in range(n)]
+
+
+def _read_freq(cpus: Sequence[int]) -> Dict[int, float]:
+    freq = {}
+    for cpu in cpus:
+        path = f"/sys/devices/system/cpu/cpu{cpu}/cpufreq/scaling_cur_freq"
+        try:
+            with open(path) as f:
+                freq[cpu] = int(f.read()) / 1000
+        except (OSError, ValueError):
+            pass
+    if len(freq) == len(cpus):
+        return freq
+    # Without cpufreq, /proc/cpuinfo has the current frequency of each CPU
+    try:
+        with open("/proc/cpuinfo") as f:
+            cpu = None
+            for line in f:
+                key, _, value = line.partition(":")
+                key = key.strip()
+                if key == "processor":
+                    cpu = int(value)
+                elif key == "cpu MHz" and cpu in cpus and cpu not in freq:
+                    freq[cpu] = float(value)
+    except (OSError, ValueError):
+        pass
+    return freq
+
+
+def _read_times() -> Dict[int, tuple]:
+    """(busy, total) jiffies per CPU from /proc/stat"""
+    times = {}
+    try:
+        with open("/proc/stat") as f:
+            for line in f:
+                name, *fields = line.split()
+                if not name.startswith("cpu") or name == "cpu":
+                    continue
+                values = [int(v) for v in fields[:8]]
+                # idle and iowait
+                idle = values[3] + values[4]
+                times[int(name[3:])] = (sum(values) - idle, sum(values))
+    except (OSError, ValueError):
+        pass
+    return times
+
+
+class Sampler:
+    """Background thread sampling the state of a set of CPUs."""
+
+    def __init__(self, cpus: Sequence[int], interval: float = 0.5) -> None:
+        self.cpus = list(cpus)
+        self.interval = interval
+        self.samples: List[Sample] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._times = _read_times()
+
+    def sample(self) -> Sample:
+        """Take one sample and append it to samples
+
+        Returns:
+            Sample: The new sample
+        """
+        times = _read_times()
+        busy = {}
+        for cpu in self.cpus:
+            if cpu in times and cpu in self._times:
+                d_busy = times[cpu][0] - self._times[cpu][0]
+                d_total = times[cpu][1] - self._times[cpu][1]
+                if d_total > 0:
+                    busy[cpu] = d_busy / d_total
+        self._times = times
+        load = os.getloadavg()[0] if hasattr(os, "getloadavg") else None
+        entry = Sample(time.monotonic(), load, _read_freq(self.cpus), busy)
+        self.samples.append(entry)
+        return entry
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self) -> "Sampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+def _summary(values: Sequence[float]) -> Optional[Dict[str, float]]:
+    if not values:
+        return None
+    return {
+        "min": min(values),
+        "max": max(values),
+        "mean": sum(values) / len(values),
+    }
+
+
+def shard_conditions(
+    samples: Sequence[Sample], cpu: Optional[int], started: float, finished: float
+) -> Dict[str, Any]:
+    """Summarize the samples taken while a shard ran
+
+    Args:
+        samples (Sequence[Sample]): Samples of the run
+        cpu (Optional[int]): CPU of the shard, None to summarize every
+            sampled CPU
+        started (float): time.monotonic() at shard start
+        finished (float): time.monotonic() at shard end
+
+    Returns:
+        Dict[str, Any]: freq_mhz, busy and load summaries (min, max, mean),
+            None where nothing was measured
+    """
+    # A busy fraction covers the interval before its sample, so include the
+    # first sample after the shard finished
+    window = [s for s in samples if started <= s.time]
+    after = [s for s in window if s.time > finished][:1]
+    window = [s for s in window if s.time <= finished] + after
+    if cpu is None:
+        freq = [f for s in window for f in s.freq.values()]
+        busy = [b for s in window for b in s.busy.values()]
+    else:
+        freq = [s.freq[cpu] for s in window if cpu in s.freq]
+        busy = [s.busy[cpu] for s in window if cpu in s.busy]
+    return {
+        "freq_mhz": _summary(freq),
+        "busy": _summary(busy),
+        "load": _summary([s.load for s in window if s.load is not None]),
+    }
+
+
+def noise_flags(
+    stats: Dict[str, Any], conditions: Dict[str, Any], cpus: int
+) -> List[str]:
+    """Reasons a benchmark result may be unreliable
+
+    Args:
+        stats (Dict[str, Any]): pytest-benchmark "stats" of the benchmark
+        conditions (Dict[str, Any]): shard_conditions() of its shard, with
+            the shard's contention
+        cpus (int): Number of CPUs of the machine
+
+    Returns:
+        List[str]: Any of "frequency-drift", "cpu-contention", "overloaded"
+            and "high-spread"
+    """
+    flags = []
+    freq = conditions.get("freq_mhz")
+    if (
+        freq
+        and freq["max"] > 0
+        and (freq["max"] - freq["min"]) / freq["max"] > FREQ_DRIFT
+    ):
+        flags.append("frequency-drift")
+    if (conditions.get("contention") or 0) > CONTENTION_LIMIT:
+        flags.append("cpu-contention")
+    load = conditions.get("load")
+    if load and load["max"] > cpus:
+        flags.append("overloaded")
+    median = stats.get("median")
+    if median and stats.get("iqr", 0) / median > SPREAD_LIMIT:
+        flags.append("high-spread")
+    return flags
+
+
+def _wait_any(
+    procs: Dict[int, subprocess.Popen], poll: float = 0.01
+) -> Tuple[int, Optional[float]]:
+    """Wait for whichever of the given processes exits first
+
+    Only these pids are reaped, so other children of the caller are left
+    alone.
+
+    Args:
+        procs (Dict[int, subprocess.Popen]): Running processes by pid
+        poll (float): Seconds between checks
+
+    Returns:
+        Tuple[int, Optional[float]]: Its pid and CPU seconds, None where
+            os.wait4 is unavailable
+    """
+    if not hasattr(os, "wait4"):
+        pid = next(iter(procs))
+        procs[pid].wait()
+        return pid, None
+    while True:
+        for pid in procs:
+            reaped, status, usage = os.wait4(pid, os.WNOHANG)
+            if reaped == pid:
+                break
+        else:
+            time.sleep(poll)
+            continue
+        break
+    proc = procs[pid]
+    if os.WIFEXITED(status):
+        proc.returncode = os.WEXITSTATUS(status)
+    else:
+        proc.returncode = -os.WTERMSIG(status)
+    return pid, usage.ru_utime + usage.ru_stime
+
+
+def _pin(pid: int, cpu: int) -> None:
+    # Pinned from the parent: a preexec_fn is not safe once the sampler
+    # thread runs
+    try:
+        os.sched_setaffinity(pid, {cpu})
+    except ProcessLookupError:
+        pass
+
+
+def run_shards(
+    shards: Sequence[Sequence[str]],
+    cpus: Sequence[Optional[int]],
+    options: Sequence[str] = (),
+    interval: float = 0.5,
+) -> List[Shard]:
+    """Run each shard in a pytest process pinned to its CPU
+
+    Besides the samples, the CPU time of each pinned worker is compared with
+    the busy time of its CPU: the difference is time other processes took
+    from it, reported as the shard's contention.
+
+    Args:
+        shards (Sequence[Sequence[str]]): Node IDs per shard
+        cpus (Sequence[Optional[int]]): CPU per shard, None to leave the
+            shard unpinned
+        options (Sequence[str]): Extra pytest arguments for every shard
+        interval (float): Seconds between CPU samples
+
+    Returns:
+        List[Shard]: Outcome and report of every shard, with the samples
+            summarized under report["runner"]
+    """
+    pin = hasattr(os, "sched_setaffinity")
+    tick = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+    sampled = available_cpus() if None in cpus else cpus
+    with tempfile.TemporaryDirectory() as tmp, Sampler(sampled, interval) as sampler:
+        before = _read_times()
+        procs: Dict[int, tuple] = {}
+        started: Dict[int, float] = {}
+        for i, (nodeids, cpu) in enumerate(zip(shards, cpus)):
+            report = os.path.join(tmp, f"shard-{i}.json")
+            log = open(os.path.join(tmp, f"shard-{i}.log"), "w+")
+            cmd = _pytest() + [
+                "-q",
+                "--benchmark-only",
+                f"--benchmark-json={report}",
+                *options,
+                *nodeids,
+            ]
+            proc = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT)
+            if pin and cpu is not None:
+                _pin(proc.pid, cpu)
+            procs[proc.pid] = (i, cpu, list(nodeids), proc, report, log)
+            started[i] = time.monotonic()
+        # Reap workers in the order they exit so each finish time and CPU
+        # reading is taken as soon as its worker is done
+        done = []
+        running = {pid: entry[3] for pid, entry in procs.items()}
+        while running:
+            pid, cpu_seconds = _wait_any(running)
+            del running[pid]
+            i, cpu, nodeids, proc, report, log = procs[pid]
+            finished = time.monotonic()
+            after = _read_times()
+            contention = None
+            if (
+                pin
+                and cpu is not None
+                and cpu_seconds is not None
+                and cpu in before
+                and cpu in after
+            ):
+                busy = (after[cpu][0] - before[cpu][0]) / tick
+                contention = max(0.0, busy - cpu_seconds) / (finished - started[i])
+            log.seek(0)
+            output = log.read()
+            log.close()
+            data = None
+            if os.path.exists(report):
+                with open(report) as f:
+                    data = json.load(f)
+            done.append(
+                Shard(
+                    i,
+                    cpu,
+                    nodeids,
+                    proc.returncode,
+                    started[i],
+                    finished,
+                    data,
+                    output,
+                    contention,
+                )
+            )
+        done.sort()
+    samples = sampler.samples
+    return [
+        s._replace(
+            report=dict(
+                s.report,
+                runner=shard_conditions(samples, s.cpu, s.started, s.finished),
+            )
+        )
+        if s.report is not None
+        else s
+        for s in done
+    ]
+
+
+def merge(shards: Sequence[Shard], settings: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge shard reports into one pytest-benchmark report
+
+    machine_info, commit_info and version come from the first report, so
+    the result compares against serial runs of the same machine.
+    Benchmarks are sorted by fullname and get extra_info "cpu" and "noise".
+
+    Args:
+        shards (Sequence[Shard]): Shards of run_shards()
+        settings (Dict[str, Any]): Run settings stored under "runner"
+
+    Returns:
+        Dict[str, Any]: pytest-benchmark JSON document with an extra
+            "runner" section describing the shards
+    """
+    reports = [s for s in shards if s.report is not None]
+    if not reports:
+        raise RuntimeError("no shard produced a report")
+    first = reports[0].report
+    cpus = len(available_cpus())
+    benchmarks = []
+    described = []
+    for shard in shards:
+        conditions = dict(
+            (shard.report or {}).get("runner", {}), contention=shard.contention
+        )
+        for bench in (shard.report or {}).get("benchmarks", []):
+            extra = dict(bench.get("extra_info") or {})
+            extra["cpu"] = shard.cpu
+            extra["noise"] = noise_flags(bench["stats"], conditions, cpus)
+            benchmarks.append(dict(bench, extra_info=extra))
+        described.append(
+            {
+                "cpu": shard.cpu,
+                "tests": len(shard.nodeids),
+                "returncode": shard.returncode,
+                "seconds": shard.finished - shard.started,
+                **conditions,
+            }
+        )
+    benchmarks.sort(key=lambda b: b["fullname"])
+    return {
+        "machine_info": first["machine_info"],
+        "commit_info": first["commit_info"],
+        "benchmarks": benchmarks,
+        "datetime": datetime.now(timezone.utc).isoformat(),
+        "version": first["version"],
+        "runner": dict(settings, shards=described),
+    }
+
+
+def run(
+    paths: Sequence[str],
+    jobs: Optional[int] = None,
+    cpus: Optional[Sequence[int]] = None,
+    warmup: bool = False,
+    warmup_iterations: Optional[int] = None,
+    disable_gc: bool = False,
+    keyword: Optional[str] = None,
+    pytest_args: Sequence[str] = (),
+    interval: float = 0.5,
+) -> Dict[str, Any]:
+    """Run benchmark tests in parallel, one pinned worker per CPU
+
+    Benchmarks marked SERIAL_MARKER run after the pinned shards, in one
+    unpinned shard.
+
+    Args:
+        paths (Sequence[str]): Test files or directories
+        jobs (Optional[int]): Number of workers, defaults to one per CPU
+            leaving one CPU free when there are several
+        cpus (Optional[Sequence[int]]): Distinct CPUs to use, defaults to
+            the highest-numbered available ones
+        warmup (bool): Run pytest-benchmark warmup rounds
+        warmup_iterations (Optional[int]): Maximum warmup iterations
+        disable_gc (bool): Disable GC during the timed rounds
+        keyword (Optional[str]): pytest -k expression
+        pytest_args (Sequence[str]): Extra pytest arguments for every shard
+        interval (float): Seconds between CPU samples
+
+    Returns:
+        Dict[str, Any]: Merged pytest-benchmark report, see merge()
+    """
+    available = list(cpus) if cpus is not None else available_cpus()
+    if len(set(available)) != len(available):
+        raise ValueError("cpus must be distinct")
+    if jobs is None:
+        jobs = len(available) - 1 if len(available) > 1 else 1
+    if not 1 <= jobs <= len(available):
+        raise ValueError(f"jobs must be between 1 and {len(available)}")
+    nodeids = collect(paths, keyword, markers=f"not {SERIAL_MARKER}")
+    serial = collect(paths, keyword, markers=SERIAL_MARKER)
+    if not nodeids and not serial:
+        raise RuntimeError("no benchmark tests collected")
+    jobs = min(jobs, len(nodeids))
+    # CPU 0 usually handles most interrupts, so prefer the last CPUs
+    used = available[len(available) - jobs :]
+
+    options = list(pytest_args)
+    if warmup:
+        options.append("--benchmark-warmup=on")
+    if warmup_iterations is not None:
+        options.append(f"--benchmark-warmup-iterations={warmup_iterations}")
+    if disable_gc:
+        options.append("--benchmark-disable-gc")
+    shards = run_shards(split(nodeids, jobs), used, options, interval) if jobs else []
+    if serial:
+        # After the pinned shards, so the spawned processes have every CPU
+        (last,) = run_shards([serial], [None], options, interval)
+        shards.append(last._replace(index=len(shards)))
+    settings = {
+        "jobs": jobs,
+        "cpus": used,
+        "serial": len(serial),
+        "pinned": hasattr(os, "sched_setaffinity"),
+        "warmup": warmup,
+        "disable_gc": disable_gc,
+        "failed": [s.index for s in shards if s.returncode != 0],
+    }
+    report = merge(shards, settings)
+    for shard in shards:
+        if shard.returncode != 0:
+            report["runner"]["shards"][shard.index]["output"] = shard.output
+    return report
+
+
+def format_summary(report: Dict[str, Any]) -> str:
+    """Describe the shards and noisy benchmarks of a merged report
+
+    Args:
+        report (Dict[str, Any]): Report of run() or merge()
+
+    Returns:
+        str: Plain-text summary
+    """
+    lines = [
+        f"{'cpu':>4}  {'tests':>6}  {'seconds':>8}  {'MHz':>13}  {'busy':>5}  status"
+    ]
+    for shard in report["runner"]["shards"]:
+        freq = shard.get("freq_mhz")
+        busy = shard.get("busy")
+        mhz = f"{freq['min']:.0f}-{freq['max']:.0f}" if freq else "-"
+        load = f"{busy['mean']:.0%}" if busy else "-"
+        status = "ok" if shard["returncode"] == 0 else f"exit {shard['returncode']}"
+        cpu = "all" if shard["cpu"] is None else shard["cpu"]
+        lines.append(
+            f"{cpu:>4}  {shard['tests']:>6}  {shard['seconds']:>8.1f}  "
+            f"{mhz:>13}  {load:>5}  {status}"
+        )
+    noisy = [b for b in report["benchmarks"] if b["extra_info"]["noise"]]
+    lines.append(f"{len(report['benchmarks'])} benchmarks, {len(noisy)} noisy")
+    for bench in noisy:
+        lines.append(
+            f"  {bench['fullname']}: {', '.join(bench['extra_info']['noise'])}"
+        )
+    return "\n".join(lines)
+
+
+def _cpu_list(value: str) -> List[int]:
+    return [int(c) for c in value.split(",") if c]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m llm_benchmark.bench.runner",
+        description="Run benchmark tests in parallel workers pinned to CPUs.",
+    )
+    parser.add_argument("paths", nargs="*", default=["tests"])
+    parser.add_argument("-j", "--jobs", type=int, help="number of workers")
+    parser.add_argument(
+        "--cpus", type=_cpu_list, help="comma-separated CPUs to pin workers to"
+    )
+    parser.add_argument("-k", dest="keyword", help="pytest -k expression")
+    parser.add_argument("--warmup", action="store_true", help="run warmup rounds")
+    parser.add_argument("--warmup-iterations", type=int)
+    parser.add_argument(
+        "--disable-gc", action="store_true", help="disable GC in timed rounds"
+    )
+    parser.add_argument("--interval", type=float, default=0.5)
+    parser.add_argument(
+        "--pytest-arg",
+        action="append",
+        default=[],
+        dest="pytest_args",
+        help="extra pytest argument for every worker, repeatable",
+    )
+    parser.add_argument("--json", default=DEFAULT_OUTPUT, metavar="PATH")
+    args = parser.parse_args(argv)
+
+    report = run(
+        args.paths,
+        args.jobs,
+        args.cpus,
+        args.warmup,
+        args.warmup_iterations,
+        args.disable_gc,
+        args.keyword,
+        args.pytest_args,
+        args.interval,
+    )
+    directory = os.path.dirname(args.json)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.json, "w") as f:
+        json.dump(report, f, indent=4)
+    print(format_summary(report))
+    for shard in report["runner"]["shards"]:
+        if "output" in shard:
+            print(shard["output"])
+    return 1 if report["runner"]["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
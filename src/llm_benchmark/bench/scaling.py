@@ -0,0 +1,513 @@
+"""Asymptotic scaling benchmarks with complexity-class fitting.
+
+Every public function of ``llm_benchmark`` (module-level functions, static
+and class methods, and constructors) has a registered ``Case``: an input
+builder ``build(n)`` and the complexity class it is expected to stay within.
+``measure`` times a case over a geometric ladder of sizes and ``fit`` matches
+the timings against each class in ``COMPLEXITIES``:
+
+    t(n) ~ a + b * f(n)
+
+by least squares on the relative error, so small and large sizes weigh the
+same. The lowest class whose error is within ``tolerance`` of the best fit
+is reported; a case fails when that class is above its expectation.
+
+Run from the command line::
+
+    python -m llm_benchmark.bench.scaling [NAME ...] [--json out.json]
+"""
+import argparse
+import importlib
+import inspect
+import json
+import math
+import pkgutil
+import sys
+import time
+from collections import deque
+from io import BytesIO
+from random import Random
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import llm_benchmark
+from llm_benchmark.algorithms.primes import Primes
+from llm_benchmark.algorithms.sort import Sort
+from llm_benchmark.control.aggregate import RunningStats
+from llm_benchmark.control.double import DoubleForLoop
+from llm_benchmark.control.frequency import FrequencyTable, sliding_count_pairs
+from llm_benchmark.control.series import (
+    sum_multiples,
+    sum_multiples_any,
+    sum_multiples_many,
+)
+from llm_benchmark.control.single import SingleForLoop
+from llm_benchmark.datastructures.bst import Node, Tree
+from llm_benchmark.datastructures.dslist import DsList
+from llm_benchmark.datastructures.list_index import ListIndex
+from llm_benchmark.datastructures.matrix import Matrix
+from llm_benchmark.generator.gen_list import GenList
+from llm_benchmark.generator.stream import ChunkedDataset, chunk_seed
+from llm_benchmark.strings.palindrome import PalindromeIndex, is_palindrome
+from llm_benchmark.strings.strops import StrOps
+from llm_benchmark.strings.suffix_array import SuffixArray
+
+# Ordered from slowest- to fastest-growing
+COMPLEXITIES: Dict[str, Callable[[int], float]] = {
+    "1": lambda n: 0.0,
+    "log n": lambda n: math.log2(n),
+    "n": lambda n: float(n),
+    "n log n": lambda n: n * math.log2(n),
+    "n^2": lambda n: float(n) * n,
+}
+
+DEFAULT_SIZES = [1 << k for k in range(8, 15)]
+QUADRATIC_SIZES = [1 << k for k in range(5, 10)]
+
+# A class is accepted when its relative RMS error is at most the best
+# class's error plus this margin
+DEFAULT_TOLERANCE = 0.15
+
+# Public callables that take no size-like input; they are not benchmarked
+EXCLUDED: Dict[str, str] = {
+    "NumpyBackend": "backend configuration",
+    "register_backend": "backend configuration",
+    "available_backends": "backend configuration",
+    "set_backend": "backend configuration",
+    "use_backend": "backend configuration",
+    "get_threshold": "backend configuration",
+    "set_threshold": "backend configuration",
+    "get_backend": "backend configuration",
+    "MatrixReducer": "process pool setup",
+    "ShardedGenerator": "process pool setup",
+    "MappedDataset": "opens an existing cache file",
+    "SuffixArray.load": "opens an existing index file",
+    "instrumented": "instrumentation control",
+    "install": "instrumentation control",
+    "uninstall": "instrumentation control",
+    "enable": "instrumentation control",
+    "disable": "instrumentation control",
+    "is_enabled": "instrumentation control",
+    "reset": "instrumentation control",
+    "profile_next": "instrumentation control",
+    "profile_stats": "instrumentation control",
+    "snapshot": "instrumentation control",
+    "to_json": "instrumentation control",
+    "to_prometheus": "instrumentation control",
+    "SqlQuery.query_album": "database workload, see bench.workload",
+    "SqlQuery.join_albums": "database workload, see bench.workload",
+    "SqlQuery.top_invoices": "database workload, see bench.workload",
+    "schema": "reads the chinook schema",
+    "generate": "writes a database file",
+    "scaled_db": "writes a database file",
+}
+
+
+class Case(NamedTuple):
+    """A scaling benchmark for one public function.
+
+    Attributes:
+        name: Qualified name, e.g. "Sort.sort_list"
+        func: Function under test
+        build: Returns the positional arguments for input size n
+        expected: Key of COMPLEXITIES the function must not exceed
+        sizes: Size ladder
+        fresh: Rebuild the inputs before every call, for functions that
+               mutate them
+    """
+
+    name: str
+    func: Callable[..., Any]
+    build: Callable[[int], tuple]
+    expected: str
+    sizes: Sequence[int]
+    fresh: bool = False
+
+
+class Fit(NamedTuple):
+    """Complexity class fitted to a series of timings.
+
+    Attributes:
+        complexity: Selected key of COMPLEXITIES
+        coefficients: (a, b) of t(n) = a + b * f(n) for the selected class
+        errors: Relative RMS error of every class
+    """
+
+    complexity: str
+    coefficients: tuple
+    errors: Dict[str, float]
+
+
+class Result(NamedTuple):
+    """Outcome of one scaling benchmark."""
+
+    name: str
+    expected: str
+    fitted: str
+    ok: bool
+    sizes: List[int]
+    times: List[float]
+    errors: Dict[str, float]
+
+
+CASES: Dict[str, Case] = {}
+
+
+def case(
+    func: Callable[..., Any],
+    expected: str,
+    build: Callable[[int], tuple],
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    fresh: bool = False,
+) -> Case:
+    """Register a scaling benchmark
+
+    Args:
+        func (Callable[..., Any]): Function under test
+        expected (str): Expected complexity class, a key of COMPLEXITIES
+        build (Callable[[int], tuple]): Builds the arguments for size n
+        sizes (Sequence[int]): Size ladder
+        fresh (bool): Rebuild the inputs before every call
+
+    Returns:
+        Case: The registered case
+    """
+    if expected not in COMPLEXITIES:
+        raise ValueError(f"unknown complexity class {expected!r}")
+    entry = Case(func.__qualname__, func, build, expected, list(sizes), fresh)
+    CASES[entry.name] = entry
+    return entry
+
+
+def public_functions() -> Dict[str, Callable[..., Any]]:
+    """All public callables of llm_benchmark that need a scaling case
+
+    Module-level functions, constructors of public classes that define
+    __init__, and public static and class methods are collected; the bench
+    package is skipped.
+
+    Returns:
+        Dict[str, Callable[..., Any]]: Callables keyed by qualified name
+    """
+    found: Dict[str, Callable[..., Any]] = {}
+    for info in pkgutil.walk_packages(llm_benchmark.__path__, "llm_benchmark."):
+        if info.name.startswith("llm_benchmark.bench"):
+            continue
+        module = importlib.import_module(info.name)
+        for name, obj in vars(module).items():
+            if name.startswith("_") or getattr(obj, "__module__", None) != info.name:
+                continue
+            if inspect.isfunction(obj) or (
+                inspect.isclass(obj) and "__init__" in vars(obj)
+            ):
+                found[obj.__qualname__] = obj
+            if inspect.isclass(obj):
+                for attr, member in vars(obj).items():
+                    if not attr.startswith("_") and isinstance(
+                        member, (staticmethod, classmethod)
+                    ):
+                        method = getattr(obj, attr)
+                        found[method.__qualname__] = method
+    return found
+
+
+def _ints(n: int, seed: int = 0) -> List[int]:
+    rng = Random(seed)
+    return [rng.randrange(n) for _ in range(n)]
+
+
+def _text(n: int, alphabet: str = "acgt", seed: int = 0) -> str:
+    rng = Random(seed)
+    return "".join(rng.choice(alphabet) for _ in range(n))
+
+
+def _palindrome(n: int) -> str:
+    half = _text(n // 2)
+    return half + half[::-1]
+
+
+def _prime_near(n: int) -> int:
+    while not Primes.is_prime(n):
+        n += 1
+    return n
+
+
+def _side(n: int) -> int:
+    return max(1, math.isqrt(n))
+
+
+# Trial division runs up to sqrt(p), so n ~ sqrt(p) makes it linear in n
+case(Primes.is_prime, "n", lambda n: (_prime_near(n * n),))
+case(Primes.is_prime_ineff, "n", lambda n: (_prime_near(n),), [8, 16, 32, 64, 128])
+case(Primes.sum_primes, "n log n", lambda n: (n,))
+case(Primes.prime_factors, "n", lambda n: (_prime_near(n * n),))
+
+case(Sort.sort_list, "n^2", lambda n: (_ints(n),), QUADRATIC_SIZES, fresh=True)
+case(Sort.dutch_flag_partition, "n", lambda n: (_ints(n), n // 2), fresh=True)
+case(Sort.max_n, "n", lambda n: (_ints(n), 10))
+
+case(SingleForLoop.sum_range, "1", lambda n: (n,))
+case(SingleForLoop.max_list, "n", lambda n: (_ints(n),))
+case(
+    SingleForLoop.max_stream,
+    "n",
+    lambda n: (GenList.iter_random_matrix(_side(n), n),),
+    fresh=True,
+)
+case(SingleForLoop.sum_modulus, "1", lambda n: (n, 3))
+
+case(DoubleForLoop.sum_square, "1", lambda n: (n,))
+case(DoubleForLoop.sum_triangle, "1", lambda n: (n,))
+case(DoubleForLoop.sum_square_many, "n", lambda n: (list(range(n)),))
+case(DoubleForLoop.sum_triangle_many, "n", lambda n: (list(range(n)),))
+case(DoubleForLoop.count_pairs, "n", lambda n: (_ints(n),))
+case(DoubleForLoop.count_duplicates, "n", lambda n: (_ints(n), _ints(n, 1)))
+case(DoubleForLoop.sum_matrix, "n", lambda n: (GenList.random_matrix(_side(n), n),))
+
+case(sum_multiples, "1", lambda n: (n, 7))
+case(sum_multiples_any, "1", lambda n: (n, (3, 5, 7)))
+case(sum_multiples_many, "n", lambda n: ([(q, 7) for q in range(n)],))
+
+case(RunningStats, "1", lambda n: ())
+case(RunningStats.from_chunks, "n", lambda n: ([_ints(n)],))
+case(FrequencyTable, "n", lambda n: (_ints(n),))
+case(sliding_count_pairs, "n", lambda n: (_ints(n), 64))
+
+case(Node, "1", lambda n: (n,))
+# Every insert recomputes the height over the whole tree
+case(Tree, "n^2", lambda n: (_ints(n),), QUADRATIC_SIZES)
+case(DsList.modify_list, "n", lambda n: (_ints(n),))
+case(DsList.search_list, "n", lambda n: (_ints(n), 0))
+case(DsList.sort_list, "n log n", lambda n: (_ints(n),))
+case(DsList.reverse_list, "n", lambda n: (_ints(n),))
+case(DsList.rotate_list, "n", lambda n: (_ints(n), n // 3))
+case(DsList.merge_lists, "n", lambda n: (_ints(n), _ints(n, 1)))
+case(ListIndex, "n", lambda n: (_ints(n),))
+case(Matrix, "n", lambda n: (_side(n), _side(n)))
+case(Matrix.from_lists, "n", lambda n: (GenList.random_matrix(_side(n), n),))
+
+case(GenList.random_list, "n", lambda n: (n, n))
+case(GenList.random_matrix, "n", lambda n: (_side(n), n))
+case(GenList.fast_random_list, "n", lambda n: (n, n, 0))
+case(GenList.random_compact_matrix, "n", lambda n: (_side(n), n, 0))
+case(GenList.iter_random_list, "n", lambda n: (n, n, 64))
+case(GenList.iter_random_matrix, "n", lambda n: (_side(n), n))
+case(chunk_seed, "1", lambda n: (0, n))
+# Chunks are generated lazily, so construction does not depend on n
+case(ChunkedDataset, "1", lambda n: (n, n))
+
+case(is_palindrome, "n", lambda n: (_palindrome(n),))
+case(PalindromeIndex, "n", lambda n: (_text(n),))
+case(SuffixArray, "n log n", lambda n: (_text(n),))
+case(StrOps.str_reverse, "n", lambda n: (_text(n),))
+case(StrOps.reverse_inplace, "n", lambda n: (bytearray(_text(n), "ascii"),))
+case(StrOps.reverse_to_file, "n", lambda n: (_text(n).encode(), BytesIO()), fresh=True)
+case(StrOps.palindrome, "n", lambda n: (_palindrome(n),))
+case(StrOps.reverse_many, "n", lambda n: (_text(n).split("a"),))
+case(StrOps.palindrome_many, "n", lambda n: (_text(n).split("a"),))
+
+
+def _call(func: Callable[..., Any], args: tuple) -> None:
+    result = func(*args)
+    if isinstance(result, Iterator):
+        deque(result, maxlen=0)
+
+
+def _time_one(entry: Case, n: int, args: tuple, min_time: float) -> float:
+    """Time per call, in seconds, of one timing of a case at size n"""
+    if entry.fresh:
+        args = entry.build(n)
+        start = time.perf_counter()
+        _call(entry.func, args)
+        return time.perf_counter() - start
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            _call(entry.func, args)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / number
+        number *= 2
+
+
+def fit(
+    sizes: Sequence[int], times: Sequence[float], tolerance: float = DEFAULT_TOLERANCE
+) -> Fit:
+    """Fit timings to the complexity classes
+
+    Each class is fitted as t = a + b * f(n) with b >= 0, minimizing the
+    relative error (t_fit - t) / t.
+
+    Args:
+        sizes (Sequence[int]): Input sizes
+        times (Sequence[float]): Time per call at each size
+        tolerance (float): Margin over the best relative RMS error within
+            which the slowest-growing class is preferred
+
+    Returns:
+        Fit: Selected class, its coefficients and the error of every class
+    """
+    if len(sizes) != len(times) or len(sizes) < 2:
+        raise ValueError("need at least two (size, time) points")
+    coefficients: Dict[str, tuple] = {}
+    errors: Dict[str, float] = {}
+    for name, growth in COMPLEXITIES.items():
+        # Weighted least squares with weights 1 / t^2
+        w = [1 / (t * t) for t in times]
+        f = [growth(n) for n in sizes]
+        sw = sum(w)
+        swf = sum(wi * fi for wi, fi in zip(w, f))
+        swff = sum(wi * fi * fi for wi, fi in zip(w, f))
+        swt = sum(wi * ti for wi, ti in zip(w, times))
+        swft = sum(wi * fi * ti for wi, fi, ti in zip(w, f, times))
+        det = sw * swff - swf * swf
+        b = (sw * swft - swf * swt) / det if det > 0 else 0.0
+        if b <= 0:
+            a, b = swt / sw, 0.0
+        else:
+            a = (swt - b * swf) / sw
+        residuals = [(a + b * fi - ti) / ti for fi, ti in zip(f, times)]
+        coefficients[name] = (a, b)
+        errors[name] = math.sqrt(sum(r * r for r in residuals) / len(residuals))
+    best = min(errors.values())
+    selected = next(name for name in COMPLEXITIES if errors[name] <= best + tolerance)
+    return Fit(selected, coefficients[selected], errors)
+
+
+def exceeds(fitted: str, expected: str) -> bool:
+    """Whether a complexity class grows faster than another
+
+    Args:
+        fitted (str): Measured class
+        expected (str): Declared class
+
+    Returns:
+        bool: True if fitted is above expected in COMPLEXITIES
+    """
+    order = list(COMPLEXITIES)
+    return order.index(fitted) > order.index(expected)
+
+
+def measure(
+    entry: Case,
+    sizes: Optional[Sequence[int]] = None,
+    repeat: int = 5,
+    min_time: float = 1e-3,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> Result:
+    """Time a case over its size ladder and fit its complexity class
+
+    Args:
+        entry (Case): Case to run
+        sizes (Optional[Sequence[int]]): Overrides the case's size ladder
+        repeat (int): Rounds over the size ladder; the fastest timing of
+            each size is kept
+        min_time (float): Minimum seconds per timing, reached by looping
+            fast functions
+        tolerance (float): See fit()
+
+    Returns:
+        Result: Timings, fitted class and whether it is within expectation
+    """
+    sizes = list(sizes or entry.sizes)
+    inputs = [() if entry.fresh else entry.build(n) for n in sizes]
+    times = [math.inf] * len(sizes)
+    # Sweep the whole ladder once per round so a transient slowdown only
+    # hits one timing of one size, then keep the fastest round of each size
+    for _ in range(repeat):
+        for i, n in enumerate(sizes):
+            times[i] = min(times[i], _time_one(entry, n, inputs[i], min_time))
+    result = fit(sizes, times, tolerance)
+    return Result(
+        entry.name,
+        entry.expected,
+        result.complexity,
+        not exceeds(result.complexity, entry.expected),
+        sizes,
+        times,
+        result.errors,
+    )
+
+
+def run(
+    names: Optional[Sequence[str]] = None,
+    repeat: int = 5,
+    min_time: float = 1e-3,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[Result]:
+    """Run scaling benchmarks
+
+    Args:
+        names (Optional[Sequence[str]]): Case names, defaults to all cases
+        repeat (int): See measure()
+        min_time (float): See measure()
+        tolerance (float): See fit()
+
+    Returns:
+        List[Result]: One result per case, in order
+    """
+    unknown = set(names or ()) - set(CASES)
+    if unknown:
+        raise ValueError(f"unknown cases: {', '.join(sorted(unknown))}")
+    return [
+        measure(CASES[name], repeat=repeat, min_time=min_time, tolerance=tolerance)
+        for name in (names or CASES)
+    ]
+
+
+def to_json(results: Sequence[Result]) -> str:
+    """Serialize results as a JSON document
+
+    Args:
+        results (Sequence[Result]): Results of run()
+
+    Returns:
+        str: JSON object with a "results" list
+    """
+    return json.dumps({"results": [r._asdict() for r in results]}, indent=2)
+
+
+def format_table(results: Sequence[Result]) -> str:
+    """Render results as a plain-text table
+
+    Args:
+        results (Sequence[Result]): Results of run()
+
+    Returns:
+        str: One line per result
+    """
+    width = max([len(r.name) for r in results] + [4])
+    lines = [f"{'case':<{width}}  {'expected':<8}  {'fitted':<8}  status"]
+    for r in results:
+        status = "ok" if r.ok else "FAIL"
+        lines.append(f"{r.name:<{width}}  {r.expected:<8}  {r.fitted:<8}  {status}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m llm_benchmark.bench.scaling",
+        description="Fit the complexity class of every public function.",
+    )
+    parser.add_argument("names", nargs="*", help="cases to run (default: all)")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=1e-3)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--list", action="store_true", help="list cases and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for entry in CASES.values():
+            print(f"{entry.name}  {entry.expected}")
+        return 0
+    results = run(args.names, args.repeat, args.min_time, args.tolerance)
+    print(format_table(results))
+    if args.json:
+        with open(args.json, "w") as f:
+            f.write(to_json(results))
+    return 0 if all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
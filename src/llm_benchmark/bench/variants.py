@@ -0,0 +1,515 @@
+"""Side-by-side comparison of baseline and optimized implementations.
+
+Each ``Operation`` pairs a baseline, the slow reference implementation
+(e.g. ``Primes.is_prime_ineff``), with one or more optimized variants that
+must compute the same results. ``check`` runs every variant on randomized
+inputs and reports the inputs where it disagrees with the baseline;
+``compare`` times all implementations on the same inputs over a size ladder
+and reports each one's speedup over the baseline.
+
+Run from the command line::
+
+    python -m llm_benchmark.bench.variants [NAME ...] [--json out.json]
+"""
+import argparse
+import copy
+import json
+import math
+import operator
+import sys
+import time
+from functools import partial
+from random import Random
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from llm_benchmark.algorithms.primes import Primes
+from llm_benchmark.algorithms.sort import Sort
+from llm_benchmark.backend import available_backends
+from llm_benchmark.control.double import DoubleForLoop
+from llm_benchmark.control.frequency import FrequencyTable, sliding_count_pairs
+from llm_benchmark.control.single import SingleForLoop
+from llm_benchmark.datastructures.dslist import DsList
+from llm_benchmark.datastructures.matrix import Matrix
+
+# Randomized inputs per size checked by check()
+DEFAULT_TRIALS = 20
+
+Implementation = Union[Callable[..., Any], Tuple[str, Callable[..., Any]]]
+
+
+class Operation(NamedTuple):
+    """A baseline and its optimized variants.
+
+    Attributes:
+        name: Operation name, e.g. "is_prime"
+        implementations: Callables keyed by label; the first one is the
+                         baseline
+        generate: Returns the positional arguments for size n, drawing
+                  random values from the given generator
+        sizes: Size ladder
+        equal: Whether two results are equivalent
+        fresh: Give every call its own copy of the inputs, for
+               implementations that mutate them
+    """
+
+    name: str
+    implementations: Dict[str, Callable[..., Any]]
+    generate: Callable[[Random, int], tuple]
+    sizes: Sequence[int]
+    equal: Callable[[Any, Any], bool] = operator.eq
+    fresh: bool = False
+
+    @property
+    def baseline(self) -> str:
+        return next(iter(self.implementations))
+
+
+class Mismatch(NamedTuple):
+    """An input on which a variant disagrees with the baseline."""
+
+    operation: str
+    variant: str
+    n: int
+    args: str
+    expected: str
+    actual: str
+
+
+class Timing(NamedTuple):
+    """Time per call of one implementation at one size."""
+
+    operation: str
+    implementation: str
+    n: int
+    seconds: float
+    speedup: float
+
+
+OPERATIONS: Dict[str, Operation] = {}
+
+
+def operation(
+    name: str,
+    generate: Callable[[Random, int], tuple],
+    baseline: Implementation,
+    *variants: Implementation,
+    sizes: Sequence[int],
+    equal: Callable[[Any, Any], bool] = operator.eq,
+    fresh: bool = False,
+) -> Operation:
+    """Register a baseline and its optimized variants
+
+    Args:
+        name (str): Operation name
+        generate (Callable[[Random, int], tuple]): Builds the arguments for
+            size n
+        baseline (Implementation): Reference implementation, a callable or
+            a (label, callable) pair; callables are labelled by qualified
+            name
+        *variants (Implementation): Optimized implementations
+        sizes (Sequence[int]): Size ladder
+        equal (Callable[[Any, Any], bool]): Result equivalence
+        fresh (bool): Copy the inputs for every call
+
+    Returns:
+        Operation: The registered operation
+    """
+    if not variants:
+        raise ValueError("an operation needs at least one variant")
+    implementations: Dict[str, Callable[..., Any]] = {}
+    for impl in (baseline,) + variants:
+        label, func = impl if isinstance(impl, tuple) else (impl.__qualname__, impl)
+        if label in implementations:
+            raise ValueError(f"duplicate implementation {label!r}")
+        implementations[label] = func
+    entry = Operation(name, implementations, generate, list(sizes), equal, fresh)
+    OPERATIONS[name] = entry
+    return entry
+
+
+def _in_place(func: Callable[[list], None]) -> Callable[[list], list]:
+    """Adapt an in-place sort to return the sorted list"""
+
+    def call(v: list) -> list:
+        func(v)
+        return v
+
+    return call
+
+
+def _count_pairs_rescan(arr: List[int]) -> int:
+    """count_pairs rescanning the list once per distinct value"""
+    return sum(1 for x in set(arr) if arr.count(x) == 2)
+
+
+def _sum_modulus_loop(n: int, m: int) -> int:
+    """sum_modulus by testing every number below n"""
+    return sum(i for i in range(n) if i % m == 0)
+
+
+def _sum_matrix_nested(m: List[List[int]]) -> int:
+    """sum_matrix with an explicit double loop"""
+    total = 0
+    for row in m:
+        for x in row:
+            total += x
+    return total
+
+
+def _sliding_recount(values: List[int], window: int) -> List[int]:
+    """sliding_count_pairs recounting every window from scratch"""
+    return [
+        DoubleForLoop.count_pairs(values[i : i + window])
+        for i in range(len(values) - window + 1)
+    ]
+
+
+def _ints(rng: Random, n: int, span: Optional[int] = None) -> List[int]:
+    return [rng.randrange(span or n) for _ in range(n)]
+
+
+def _matrix(rng: Random, n: int) -> tuple:
+    return ([_ints(rng, n, 1000) for _ in range(n)],)
+
+
+def _backends(func: Callable[..., Any]) -> List[Implementation]:
+    """func on every available backend, the pure Python one first"""
+    name = func.__qualname__
+    return [
+        (f"{name}[{backend}]", partial(func, backend=backend))
+        for backend in sorted(available_backends(), key=lambda b: b != "python")
+    ]
+
+
+operation(
+    "is_prime",
+    lambda rng, n: (rng.randrange(n),),
+    Primes.is_prime_ineff,
+    Primes.is_prime,
+    sizes=[8, 32, 128],
+)
+operation(
+    "sort_list",
+    lambda rng, n: (_ints(rng, n),),
+    ("Sort.sort_list", _in_place(Sort.sort_list)),
+    DsList.sort_list,
+    ("list.sort", _in_place(list.sort)),
+    sizes=[16, 128, 1024],
+    fresh=True,
+)
+operation(
+    "count_pairs",
+    lambda rng, n: (_ints(rng, n, n // 2 + 1),),
+    ("count_pairs[rescan]", _count_pairs_rescan),
+    DoubleForLoop.count_pairs,
+    ("FrequencyTable.pairs", lambda arr: FrequencyTable(arr).pairs),
+    sizes=[64, 512, 4096],
+)
+operation(
+    "sliding_count_pairs",
+    lambda rng, n: (_ints(rng, n, 16), 32),
+    ("sliding_count_pairs[recount]", _sliding_recount),
+    ("sliding_count_pairs", lambda v, w: list(sliding_count_pairs(v, w))),
+    sizes=[64, 512, 4096],
+)
+operation(
+    "sum_modulus",
+    lambda rng, n: (n, rng.randrange(1, 50)),
+    ("sum_modulus[loop]", _sum_modulus_loop),
+    SingleForLoop.sum_modulus,
+    sizes=[1000, 10000, 100000],
+)
+operation(
+    "sum_matrix",
+    _matrix,
+    ("sum_matrix[nested]", _sum_matrix_nested),
+    *_backends(DoubleForLoop.sum_matrix),
+    ("Matrix.from_lists", lambda m: DoubleForLoop.sum_matrix(Matrix.from_lists(m))),
+    sizes=[16, 64, 256],
+)
+
+# Backend variants only exist when an optional backend is installed
+if len(available_backends()) > 1:
+    operation(
+        "modify_list",
+        lambda rng, n: (_ints(rng, n),),
+        *_backends(DsList.modify_list),
+        sizes=[1000, 10000, 100000],
+    )
+    operation(
+        "search_list",
+        lambda rng, n: (_ints(rng, n, 100), 7),
+        *_backends(DsList.search_list),
+        sizes=[1000, 10000, 100000],
+    )
+    operation(
+        "count_duplicates",
+        lambda rng, n: (_ints(rng, n, 4), _ints(rng, n, 4)),
+        *_backends(DoubleForLoop.count_duplicates),
+        sizes=[1000, 10000, 100000],
+    )
+
+
+def _short(value: Any, limit: int = 200) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def _copy(op: Operation, args: tuple) -> tuple:
+    return copy.deepcopy(args) if op.fresh else args
+
+
+def check(
+    op: Operation,
+    trials: int = DEFAULT_TRIALS,
+    sizes: Optional[Sequence[int]] = None,
+    seed: int = 0,
+) -> List[Mismatch]:
+    """Compare every variant with the baseline on randomized inputs
+
+    Args:
+        op (Operation): Operation to check
+        trials (int): Random inputs per size
+        sizes (Optional[Sequence[int]]): Overrides the operation's sizes
+        seed (int): Seed of the input generator
+
+    Returns:
+        List[Mismatch]: Inputs on which a variant disagrees, empty if all
+            variants are equivalent
+    """
+    rng = Random(seed)
+    baseline = op.implementations[op.baseline]
+    mismatches = []
+    for n in sizes or op.sizes:
+        for _ in range(trials):
+            args = op.generate(rng, n)
+            expected = baseline(*_copy(op, args))
+            for label, func in op.implementations.items():
+                if label == op.baseline:
+                    continue
+                actual = func(*_copy(op, args))
+                if not op.equal(expected, actual):
+                    mismatches.append(
+                        Mismatch(
+                            op.name,
+                            label,
+                            n,
+                            _short(args),
+                            _short(expected),
+                            _short(actual),
+                        )
+                    )
+    return mismatches
+
+
+def time_call(
+    func: Callable[..., Any], args: tuple, fresh: bool = False, min_time: float = 1e-3
+) -> float:
+    """Time per call, in seconds, looping fast functions up to min_time
+
+    Args:
+        func (Callable[..., Any]): Function to time
+        args (tuple): Positional arguments
+        fresh (bool): Give every call its own deep copy of args, made
+            before the clock starts
+        min_time (float): Minimum seconds per timing
+
+    Returns:
+        float: Seconds per call
+    """
+    number = 1
+    while True:
+        calls = [copy.deepcopy(args) for _ in range(number)] if fresh else None
+        start = time.perf_counter()
+        for i in range(number):
+            func(*(calls[i] if calls else args))
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / number
+        number *= 2
+
+
+def compare(
+    op: Operation,
+    sizes: Optional[Sequence[int]] = None,
+    repeat: int = 3,
+    min_time: float = 1e-3,
+    seed: int = 0,
+) -> List[Timing]:
+    """Time every implementation of an operation on the same inputs
+
+    Args:
+        op (Operation): Operation to time
+        sizes (Optional[Sequence[int]]): Overrides the operation's sizes
+        repeat (int): Rounds over the implementations; the fastest timing
+            of each is kept
+        min_time (float): See time_call()
+        seed (int): Seed of the input generator
+
+    Returns:
+        List[Timing]: One timing per size and implementation, baseline first
+    """
+    timings = []
+    for n in sizes or op.sizes:
+        args = op.generate(Random(seed), n)
+        best = dict.fromkeys(op.implementations, math.inf)
+        # Alternate implementations within each round so drift in machine
+        # speed affects them alike
+        for _ in range(repeat):
+            for label, func in op.implementations.items():
+                best[label] = min(
+                    best[label], time_call(func, args, op.fresh, min_time)
+                )
+        base = best[op.baseline]
+        timings.extend(
+            Timing(op.name, label, n, seconds, base / seconds)
+            for label, seconds in best.items()
+        )
+    return timings
+
+
+def run(
+    names: Optional[Sequence[str]] = None,
+    trials: int = DEFAULT_TRIALS,
+    repeat: int = 3,
+    min_time: float = 1e-3,
+    seed: int = 0,
+) -> Tuple[List[Mismatch], List[Timing]]:
+    """Check and time operations
+
+    Operations with mismatches are not timed.
+
+    Args:
+        names (Optional[Sequence[str]]): Operation names, defaults to all
+        trials (int): See check()
+        repeat (int): See compare()
+        min_time (float): See time_call()
+        seed (int): Seed of the input generators
+
+    Returns:
+        Tuple[List[Mismatch], List[Timing]]: Mismatches and timings of all
+            operations, in order
+    """
+    unknown = set(names or ()) - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f"unknown operations: {', '.join(sorted(unknown))}")
+    mismatches: List[Mismatch] = []
+    timings: List[Timing] = []
+    for name in names or OPERATIONS:
+        op = OPERATIONS[name]
+        found = check(op, trials, seed=seed)
+        mismatches.extend(found)
+        if not found:
+            timings.extend(compare(op, repeat=repeat, min_time=min_time, seed=seed))
+    return mismatches, timings
+
+
+def to_json(mismatches: Sequence[Mismatch], timings: Sequence[Timing]) -> str:
+    """Serialize a run as a JSON document
+
+    Args:
+        mismatches (Sequence[Mismatch]): Mismatches of run()
+        timings (Sequence[Timing]): Timings of run()
+
+    Returns:
+        str: JSON object with "mismatches" and "timings" lists
+    """
+    return json.dumps(
+        {
+            "mismatches": [m._asdict() for m in mismatches],
+            "timings": [t._asdict() for t in timings],
+        },
+        indent=2,
+    )
+
+
+def _seconds(value: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if value >= scale:
+            return f"{value / scale:.3f} {unit}"
+    return f"{value / 1e-9:.3f} ns"
+
+
+def format_table(timings: Sequence[Timing]) -> str:
+    """Render timings as a speedup table
+
+    Args:
+        timings (Sequence[Timing]): Timings of compare() or run()
+
+    Returns:
+        str: One line per implementation and size
+    """
+    op_width = max([len(t.operation) for t in timings] + [9])
+    impl_width = max([len(t.implementation) for t in timings] + [14])
+    lines = [
+        f"{'operation':<{op_width}}  {'n':>8}  {'implementation':<{impl_width}}  "
+        f"{'time':>12}  {'speedup':>10}"
+    ]
+    for t in timings:
+        lines.append(
+            f"{t.operation:<{op_width}}  {t.n:>8}  {t.implementation:<{impl_width}}  "
+            f"{_seconds(t.seconds):>12}  {t.speedup:>9.1f}x"
+        )
+    return "\n".join(lines)
+
+
+def format_mismatches(mismatches: Sequence[Mismatch]) -> str:
+    """Render mismatches, one per line
+
+    Args:
+        mismatches (Sequence[Mismatch]): Mismatches of check() or run()
+
+    Returns:
+        str: Description of every mismatch
+    """
+    return "\n".join(
+        f"{m.operation}: {m.variant} at n={m.n} returned {m.actual}, baseline "
+        f"{m.expected}, for args {m.args}"
+        for m in mismatches
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m llm_benchmark.bench.variants",
+        description="Check optimized variants against their baselines and "
+        "report speedups.",
+    )
+    parser.add_argument("names", nargs="*", help="operations to run (default: all)")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--trials", type=int, default=DEFAULT_TRIALS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=1e-3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--list", action="store_true", help="list operations and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for op in OPERATIONS.values():
+            print(f"{op.name}  {', '.join(op.implementations)}")
+        return 0
+    mismatches, timings = run(
+        args.names, args.trials, args.repeat, args.min_time, args.seed
+    )
+    if timings:
+        print(format_table(timings))
+    if mismatches:
+        print(format_mismatches(mismatches))
+    if args.json:
+        with open(args.json, "w") as f:
+            f.write(to_json(mismatches, timings))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,487 @@
+"""Concurrent SqlQuery workload against a chinook database.
+
+``run_workload`` replays a random mix of ``SqlQuery.query_album``,
+``SqlQuery.join_albums`` and ``SqlQuery.top_invoices`` calls, plus invoice
+inserts, from several threads, each holding its own connection. It reports
+throughput and latency percentiles per query. The mix is drawn before the
+clock starts, so generating it is not timed.
+
+``sweep`` repeats the workload over journal modes (rollback journal vs WAL)
+and ``mmap_size`` / ``cache_size`` pragmas. Each configuration runs on a
+fresh copy of the database, so inserts from one run do not leak into the
+next. Scaled databases come from ``llm_benchmark.sql.synth``.
+
+Run from the command line::
+
+    python -m llm_benchmark.bench.workload --scale 100 -c 1 4 --json out.json
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from random import Random
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from llm_benchmark.sql.query import SqlQuery
+from llm_benchmark.sql.synth import scaled_db
+
+# Share of calls per query
+MIX: Dict[str, float] = {
+    "query_album": 0.70,
+    "top_invoices": 0.20,
+    "join_albums": 0.05,
+    "insert_invoice": 0.05,
+}
+
+PERCENTILES = (50, 90, 99)
+
+JOURNAL_MODES = ("delete", "truncate", "persist", "wal")
+
+# Seconds a connection waits for a lock before failing with "database is
+# locked"; failed calls are counted as errors
+BUSY_TIMEOUT = 30.0
+
+# Share of query_album calls looking up a title that does not exist
+MISS_RATE = 0.1
+
+
+class Settings(NamedTuple):
+    """Connection settings of one workload run.
+
+    Attributes:
+        journal_mode: PRAGMA journal_mode, e.g. "delete" or "wal"
+        mmap_size: PRAGMA mmap_size in bytes, 0 disables memory mapping
+        cache_size: PRAGMA cache_size; negative values are KiB, positive
+                    values pages
+    """
+
+    journal_mode: str = "delete"
+    mmap_size: int = 0
+    cache_size: int = -2000
+
+
+class Report(NamedTuple):
+    """Outcome of one workload run.
+
+    Attributes:
+        settings: Connection settings
+        concurrency: Number of threads
+        completed: Calls that succeeded
+        errors: Failed calls per query
+        seconds: Wall time of the run
+        throughput: Completed calls per second
+        latency: Latency summary per query and for "all" calls, in seconds
+    """
+
+    settings: Settings
+    concurrency: int
+    completed: int
+    errors: Dict[str, int]
+    seconds: float
+    throughput: float
+    latency: Dict[str, Dict[str, float]]
+
+
+def _insert_invoice(
+    customer_id: int, track_ids: Sequence[int], db: sqlite3.Connection
+) -> int:
+    # One write transaction: invoice, its lines and its total
+    with db:
+        cur = db.execute(
+            "INSERT INTO Invoice (CustomerId, InvoiceDate, BillingAddress, "
+            "BillingCity, BillingState, BillingCountry, BillingPostalCode, Total) "
+            "SELECT CustomerId, datetime('now'), Address, City, State, Country, "
+            "PostalCode, 0 FROM Customer WHERE CustomerId = ?",
+            (customer_id,),
+        )
+        invoice_id = cur.lastrowid
+        db.executemany(
+            "INSERT INTO InvoiceLine (InvoiceId, TrackId, UnitPrice, Quantity) "
+            "SELECT ?, TrackId, UnitPrice, 1 FROM Track WHERE TrackId = ?",
+            [(invoice_id, track_id) for track_id in track_ids],
+        )
+        db.execute(
+            "UPDATE Invoice SET Total = (SELECT COALESCE(SUM(UnitPrice * Quantity), 0) "
+            "FROM InvoiceLine WHERE InvoiceId = ?) WHERE InvoiceId = ?",
+            (invoice_id, invoice_id),
+        )
+    return invoice_id
+
+
+QUERIES: Dict[str, Callable[..., Any]] = {
+    "query_album": SqlQuery.query_album,
+    "join_albums": SqlQuery.join_albums,
+    "top_invoices": SqlQuery.top_invoices,
+    "insert_invoice": _insert_invoice,
+}
+
+
+def connect(
+    db: str, settings: Settings = Settings(), timeout: float = BUSY_TIMEOUT
+) -> sqlite3.Connection:
+    """Open a connection with the pragmas of settings
+
+    Rollback journal modes only last for the connection that sets them, so
+    every connection applies the journal mode. Switching a database into or
+    out of WAL needs exclusive access; set_journal_mode does that up front.
+
+    Args:
+        db (str): Database path
+        settings (Settings): Connection settings
+        timeout (float): Seconds to wait for locks
+
+    Returns:
+        sqlite3.Connection: Connection usable from any one thread at a time
+    """
+    if settings.journal_mode not in JOURNAL_MODES:
+        raise ValueError(f"unknown journal mode {settings.journal_mode!r}")
+    conn = sqlite3.connect(db, timeout=timeout, check_same_thread=False)
+    try:
+        sql = f"PRAGMA journal_mode = {settings.journal_mode}"
+        mode = conn.execute(sql).fetchone()[0]
+        if mode != settings.journal_mode:
+            raise sqlite3.OperationalError(
+                f"journal mode is {mode!r}, could not set {settings.journal_mode!r}"
+            )
+        conn.execute(f"PRAGMA mmap_size = {int(settings.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size = {int(settings.cache_size)}")
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+def set_journal_mode(db: str, mode: str) -> str:
+    """Switch the journal mode of a database
+
+    WAL is stored in the database file and persists. Rollback modes only
+    last for one connection; connect() applies them to every connection.
+
+    Args:
+        db (str): Database path, with no other open connections
+        mode (str): One of JOURNAL_MODES
+
+    Returns:
+        str: Journal mode reported by SQLite
+    """
+    if mode not in JOURNAL_MODES:
+        raise ValueError(f"unknown journal mode {mode!r}")
+    conn = sqlite3.connect(db)
+    try:
+        return conn.execute(f"PRAGMA journal_mode = {mode}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def plan(
+    db: str, operations: int, mix: Dict[str, float] = MIX, seed: int = 0
+) -> List[Tuple[str, tuple]]:
+    """Draw a random sequence of calls
+
+    Args:
+        db (str): Database path, read for album titles and key ranges
+        operations (int): Number of calls
+        mix (Dict[str, float]): Relative weight of every query in QUERIES
+        seed (int): Random seed
+
+    Returns:
+        List[Tuple[str, tuple]]: Query name and positional arguments per call
+    """
+    unknown = set(mix) - set(QUERIES)
+    if unknown:
+        raise ValueError(f"unknown queries: {', '.join(sorted(unknown))}")
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError("mix has no positive weight")
+    conn = sqlite3.connect(db)
+    try:
+        titles = [title for (title,) in conn.execute("SELECT Title FROM Album")]
+        customers = conn.execute("SELECT MAX(CustomerId) FROM Customer").fetchone()[0]
+        tracks = conn.execute("SELECT MAX(TrackId) FROM Track").fetchone()[0]
+    finally:
+        conn.close()
+
+    rng = Random(seed)
+    names = rng.choices(list(mix), weights=list(mix.values()), k=operations)
+    calls = []
+    for i, name in enumerate(names):
+        if name == "query_album":
+            hit = rng.random() >= MISS_RATE
+            args: tuple = (rng.choice(titles) if hit else f"Missing album {i}",)
+        elif name == "insert_invoice":
+            track_ids = [rng.randint(1, tracks) for _ in range(rng.randint(1, 5))]
+            args = (rng.randint(1, customers), track_ids)
+        else:
+            args = ()
+        calls.append((name, args))
+    return calls
+
+
+def percentiles(
+    latencies: Sequence[float], ps: Sequence[int] = PERCENTILES
+) -> Dict[str, float]:
+    """Summarize latencies with nearest-rank percentiles
+
+    Args:
+        latencies (Sequence[float]): Latencies in seconds
+        ps (Sequence[int]): Percentiles to report
+
+    Returns:
+        Dict[str, float]: count, mean, max and one "pNN" key per percentile;
+            empty when there are no latencies
+    """
+    if not latencies:
+        return {}
+    ordered = sorted(latencies)
+    n = len(ordered)
+    summary = {"count": n, "mean": sum(ordered) / n, "max": ordered[-1]}
+    for p in ps:
+        summary[f"p{p}"] = ordered[max(0, math.ceil(p / 100 * n) - 1)]
+    return summary
+
+
+def _worker(
+    conn: sqlite3.Connection, calls: Sequence[Tuple[str, tuple]], start: threading.Event
+) -> Tuple[Dict[str, List[float]], Dict[str, int]]:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    start.wait()
+    for name, args in calls:
+        func = QUERIES[name]
+        began = time.perf_counter()
+        try:
+            func(*args, db=conn)
+        except sqlite3.OperationalError:
+            errors[name] += 1
+            continue
+        latencies[name].append(time.perf_counter() - began)
+    return latencies, errors
+
+
+def run_workload(
+    db: str,
+    concurrency: int = 4,
+    operations: int = 1000,
+    mix: Dict[str, float] = MIX,
+    settings: Settings = Settings(),
+    seed: int = 0,
+    timeout: float = BUSY_TIMEOUT,
+) -> Report:
+    """Run a mixed query workload from several threads
+
+    Inserts modify the database; sweep() runs every configuration on a copy.
+
+    Args:
+        db (str): Database path
+        concurrency (int): Number of threads, each with its own connection
+        operations (int): Total number of calls, dealt round-robin to threads
+        mix (Dict[str, float]): Relative weight of every query in QUERIES
+        settings (Settings): Connection settings; the journal mode is set on
+            the database before the run
+        seed (int): Random seed of the call sequence
+        timeout (float): Seconds a call waits for locks
+
+    Returns:
+        Report: Throughput and latency percentiles
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    calls = plan(db, operations, mix, seed)
+    set_journal_mode(db, settings.journal_mode)
+    conns = [connect(db, settings, timeout) for _ in range(concurrency)]
+    start = threading.Event()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [
+                pool.submit(_worker, conn, calls[i::concurrency], start)
+                for i, conn in enumerate(conns)
+            ]
+            began = time.perf_counter()
+            start.set()
+            results = [f.result() for f in futures]
+            seconds = time.perf_counter() - began
+    finally:
+        start.set()
+        for conn in conns:
+            conn.close()
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    for worker_latencies, worker_errors in results:
+        for name, values in worker_latencies.items():
+            latencies[name].extend(values)
+        for name, count in worker_errors.items():
+            errors[name] += count
+    every = [value for values in latencies.values() for value in values]
+    summary = {name: percentiles(latencies[name]) for name in sorted(latencies)}
+    summary["all"] = percentiles(every)
+    return Report(
+        settings,
+        concurrency,
+        len(every),
+        dict(errors),
+        seconds,
+        len(every) / seconds if seconds > 0 else 0.0,
+        summary,
+    )
+
+
+def sweep(
+    db: str,
+    concurrencies: Sequence[int] = (1, 4),
+    journal_modes: Sequence[str] = ("delete", "wal"),
+    mmap_sizes: Sequence[int] = (0,),
+    cache_sizes: Sequence[int] = (-2000,),
+    operations: int = 1000,
+    mix: Dict[str, float] = MIX,
+    seed: int = 0,
+) -> List[Report]:
+    """Run the workload for every combination of settings and concurrency
+
+    Args:
+        db (str): Database path; it is copied, never modified
+        concurrencies (Sequence[int]): Thread counts
+        journal_modes (Sequence[str]): Journal modes
+        mmap_sizes (Sequence[int]): mmap_size pragma values in bytes
+        cache_sizes (Sequence[int]): cache_size pragma values
+        operations (int): Calls per run
+        mix (Dict[str, float]): Relative weight of every query in QUERIES
+        seed (int): Random seed, the same call sequence for every run
+
+    Returns:
+        List[Report]: One report per run, in sweep order
+    """
+    reports = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for journal_mode, mmap_size, cache_size, concurrency in itertools.product(
+            journal_modes, mmap_sizes, cache_sizes, concurrencies
+        ):
+            copy = os.path.join(tmp, "workload.db")
+            for suffix in ("-wal", "-shm", "-journal"):
+                if os.path.exists(copy + suffix):
+                    os.remove(copy + suffix)
+            shutil.copyfile(db, copy)
+            settings = Settings(journal_mode, mmap_size, cache_size)
+            reports.append(
+                run_workload(copy, concurrency, operations, mix, settings, seed)
+            )
+    return reports
+
+
+def to_json(reports: Sequence[Report]) -> str:
+    """Serialize reports as a JSON document
+
+    Args:
+        reports (Sequence[Report]): Reports of sweep() or run_workload()
+
+    Returns:
+        str: JSON list with one object per report
+    """
+    return json.dumps(
+        [dict(r._asdict(), settings=r.settings._asdict()) for r in reports],
+        indent=2,
+    )
+
+
+def format_reports(reports: Sequence[Report]) -> str:
+    """Render reports as a table, latencies in milliseconds
+
+    Args:
+        reports (Sequence[Report]): Reports of sweep() or run_workload()
+
+    Returns:
+        str: One line per report
+    """
+    header = (
+        f"{'journal':<8}  {'mmap':>10}  {'cache':>8}  {'threads':>7}  "
+        f"{'ops/s':>9}  {'errors':>6}"
+    )
+    header += "".join(f"  {f'p{p} ms':>8}" for p in PERCENTILES)
+    lines = [header]
+    for r in reports:
+        s = r.settings
+        line = (
+            f"{s.journal_mode:<8}  {s.mmap_size:>10}  {s.cache_size:>8}  "
+            f"{r.concurrency:>7}  {r.throughput:>9.1f}  {sum(r.errors.values()):>6}"
+        )
+        overall = r.latency["all"]
+        line += "".join(
+            f"  {overall.get(f'p{p}', 0.0) * 1e3:>8.3f}" for p in PERCENTILES
+        )
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _weight(value: str) -> Tuple[str, float]:
+    name, sep, weight = value.partition("=")
+    try:
+        if not sep or name not in QUERIES or float(weight) < 0:
+            raise ValueError(value)
+        return name, float(weight)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected QUERY=WEIGHT with QUERY in {', '.join(QUERIES)}, "
+            f"got {value!r}"
+        ) from None
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m llm_benchmark.bench.workload",
+        description="Run mixed SqlQuery traffic against a scaled chinook "
+        "database and report throughput and latency percentiles.",
+    )
+    parser.add_argument("--db", help="database to copy (default: generated)")
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "-c", "--concurrency", type=int, nargs="+", default=[1, 4], metavar="N"
+    )
+    parser.add_argument("-n", "--operations", type=int, default=500)
+    parser.add_argument(
+        "--journal-mode",
+        nargs="+",
+        choices=JOURNAL_MODES,
+        default=["delete", "wal"],
+    )
+    parser.add_argument("--mmap-size", type=int, nargs="+", default=[0])
+    parser.add_argument("--cache-size", type=int, nargs="+", default=[-2000])
+    parser.add_argument(
+        "--mix",
+        type=_weight,
+        action="append",
+        default=[],
+        metavar="QUERY=WEIGHT",
+        help="override the weight of one query",
+    )
+    parser.add_argument("--json", metavar="PATH", help="write reports as JSON")
+    args = parser.parse_args(argv)
+
+    db = args.db or scaled_db(args.scale, args.seed)
+    reports = sweep(
+        db,
+        args.concurrency,
+        args.journal_mode,
+        args.mmap_size,
+        args.cache_size,
+        args.operations,
+        dict(MIX, **dict(args.mix)),
+        args.seed,
+    )
+    print(format_reports(reports))
+    if args.json:
+        with open(args.json, "w") as f:
+            f.write(to_json(reports))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
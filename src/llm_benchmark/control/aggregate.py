@@ -0,0 +1,153 @@
+"""One-pass, mergeable aggregations over streams of chunks.
+
+``RunningStats`` consumes chunks (lists, arrays, memoryviews or any iterable
+of numbers) and keeps only count, sum, min, max, mean and the sum of squared
+deviations, so memory stays constant however long the stream is. Partial
+states from parallel workers combine with ``merge`` (Chan et al.'s pairwise
+update), giving the same result as a single pass over all the data.
+"""
+import operator
+from typing import Iterable, Optional, Union
+
+Number = Union[int, float]
+
+
+class RunningStats:
+    """Streaming count, sum, min, max, mean and variance."""
+
+    __slots__ = ("count", "total", "_min", "_max", "_mean", "_m2")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total: Number = 0
+        self._min: Optional[Number] = None
+        self._max: Optional[Number] = None
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[Iterable[Number]]) -> "RunningStats":
+        """Aggregate a stream of chunks
+
+        Args:
+            chunks (Iterable[Iterable[Number]]): Chunks of numbers
+
+        Returns:
+            RunningStats: Statistics over all chunks
+        """
+        stats = cls()
+        for chunk in chunks:
+            stats.update(chunk)
+        return stats
+
+    def update(self, chunk: Iterable[Number]) -> "RunningStats":
+        """Add a chunk of values
+
+        Args:
+            chunk (Iterable[Number]): Values to add; iterators are materialized
+                one chunk at a time
+
+        Returns:
+            RunningStats: self
+        """
+        if not hasattr(chunk, "__len__"):
+            chunk = list(chunk)
+        n = len(chunk)
+        if n == 0:
+            return self
+        s = sum(chunk)
+        if isinstance(s, int):
+            # Exact for integers: n * M2 = n * sum(x^2) - sum(x)^2
+            m2 = (n * sum(map(operator.mul, chunk, chunk)) - s * s) / n
+        else:
+            mean = s / n
+            m2 = sum((x - mean) ** 2 for x in chunk)
+        part = RunningStats()
+        part.count = n
+        part.total = s
+        part._min = min(chunk)
+        part._max = max(chunk)
+        part._mean = s / n
+        part._m2 = m2
+        return self.merge(part)
+
+    def push(self, x: Number) -> "RunningStats":
+        """Add a single value (Welford's update)
+
+        Args:
+            x (Number): Value to add
+
+        Returns:
+            RunningStats: self
+        """
+        self.count += 1
+        self.total += x
+        if self._min is None or x < self._min:
+            self._min = x
+        if self._max is None or x > self._max:
+            self._max = x
+        delta = x - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (x - self._mean)
+        return self
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Combine another partial state into this one
+
+        Args:
+            other (RunningStats): State computed over other data
+
+        Returns:
+            RunningStats: self
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.total = other.count, other.total
+            self._min, self._max = other._min, other._max
+            self._mean, self._m2 = other._mean, other._m2
+            return self
+        n = self.count + other.count
+        delta = other._mean - self._mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / n
+        self.total += other.total
+        self.count = n
+        self._mean = self.total / n
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        return self
+
+    def _require(self, name: str) -> None:
+        if self.count == 0:
+            raise ValueError(f"{name}() of an empty stream")
+
+    @property
+    def min(self) -> Number:
+        """Minimum value; raises ValueError on an empty stream."""
+        self._require("min")
+        return self._min
+
+    @property
+    def max(self) -> Number:
+        """Maximum value; raises ValueError on an empty stream."""
+        self._require("max")
+        return self._max
+
+    @property
+    def mean(self) -> float:
+        """Arithmetic mean; raises ValueError on an empty stream."""
+        self._require("mean")
+        return self._mean
+
+    @property
+    def variance(self) -> float:
+        """Population variance; raises ValueError on an empty stream."""
+        self._require("variance")
+        return self._m2 / self.count
+
+    @property
+    def sample_variance(self) -> float:
+        """Sample variance; raises ValueError with fewer than two values."""
+        if self.count < 2:
+            raise ValueError("sample_variance() needs at least two values")
+        return self._m2 / (self.count - 1)
@@ -1,5 +1,39 @@
+from array import array
 from collections import Counter
-from typing import List
+from typing import List, Optional, Sequence, Union
+
+from llm_benchmark.backend import get_backend
+from llm_benchmark.datastructures.matrix import Matrix
+
+_INT64_MAX = 2**63 - 1
+
+
+def _closed_form_batch(
+    ns: Sequence[int], a: int, b: int, backend: Optional[str]
+) -> Union[array, List[int]]:
+    """Evaluate (n - 1) * n * (a * n + b) // 6 for every n > 0, 0 otherwise
+
+    If the largest numerator fits in int64 the whole batch is computed with
+    fixed-width arithmetic, otherwise with exact Python ints.
+    """
+    if len(ns) == 0:
+        return array("q")
+    top = max(max(ns), 0)
+    fits = (top - 1) * top * (a * top + b) <= _INT64_MAX
+    # Converting the inputs is cheap next to the arithmetic, so lists count
+    # as no-conversion inputs for backend selection.
+    impl = get_backend(backend, size=len(ns))
+    out = array("q")
+    if fits and impl.name == "numpy" and min(ns) >= -_INT64_MAX:
+        np = impl.np
+        v = np.maximum(np.asarray(ns, dtype=np.int64), 0)
+        out.frombytes(((v - 1) * v * (a * v + b) // 6).tobytes())
+        return out
+    values = [(n - 1) * n * (a * n + b) // 6 if n > 0 else 0 for n in ns]
+    if fits:
+        out.fromlist(values)
+        return out
+    return values
 
 
 class DoubleForLoop:
@@ -35,6 +69,38 @@ class DoubleForLoop:
             return 0
         return (n - 1) * n * (n + 1) // 6
 
+    @staticmethod
+    def sum_square_many(
+        ns: Sequence[int], backend: Optional[str] = None
+    ) -> Union[array, List[int]]:
+        """sum_square for many values of n at once
+
+        Args:
+            ns (Sequence[int]): Values of n, as a list, array.array or ndarray
+            backend (Optional[str]): Compute backend, defaults to the global one
+
+        Returns:
+            Union[array, List[int]]: array('q') of results when every
+                intermediate fits in 64 bits, otherwise a list of exact ints
+        """
+        return _closed_form_batch(ns, 2, -1, backend)
+
+    @staticmethod
+    def sum_triangle_many(
+        ns: Sequence[int], backend: Optional[str] = None
+    ) -> Union[array, List[int]]:
+        """sum_triangle for many values of n at once
+
+        Args:
+            ns (Sequence[int]): Values of n, as a list, array.array or ndarray
+            backend (Optional[str]): Compute backend, defaults to the global one
+
+        Returns:
+            Union[array, List[int]]: array('q') of results when every
+                intermediate fits in 64 bits, otherwise a list of exact ints
+        """
+        return _closed_form_batch(ns, 1, 1, backend)
+
     @staticmethod
     def count_pairs(arr: List[int]) -> int:
         """Count pairs of numbers in an array
@@ -56,33 +122,47 @@ class DoubleForLoop:
         return count
 
     @staticmethod
-    def count_duplicates(arr0: List[int], arr1: List[int]) -> int:
+    def count_duplicates(
+        arr0: List[int], arr1: List[int], backend: Optional[str] = None
+    ) -> int:
         """Count elements that match at the same index.
 
         Args:
             arr0 (List[int]): Array of integers
             arr1 (List[int]): Array of integers
+            backend (Optional[str]): Compute backend, defaults to the global one
 
         Returns:
             int: Count of elements that match at the same index
         """
-        if not arr0 or not arr1:
+        if len(arr0) == 0 or len(arr1) == 0:
             return 0
         # Compare element-by-element instead of using Counter
-        return sum(1 for a, b in zip(arr0, arr1) if a == b)
+        size = min(len(arr0), len(arr1))
+        data = arr1 if len(arr0) > len(arr1) else arr0
+        return get_backend(backend, data, size).count_duplicates(arr0, arr1)
 
     @staticmethod
-    def sum_matrix(m: List[List[int]]) -> int:
+    def sum_matrix(
+        m: Union[List[List[int]], Matrix],
+        backend: Optional[str] = None,
+        workers: int = 1,
+    ) -> int:
         """Sum of matrix of integers
 
         Args:
-            m (List[List[int]]): Matrix of integers
+            m (Union[List[List[int]], Matrix]): Matrix of integers
+            backend (Optional[str]): Compute backend, defaults to the global one
+            workers (int): Number of processes to split the rows across
 
         Returns:
             int: Sum of matrix of integers
         """
-        sum_ = 0
-        for row in m:
-            for val in row:
-                sum_ += val
-        return sum_
\ No newline at end of file
+        if workers > 1:
+            from llm_benchmark.control.reduction import MatrixReducer
+
+            return MatrixReducer(workers).reduce(m, "sum")
+        if isinstance(m, Matrix):
+            return get_backend(backend, m.buffer).sum_matrix(m)
+        size = len(m) * len(m[0]) if len(m) else 0
+        return get_backend(backend, m, size).sum_matrix(m)
\ No newline at end of file
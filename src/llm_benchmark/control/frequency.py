@@ -0,0 +1,127 @@
+"""Incremental frequency tables for multiset statistics over sliding windows.
+
+``DoubleForLoop.count_pairs`` rebuilds a ``Counter`` for every call. A
+``FrequencyTable`` is updated one element at a time instead, and keeps a
+count-of-counts histogram next to the per-value counts, so "how many values
+occur exactly k times" (count_pairs is k == 2) is a dictionary lookup.
+"""
+from collections import deque
+from typing import Dict, Iterable, Iterator
+
+
+class FrequencyTable:
+    """Multiset with O(1) add, remove and exactly-k queries.
+
+    Args:
+        values (Iterable[int]): Initial contents
+    """
+
+    def __init__(self, values: Iterable[int] = ()) -> None:
+        self._counts: Dict[int, int] = {}
+        # occurrences -> number of distinct values occurring that many times
+        self._histogram: Dict[int, int] = {}
+        self._size = 0
+        for x in values:
+            self.add(x)
+
+    def add(self, x: int) -> None:
+        """Add one occurrence of a value
+
+        Args:
+            x (int): Value to add
+        """
+        counts, histogram = self._counts, self._histogram
+        c = counts.get(x, 0)
+        if c:
+            left = histogram[c] - 1
+            if left:
+                histogram[c] = left
+            else:
+                del histogram[c]
+        counts[x] = c + 1
+        histogram[c + 1] = histogram.get(c + 1, 0) + 1
+        self._size += 1
+
+    def remove(self, x: int) -> None:
+        """Remove one occurrence of a value
+
+        Args:
+            x (int): Value to remove
+
+        Raises:
+            KeyError: If x is not in the table
+        """
+        counts, histogram = self._counts, self._histogram
+        c = counts[x]
+        left = histogram[c] - 1
+        if left:
+            histogram[c] = left
+        else:
+            del histogram[c]
+        if c == 1:
+            del counts[x]
+        else:
+            counts[x] = c - 1
+            histogram[c - 1] = histogram.get(c - 1, 0) + 1
+        self._size -= 1
+
+    def count(self, x: int) -> int:
+        """Number of occurrences of a value
+
+        Args:
+            x (int): Value to look up
+
+        Returns:
+            int: Occurrences of x
+        """
+        return self._counts.get(x, 0)
+
+    def exactly(self, k: int) -> int:
+        """Number of distinct values that occur exactly k times
+
+        Args:
+            k (int): Number of occurrences, must be positive
+
+        Returns:
+            int: Number of distinct values with exactly k occurrences
+        """
+        return self._histogram.get(k, 0)
+
+    @property
+    def pairs(self) -> int:
+        """Number of values occurring exactly twice, as in count_pairs."""
+        return self._histogram.get(2, 0)
+
+    @property
+    def distinct(self) -> int:
+        """Number of distinct values."""
+        return len(self._counts)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, x: int) -> bool:
+        return x in self._counts
+
+
+def sliding_count_pairs(values: Iterable[int], window: int) -> Iterator[int]:
+    """count_pairs of every full window of a stream, O(1) per step
+
+    Args:
+        values (Iterable[int]): Stream of integers
+        window (int): Window length
+
+    Returns:
+        Iterator[int]: count_pairs of values[i:i + window] for each i
+    """
+    if window < 1:
+        raise ValueError("window must be positive")
+    table = FrequencyTable()
+    buffer: deque = deque()
+    for x in values:
+        table.add(x)
+        buffer.append(x)
+        if len(buffer) > window:
+            table.remove(buffer.popleft())
+        if len(buffer) == window:
+            yield table.pairs
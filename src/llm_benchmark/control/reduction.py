@@ -0,0 +1,193 @@
+"""Chunked, process-parallel reductions over integer matrices.
+
+``MatrixReducer`` splits a matrix into row chunks and reduces each chunk in a
+``concurrent.futures`` process pool, then combines the partial results. The
+supported reductions are all associative: ``sum``, ``min``, ``max``,
+``row_sums`` and ``col_sums``.
+
+Nested lists are sent to the workers chunk by chunk. Array-backed matrices (a
+``Matrix``, or a flat ``array.array`` plus a ``shape``) are copied once into a
+``multiprocessing.shared_memory`` block, and workers read their rows from it
+directly, so no cell data is pickled.
+"""
+import operator
+import os
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import reduce
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from llm_benchmark.datastructures.matrix import Matrix
+
+Rows = Iterable[Sequence[int]]
+
+
+def _reduce_rows(rows: Rows, op: str) -> Any:
+    """Reduce a chunk of rows to a partial result"""
+    if op == "sum":
+        return sum(sum(row) for row in rows)
+    if op == "min":
+        return min(min(row) for row in rows)
+    if op == "max":
+        return max(max(row) for row in rows)
+    if op == "row_sums":
+        return [sum(row) for row in rows]
+    # col_sums
+    return [sum(col) for col in zip(*rows)]
+
+
+def _reduce_flat(view: memoryview, cols: int, start: int, stop: int, op: str) -> Any:
+    """Reduce rows [start, stop) of a flat row-major buffer"""
+    region = view[start * cols : stop * cols]
+    try:
+        if op == "sum":
+            return sum(region)
+        if op == "min":
+            return min(region)
+        if op == "max":
+            return max(region)
+        if op == "row_sums":
+            return [sum(region[i : i + cols]) for i in range(0, len(region), cols)]
+        return [sum(region[j::cols]) for j in range(cols)]
+    finally:
+        region.release()
+
+
+def _reduce_shared_chunk(
+    name: str, typecode: str, cols: int, start: int, stop: int, op: str
+) -> Any:
+    shm = SharedMemory(name=name)
+    view = shm.buf.cast(typecode)
+    try:
+        return _reduce_flat(view, cols, start, stop, op)
+    finally:
+        view.release()
+        shm.close()
+
+
+def _add_columns(a: List[int], b: List[int]) -> List[int]:
+    return [x + y for x, y in zip(a, b)]
+
+
+_COMBINE: Dict[str, Callable[[Any, Any], Any]] = {
+    "sum": operator.add,
+    "min": min,
+    "max": max,
+    "row_sums": operator.add,
+    "col_sums": _add_columns,
+}
+
+OPS = tuple(_COMBINE)
+
+
+class MatrixReducer:
+    """Parallel reduction engine for integer matrices.
+
+    The reducer can be used as a context manager to keep its process pool
+    alive across calls; otherwise a pool is created for each call.
+    With a single worker everything runs in the calling process.
+
+    Args:
+        workers (Optional[int]): Number of worker processes, defaults to
+            os.cpu_count()
+        chunk_size (Optional[int]): Rows per task, defaults to splitting the
+            matrix into 4 chunks per worker
+    """
+
+    def __init__(
+        self, workers: Optional[int] = None, chunk_size: Optional[int] = None
+    ) -> None:
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be positive")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor: Optional[Executor] = None
+
+    def __enter__(self) -> "MatrixReducer":
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(self.workers)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _chunks(self, rows: int) -> List[Tuple[int, int]]:
+        size = self.chunk_size or max(1, -(-rows // (self.workers * 4)))
+        return [(start, min(start + size, rows)) for start in range(0, rows, size)]
+
+    def _run(self, fn: Callable[..., Any], tasks: List[Tuple[Any, ...]]) -> List[Any]:
+        if self.workers == 1 or len(tasks) == 1:
+            return [fn(*task) for task in tasks]
+        if self._executor is not None:
+            return list(self._executor.map(fn, *zip(*tasks)))
+        with ProcessPoolExecutor(min(self.workers, len(tasks))) as executor:
+            return list(executor.map(fn, *zip(*tasks)))
+
+    def reduce(
+        self,
+        m: Any,
+        op: str = "sum",
+        shape: Optional[Tuple[int, int]] = None,
+    ) -> Any:
+        """Reduce a matrix
+
+        Args:
+            m (Any): Matrix as nested lists, a Matrix, or a flat row-major
+                array.array
+            op (str): One of "sum", "min", "max", "row_sums", "col_sums"
+            shape (Optional[Tuple[int, int]]): (rows, cols), required for a
+                flat array
+
+        Returns:
+            Any: An int for sum/min/max, a list for row_sums/col_sums
+
+        Raises:
+            ValueError: If op is unknown, or min/max of an empty matrix
+        """
+        if op not in _COMBINE:
+            raise ValueError(f"unknown reduction {op!r}, expected one of {OPS}")
+        if isinstance(m, Matrix):
+            m, shape = m.buffer, m.shape
+        if isinstance(m, array):
+            if shape is None:
+                raise ValueError("shape is required for a flat array")
+            rows, cols = shape
+            if rows * cols != len(m):
+                raise ValueError(f"shape {shape} does not match {len(m)} elements")
+        else:
+            rows = len(m)
+            cols = len(m[0]) if rows else 0
+
+        if rows == 0 or cols == 0:
+            if op in ("min", "max"):
+                raise ValueError(f"{op}() of an empty matrix")
+            if op == "sum":
+                return 0
+            return [0] * cols if op == "col_sums" else [0] * rows
+
+        chunks = self._chunks(rows)
+        if not isinstance(m, array):
+            tasks = [(m[start:stop], op) for start, stop in chunks]
+            return reduce(_COMBINE[op], self._run(_reduce_rows, tasks))
+
+        if self.workers == 1 or len(chunks) == 1:
+            view = memoryview(m)
+            try:
+                partials = [_reduce_flat(view, cols, a, b, op) for a, b in chunks]
+            finally:
+                view.release()
+            return reduce(_COMBINE[op], partials)
+
+        shm = SharedMemory(create=True, size=len(m) * m.itemsize)
+        try:
+            shm.buf[: len(m) * m.itemsize] = memoryview(m).cast("B")
+            tasks = [(shm.name, m.typecode, cols, a, b, op) for a, b in chunks]
+            return reduce(_COMBINE[op], self._run(_reduce_shared_chunk, tasks))
+        finally:
+            shm.close()
+            shm.unlink()
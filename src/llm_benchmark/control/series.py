@@ -0,0 +1,96 @@
+"""Closed-form sums over arithmetic series.
+
+All functions work on Python integers, so results stay exact for any input
+size (n up to 10**18 and beyond) and run in time independent of n.
+"""
+from math import gcd
+from typing import Iterable, List, Tuple
+
+
+def sum_multiples(n: int, m: int) -> int:
+    """Sum of the multiples of m in [0, n)
+
+    Args:
+        n (int): Upper bound (exclusive)
+        m (int): Divisor (non-zero), its sign is ignored
+
+    Returns:
+        int: Sum of numbers in [0, n) that are divisible by m
+
+    Raises:
+        ZeroDivisionError: If m == 0
+    """
+    if m == 0:
+        raise ZeroDivisionError("integer division or modulo by zero")
+    if n <= 0:
+        return 0
+    m = abs(m)
+    k = (n - 1) // m
+    return m * k * (k + 1) // 2
+
+
+def sum_multiples_any(n: int, divisors: Iterable[int]) -> int:
+    """Sum of the numbers in [0, n) divisible by at least one of the divisors
+
+    Uses inclusion-exclusion over the lcm of every subset of divisors.
+    Divisors that are multiples of another divisor are dropped first, and a
+    subset is not extended once its lcm reaches n, since every superset then
+    contributes nothing.
+
+    Args:
+        n (int): Upper bound (exclusive)
+        divisors (Iterable[int]): Non-zero divisors, signs are ignored
+
+    Returns:
+        int: Sum of numbers in [0, n) divisible by any of the divisors
+
+    Raises:
+        ZeroDivisionError: If a divisor is 0
+    """
+    ds = sorted({abs(d) for d in divisors})
+    if ds and ds[0] == 0:
+        raise ZeroDivisionError("integer division or modulo by zero")
+    if n <= 0 or not ds:
+        return 0
+    reduced: List[int] = []
+    for d in ds:
+        if d < n and all(d % r for r in reduced):
+            reduced.append(d)
+
+    total = 0
+    stack: List[Tuple[int, int, int]] = [(0, 1, 1)]
+    while stack:
+        start, lcm, sign = stack.pop()
+        for i in range(start, len(reduced)):
+            d = reduced[i]
+            next_lcm = lcm // gcd(lcm, d) * d
+            if next_lcm >= n:
+                continue
+            total += sign * sum_multiples(n, next_lcm)
+            stack.append((i + 1, next_lcm, -sign))
+    return total
+
+
+def sum_multiples_many(queries: Iterable[Tuple[int, int]]) -> List[int]:
+    """Answer many sum_multiples queries at once
+
+    Args:
+        queries (Iterable[Tuple[int, int]]): (n, m) pairs
+
+    Returns:
+        List[int]: sum_multiples(n, m) for each pair, in order
+
+    Raises:
+        ZeroDivisionError: If any m == 0
+    """
+    out = []
+    for n, m in queries:
+        if m == 0:
+            raise ZeroDivisionError("integer division or modulo by zero")
+        if n <= 0:
+            out.append(0)
+            continue
+        m = abs(m)
+        k = (n - 1) // m
+        out.append(m * k * (k + 1) // 2)
+    return out
@@ -1,4 +1,6 @@
-from typing import List
+from typing import Iterable, List
+
+from llm_benchmark.control.series import sum_multiples
 
 
 class SingleForLoop:
@@ -36,6 +38,32 @@ class SingleForLoop:
             raise ValueError("max_list() arg is an empty sequence")
         return max(v)
 
+    @staticmethod
+    def max_stream(chunks: Iterable[List[int]]) -> int:
+        """Maximum value over a stream of chunks, in one pass.
+
+        See llm_benchmark.control.aggregate.RunningStats for the other
+        streaming aggregations.
+
+        Args:
+            chunks (Iterable[List[int]]): Chunks of integers, may be empty
+
+        Returns:
+            int: Maximum value in the stream
+
+        Raises:
+            ValueError: If the stream holds no values.
+        """
+        best = None
+        for chunk in chunks:
+            if len(chunk):
+                m = max(chunk)
+                if best is None or m > best:
+                    best = m
+        if best is None:
+            raise ValueError("max_stream() arg is an empty stream")
+        return best
+
     @staticmethod
     def sum_modulus(n: int, m: int) -> int:
         """Sum of multiples of m that are less than n.
@@ -50,4 +78,6 @@ class SingleForLoop:
         Raises:
             ZeroDivisionError: If m == 0
         """
-        return sum(i for i in range(n) if i % m == 0)
+        # Multiples of m below n form the series 0, |m|, ..., k*|m| with
+        # k = (n-1) // |m|, summing to |m| * k * (k+1) / 2.
+        return sum_multiples(n, m)
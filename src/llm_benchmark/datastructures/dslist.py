@@ -1,39 +1,36 @@
-from typing import List
+from typing import List, Optional
+
+from llm_benchmark.backend import get_backend
 
 
 class DsList:
     @staticmethod
-    def modify_list(v: List[int]) -> List[int]:
+    def modify_list(v: List[int], backend: Optional[str] = None) -> List[int]:
         """Modify a list by adding 1 to each element
 
         Args:
             v (List[int]): List of integers
+            backend (Optional[str]): Compute backend, defaults to the global one
 
         Returns:
             List[int]: Modified list of integers
         """
-        ret = []
-        for i in range(len(v)):
-            ret.append(v[i] + 1)
-        return ret
+        return get_backend(backend, v).modify_list(v)
 
     @staticmethod
-    def search_list(v: List[int], n: int) -> List[int]:
+    def search_list(v: List[int], n: int, backend: Optional[str] = None) -> List[int]:
         """Search a list for a value, returning a list
         of indices where the value is found
 
         Args:
             v (List[int]): List of integers
             n (int): Value to search for
+            backend (Optional[str]): Compute backend, defaults to the global one
 
         Returns:
             List[int]: List of indices where the value is found
         """
-        ret = []
-        for i in range(len(v)):
-            if v[i] == n:
-                ret.append(i)
-        return ret
+        return get_backend(backend, v).search_list(v, n)
 
     @staticmethod
     def sort_list(v: List[int]) -> List[int]:
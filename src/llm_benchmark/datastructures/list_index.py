@@ -0,0 +1,120 @@
+from array import array
+from typing import Dict, Iterable, List
+
+
+class ListIndex:
+    """Inverted index mapping each value of a list to the positions it occupies.
+
+    Building the index costs one pass over the list; afterwards every
+    ``search`` is O(k) in the number of matches instead of the O(n) scan done
+    by ``DsList.search_list``. Positions are stored as compact ``array('I')``
+    buckets, so the list may hold at most 2**32 elements.
+
+    The index keeps a reference to the list it was built from. Values appended
+    through ``append``/``extend`` are added to both; values appended to the
+    list directly are picked up by ``refresh``.
+    """
+
+    def __init__(self, v: List[int]) -> None:
+        """Build the index over a list
+
+        Args:
+            v (List[int]): List of integers to index
+        """
+        self._source = v
+        self._positions: Dict[int, array] = {}
+        self._size = 0
+        self._index(v)
+
+    def _index(self, values: Iterable[int]) -> None:
+        """Add values to the index, continuing after the last indexed position
+
+        Args:
+            values (Iterable[int]): Values to add, in list order
+        """
+        positions = self._positions
+        i = self._size - 1
+        for i, x in enumerate(values, self._size):
+            bucket = positions.get(x)
+            if bucket is None:
+                positions[x] = array("I", (i,))
+            else:
+                bucket.append(i)
+        self._size = i + 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, n: int) -> bool:
+        return n in self._positions
+
+    def append(self, n: int) -> None:
+        """Append a value to the underlying list and index it
+
+        Args:
+            n (int): Value to append
+        """
+        self._source.append(n)
+        self._index((n,))
+
+    def extend(self, values: Iterable[int]) -> None:
+        """Extend the underlying list with values and index them
+
+        Args:
+            values (Iterable[int]): Values to append
+        """
+        values = list(values)
+        self._source.extend(values)
+        self._index(values)
+
+    def refresh(self) -> int:
+        """Index elements appended to the underlying list since the last update
+
+        Only appends are detected; any other mutation of the list requires
+        building a new index.
+
+        Returns:
+            int: Number of newly indexed elements
+        """
+        start = self._size
+        self._index(self._source[start:])
+        return self._size - start
+
+    def search(self, n: int) -> List[int]:
+        """Positions where a value is found, in ascending order
+
+        Args:
+            n (int): Value to search for
+
+        Returns:
+            List[int]: List of indices where the value is found
+        """
+        bucket = self._positions.get(n)
+        if bucket is None:
+            return []
+        return bucket.tolist()
+
+    def count(self, n: int) -> int:
+        """Number of occurrences of a value
+
+        Args:
+            n (int): Value to count
+
+        Returns:
+            int: Number of occurrences
+        """
+        bucket = self._positions.get(n)
+        return 0 if bucket is None else len(bucket)
+
+    def search_many(self, values: Iterable[int]) -> List[List[int]]:
+        """Search for many values at once
+
+        Args:
+            values (Iterable[int]): Values to search for
+
+        Returns:
+            List[List[int]]: Positions of each value, in query order
+        """
+        get = self._positions.get
+        empty = array("I")
+        return [get(n, empty).tolist() for n in values]
@@ -0,0 +1,149 @@
+from array import array
+from typing import Iterator, List, Optional, Tuple, Union
+
+
+class Matrix:
+    """Dense integer matrix stored in one contiguous row-major ``array``.
+
+    Unlike a list of lists, every cell is an unboxed machine integer and the
+    whole matrix is a single allocation. Rows and columns are returned as
+    ``memoryview`` slices of the buffer, so they share memory with the matrix
+    and cost no copy (a column view is strided).
+
+    Attributes:
+        shape: (rows, cols)
+        strides: Distance in elements between consecutive rows and columns
+    """
+
+    def __init__(
+        self, rows: int, cols: int, data: Optional[array] = None, typecode: str = "q"
+    ) -> None:
+        """Initialize a matrix, zero-filled unless data is given.
+
+        Args:
+            rows (int): Number of rows
+            cols (int): Number of columns
+            data (Optional[array]): Flat row-major array of rows * cols
+                elements. The matrix takes ownership of it without copying.
+            typecode (str): array typecode used when data is None
+        """
+        if rows < 0 or cols < 0:
+            raise ValueError("shape must be non-negative")
+        if data is None:
+            data = array(typecode, bytes(rows * cols * array(typecode).itemsize))
+        elif len(data) != rows * cols:
+            raise ValueError(f"data has {len(data)} elements, expected {rows} * {cols}")
+        self._data = data
+        self._view = memoryview(data)
+        self.shape: Tuple[int, int] = (rows, cols)
+        self.strides: Tuple[int, int] = (cols, 1)
+
+    @classmethod
+    def from_lists(cls, m: List[List[int]], typecode: str = "q") -> "Matrix":
+        """Build a matrix from nested lists.
+
+        Args:
+            m (List[List[int]]): Rectangular list of rows
+            typecode (str): array typecode of the buffer
+
+        Returns:
+            Matrix: A new Matrix holding a copy of the values
+        """
+        rows = len(m)
+        cols = len(m[0]) if rows else 0
+        data = array(typecode)
+        for row in m:
+            if len(row) != cols:
+                raise ValueError("rows must all have the same length")
+            data.extend(row)
+        return cls(rows, cols, data)
+
+    def tolist(self) -> List[List[int]]:
+        """Convert to nested lists.
+
+        Returns:
+            List[List[int]]: A list of rows
+        """
+        rows, cols = self.shape
+        data = self._data
+        return [data[i * cols : (i + 1) * cols].tolist() for i in range(rows)]
+
+    @property
+    def buffer(self) -> array:
+        """The flat row-major array backing the matrix."""
+        return self._data
+
+    @property
+    def size(self) -> int:
+        """Total number of cells."""
+        return len(self._data)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the cell buffer in bytes."""
+        return len(self._data) * self._data.itemsize
+
+    def row(self, i: int) -> memoryview:
+        """Zero-copy view of a row.
+
+        Args:
+            i (int): Row index
+
+        Returns:
+            memoryview: A view sharing the matrix buffer
+        """
+        rows, cols = self.shape
+        if not -rows <= i < rows:
+            raise IndexError("row index out of range")
+        if i < 0:
+            i += rows
+        return self._view[i * cols : (i + 1) * cols]
+
+    def col(self, j: int) -> memoryview:
+        """Zero-copy strided view of a column.
+
+        Args:
+            j (int): Column index
+
+        Returns:
+            memoryview: A view sharing the matrix buffer
+        """
+        rows, cols = self.shape
+        if not -cols <= j < cols:
+            raise IndexError("column index out of range")
+        if j < 0:
+            j += cols
+        return self._view[j : rows * cols : cols]
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for i in range(self.shape[0]):
+            yield self.row(i)
+
+    def __getitem__(self, key: Union[int, Tuple[int, int]]) -> Union[int, memoryview]:
+        if isinstance(key, tuple):
+            i, j = key
+            return self.row(i)[j]
+        return self.row(key)
+
+    def __setitem__(self, key: Tuple[int, int], value: int) -> None:
+        i, j = key
+        self.row(i)[j] = value
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        return self.shape == other.shape and self._data == other._data
+
+    def __repr__(self) -> str:
+        return f"Matrix(shape={self.shape}, typecode={self._data.typecode!r})"
+
+    def sum(self) -> int:
+        """Sum of all cells.
+
+        Returns:
+            int: The sum, computed in a single pass over the flat buffer
+        """
+        return sum(self._data)
@@ -1,5 +1,48 @@
-from random import randint
-from typing import List
+from array import array
+from random import Random, randint
+from typing import Iterator, List, Optional
+
+from llm_benchmark.backend import get_backend
+from llm_benchmark.datastructures.matrix import Matrix
+
+# Values drawn per getrandbits() call when generating in bulk
+_BATCH = 1 << 16
+
+# Word typecodes used for rejection sampling, by word size in bits
+_WORDS = ((16, "H"), (32, "I"), (64, "Q"))
+
+
+def _random_bytes(rng: Random, n: int, span: int) -> bytearray:
+    """n uniform values in [0, span) for span <= 256, one byte each.
+
+    Bytes at or above the largest multiple of span are dropped with
+    bytes.translate(), which also maps the rest to b % span, so both the
+    rejection and the reduction run in C without modulo bias.
+    """
+    limit = 256 - 256 % span
+    table = bytes(b % span if b < limit else 0 for b in range(256))
+    rejected = bytes(range(limit, 256))
+    out = bytearray()
+    while len(out) < n:
+        k = min(_BATCH, (n - len(out)) * 256 // limit + 64)
+        out += rng.getrandbits(8 * k).to_bytes(k, "little").translate(table, rejected)
+    del out[n:]
+    return out
+
+
+def _random_words(rng: Random, n: int, span: int) -> List[int]:
+    """n uniform values in [0, span) for span <= 2**64, by rejection on words"""
+    bits, typecode = next(w for w in _WORDS if span <= 1 << w[0])
+    limit = (1 << bits) - (1 << bits) % span
+    out: List[int] = []
+    while len(out) < n:
+        k = min(_BATCH, (n - len(out)) * (1 << bits) // limit + 64)
+        words = array(
+            typecode, rng.getrandbits(bits * k).to_bytes(bits * k // 8, "little")
+        )
+        out += [x % span for x in words if x < limit]
+    del out[n:]
+    return out
 
 
 class GenList:
@@ -28,3 +71,106 @@ class GenList:
             List[List[int]]: Matrix of random integers
         """
         return [GenList.random_list(n, m) for _ in range(n)]
+
+    @staticmethod
+    def fast_random_list(
+        n: int, m: int, seed: Optional[int] = None, backend: Optional[str] = None
+    ) -> array:
+        """Generate random integers in bulk into a typed array
+
+        Draws random bits in large batches instead of calling randint() per
+        element and maps them to [0, m] (the same range as random_list) by
+        rejection sampling, so there is no modulo bias. The NumPy backend uses
+        numpy.random.Generator.integers instead, which draws a different
+        stream.
+
+        A seeded call without an explicit backend always uses the Python
+        generator, so the same seed gives the same values whether or not
+        NumPy is installed and on either side of the "auto" threshold. The
+        faster NumPy stream has to be requested with backend="numpy"; it is
+        reproducible for a given seed too, but differs from the Python one.
+
+        Args:
+            n (int): Number of integers to generate
+            m (int): Maximum value of integers (inclusive, below 2**63)
+            seed (Optional[int]): Seed for the generator
+            backend (Optional[str]): Compute backend. Defaults to the global
+                one for unseeded calls and to "python" for seeded calls.
+
+        Returns:
+            array: array('q') of random integers
+        """
+        if m < 0 or m >= 1 << 63:
+            raise ValueError("m must be in [0, 2**63)")
+        if backend is None and seed is not None:
+            backend = "python"
+        impl = get_backend(backend, size=n)
+        span = m + 1
+        out = array("q")
+        if impl.name == "numpy":
+            np = impl.np
+            values = np.random.default_rng(seed).integers(
+                0, span, size=n, dtype=np.int64
+            )
+            out.frombytes(values.tobytes())
+            return out
+        rng = Random(seed)
+        if span == 1:
+            out.frombytes(bytes(8 * n))
+        elif span <= 256:
+            out.extend(_random_bytes(rng, n, span))
+        else:
+            out.extend(_random_words(rng, n, span))
+        return out
+
+    @staticmethod
+    def random_compact_matrix(
+        n: int, m: int, seed: Optional[int] = None, backend: Optional[str] = None
+    ) -> Matrix:
+        """Generate a matrix of random integers in a single contiguous buffer
+
+        Args:
+            n (int): Number of rows and columns
+            m (int): Maximum value of integers (inclusive)
+            seed (Optional[int]): Seed for the generator
+            backend (Optional[str]): Compute backend, see fast_random_list
+
+        Returns:
+            Matrix: n x n Matrix of random integers
+        """
+        return Matrix(n, n, GenList.fast_random_list(n * n, m, seed, backend))
+
+    @staticmethod
+    def iter_random_list(
+        n: int, m: int, chunk_size: int = 1 << 16, seed: int = 0
+    ) -> Iterator[array]:
+        """Lazily generate a list of random integers in fixed-size chunks
+
+        Chunk i depends only on seed and i, see ChunkedDataset.
+
+        Args:
+            n (int): Number of integers to generate
+            m (int): Maximum value of integers (inclusive)
+            chunk_size (int): Integers per chunk
+            seed (int): Dataset seed
+
+        Returns:
+            Iterator[array]: array('q') chunks
+        """
+        from llm_benchmark.generator.stream import ChunkedDataset
+
+        return iter(ChunkedDataset(n, m, chunk_size, seed))
+
+    @staticmethod
+    def iter_random_matrix(n: int, m: int, seed: int = 0) -> Iterator[array]:
+        """Lazily generate a matrix of random integers row by row
+
+        Args:
+            n (int): Number of rows and columns
+            m (int): Maximum value of integers (inclusive)
+            seed (int): Dataset seed
+
+        Returns:
+            Iterator[array]: array('q') rows
+        """
+        return GenList.iter_random_list(n * n, m, max(n, 1), seed)
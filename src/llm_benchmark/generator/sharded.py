@@ -0,0 +1,119 @@
+"""Process-parallel generation of large random benchmark inputs.
+
+``ShardedGenerator`` splits an n-element list into shards and generates them
+in a process pool. Shard ``i`` uses the seed ``chunk_seed(seed, i)``, exactly
+like chunk ``i`` of a ``ChunkedDataset``, so the output depends only on the
+master seed and the shard size, never on the number of workers. Workers write
+their shard straight into a ``multiprocessing.shared_memory`` block; only the
+block name and shard bounds cross the process boundary.
+"""
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+from llm_benchmark.backend import get_backend
+from llm_benchmark.datastructures.matrix import Matrix
+from llm_benchmark.generator.gen_list import GenList
+from llm_benchmark.generator.stream import DEFAULT_CHUNK_SIZE, chunk_seed
+
+
+def _fill_shard(
+    name: str, n: int, m: int, shard_size: int, seed: int, backend: str, index: int
+) -> None:
+    start = index * shard_size
+    size = min(shard_size, n - start)
+    values = GenList.fast_random_list(size, m, chunk_seed(seed, index), backend)
+    shm = SharedMemory(name=name)
+    view = shm.buf.cast("q")
+    try:
+        view[start : start + size] = memoryview(values)
+    finally:
+        view.release()
+        shm.close()
+
+
+class ShardedGenerator:
+    """Generate random lists and matrices across a process pool.
+
+    Args:
+        workers (Optional[int]): Number of worker processes, defaults to
+            os.cpu_count(). With one worker, shards are generated in-process.
+        shard_size (int): Integers per shard
+        backend (Optional[str]): Backend used by GenList.fast_random_list,
+            "python" by default so the output matches ChunkedDataset's
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        shard_size: int = DEFAULT_CHUNK_SIZE,
+        backend: Optional[str] = None,
+    ) -> None:
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be positive")
+        if shard_size < 1:
+            raise ValueError("shard_size must be positive")
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self.backend = get_backend(backend or "python", size=shard_size).name
+
+    def random_list(self, n: int, m: int, seed: int = 0) -> array:
+        """Generate a list of random integers
+
+        Args:
+            n (int): Number of integers to generate
+            m (int): Maximum value of integers (inclusive)
+            seed (int): Master seed
+
+        Returns:
+            array: array('q') of random integers
+        """
+        shards = -(-n // self.shard_size)
+        if self.workers == 1 or shards <= 1:
+            out = array("q")
+            for i in range(shards):
+                size = min(self.shard_size, n - i * self.shard_size)
+                out += GenList.fast_random_list(
+                    size, m, chunk_seed(seed, i), self.backend
+                )
+            return out
+
+        shm = SharedMemory(create=True, size=8 * n)
+        try:
+            with ProcessPoolExecutor(min(self.workers, shards)) as executor:
+                futures = [
+                    executor.submit(
+                        _fill_shard,
+                        shm.name,
+                        n,
+                        m,
+                        self.shard_size,
+                        seed,
+                        self.backend,
+                        i,
+                    )
+                    for i in range(shards)
+                ]
+                for future in futures:
+                    future.result()
+            out = array("q")
+            out.frombytes(shm.buf[: 8 * n])
+            return out
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def random_matrix(self, n: int, m: int, seed: int = 0) -> Matrix:
+        """Generate an n x n matrix of random integers
+
+        Args:
+            n (int): Number of rows and columns
+            m (int): Maximum value of integers (inclusive)
+            seed (int): Master seed
+
+        Returns:
+            Matrix: Matrix of random integers
+        """
+        return Matrix(n, n, self.random_list(n * n, m, seed))
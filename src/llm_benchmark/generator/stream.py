@@ -0,0 +1,209 @@
+"""Lazily generated, chunked random datasets.
+
+A ``ChunkedDataset`` describes ``n`` random integers in ``[0, m]`` split into
+fixed-size chunks without holding any of them in memory. Chunk ``i`` is drawn
+from its own seed, derived from the dataset seed and ``i``, so any chunk can
+be regenerated on its own, in any order or in parallel, and always comes out
+the same.
+
+``ChunkedDataset.cache`` writes the whole dataset to a binary file once and
+memory-maps it on later runs, which keeps generation out of the timed part of
+a benchmark and lets the OS page data in and out for inputs larger than RAM.
+"""
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from typing import Any, Iterator, Optional
+
+from llm_benchmark.backend import get_backend
+from llm_benchmark.generator.gen_list import GenList
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# magic, n, m, chunk_size, seed, backend name; padded to 64 bytes so the
+# int64 payload stays aligned
+_HEADER = struct.Struct("<8sQQQq16s")
+_HEADER_SIZE = 64
+_MAGIC = b"LLMBDS01"
+
+
+def chunk_seed(seed: int, index: int) -> int:
+    """Derive the seed of one chunk from the dataset seed.
+
+    Args:
+        seed (int): Dataset seed
+        index (int): Chunk index
+
+    Returns:
+        int: 64-bit seed, independent for every (seed, index) pair
+    """
+    digest = hashlib.blake2b(f"{seed}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class ChunkedDataset:
+    """Deterministic random list generated chunk by chunk.
+
+    Args:
+        n (int): Number of integers
+        m (int): Maximum value of integers (inclusive)
+        chunk_size (int): Integers per chunk; the last chunk may be shorter
+        seed (int): Dataset seed, a signed 64-bit integer
+        backend (Optional[str]): Backend used by GenList.fast_random_list.
+            The values depend on it, so it is resolved once here and, like a
+            seeded fast_random_list call, defaults to "python" rather than
+            the global backend.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        m: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        seed: int = 0,
+        backend: Optional[str] = None,
+    ) -> None:
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        # The cache header stores the seed as is, as a signed 64-bit field
+        if not -(1 << 63) <= seed < 1 << 63:
+            raise ValueError("seed must be in [-2**63, 2**63)")
+        self.n = n
+        self.m = m
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.backend = get_backend(backend or "python", size=chunk_size).name
+
+    def __len__(self) -> int:
+        return self.n
+
+    @property
+    def num_chunks(self) -> int:
+        """Number of chunks."""
+        return -(-self.n // self.chunk_size)
+
+    def chunk(self, i: int) -> array:
+        """Generate one chunk.
+
+        Args:
+            i (int): Chunk index
+
+        Returns:
+            array: array('q') holding chunk i
+        """
+        if not 0 <= i < self.num_chunks:
+            raise IndexError("chunk index out of range")
+        size = min(self.chunk_size, self.n - i * self.chunk_size)
+        return GenList.fast_random_list(
+            size, self.m, chunk_seed(self.seed, i), self.backend
+        )
+
+    def __iter__(self) -> Iterator[array]:
+        for i in range(self.num_chunks):
+            yield self.chunk(i)
+
+    def values(self) -> Iterator[int]:
+        """Iterate over the individual integers.
+
+        Returns:
+            Iterator[int]: All n integers, in order
+        """
+        for chunk in self:
+            yield from chunk
+
+    def _header(self) -> bytes:
+        header = _HEADER.pack(
+            _MAGIC,
+            self.n,
+            self.m,
+            self.chunk_size,
+            self.seed,
+            self.backend.encode(),
+        )
+        return header.ljust(_HEADER_SIZE, b"\0")
+
+    def cache(self, path: str) -> "MappedDataset":
+        """Memory-map the dataset from a cache file, writing it first if needed.
+
+        The file is rewritten when it is missing or was generated with
+        different parameters.
+
+        Args:
+            path (str): Path of the cache file
+
+        Returns:
+            MappedDataset: Read-only view of the cached data
+        """
+        header = self._header()
+        try:
+            with open(path, "rb") as f:
+                valid = f.read(_HEADER_SIZE) == header
+        except FileNotFoundError:
+            valid = False
+        if valid and os.path.getsize(path) != _HEADER_SIZE + 8 * self.n:
+            valid = False
+        if not valid:
+            tmp = f"{path}.tmp{os.getpid()}"
+            with open(tmp, "wb") as f:
+                f.write(header)
+                for chunk in self:
+                    chunk.tofile(f)
+            os.replace(tmp, path)
+        return MappedDataset(path, self.chunk_size)
+
+
+class MappedDataset:
+    """Read-only, memory-mapped view of a cached ChunkedDataset.
+
+    Args:
+        path (str): Path of the cache file
+        chunk_size (int): Integers per chunk
+    """
+
+    def __init__(self, path: str, chunk_size: int) -> None:
+        self.chunk_size = chunk_size
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self.data = self._view[_HEADER_SIZE:].cast("q")
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def num_chunks(self) -> int:
+        """Number of chunks."""
+        return -(-len(self.data) // self.chunk_size)
+
+    def chunk(self, i: int) -> memoryview:
+        """Zero-copy view of one chunk.
+
+        Args:
+            i (int): Chunk index
+
+        Returns:
+            memoryview: int64 view of chunk i
+        """
+        if not 0 <= i < self.num_chunks:
+            raise IndexError("chunk index out of range")
+        return self.data[i * self.chunk_size : (i + 1) * self.chunk_size]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for i in range(self.num_chunks):
+            yield self.chunk(i)
+
+    def close(self) -> None:
+        """Release the mapping. Views returned by chunk() must be released first."""
+        self.data.release()
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "MappedDataset":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,336 @@
+"""Opt-in call instrumentation for the public llm_benchmark API.
+
+``install()`` wraps the public static methods of the benchmark classes
+(``Primes``, ``Sort``, ``DsList``, ``SqlQuery``, ``StrOps``, ...) and records
+per function:
+
+* call count and cumulative time
+* a latency histogram, from which p50/p99 are estimated
+* an input-size histogram: ``len()`` of the first argument, or its value
+  when it is an int (e.g. ``Primes.sum_primes(n)``)
+
+``disable()`` keeps the wrappers in place at the cost of one flag check per
+call; ``uninstall()`` restores the original functions. ``profile_next(n)``
+runs the next n instrumented calls under ``cProfile``.
+
+Snapshots export to JSON (``to_json``) or the Prometheus text format
+(``to_prometheus``)::
+
+    from llm_benchmark import instrument
+
+    instrument.install()
+    ...
+    print(instrument.to_prometheus())
+"""
+import bisect
+import cProfile
+import functools
+import importlib
+import json
+import pstats
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Classes whose public static methods install() wraps by default
+DEFAULT_TARGETS = [
+    "llm_benchmark.algorithms.primes:Primes",
+    "llm_benchmark.algorithms.sort:Sort",
+    "llm_benchmark.control.single:SingleForLoop",
+    "llm_benchmark.control.double:DoubleForLoop",
+    "llm_benchmark.datastructures.dslist:DsList",
+    "llm_benchmark.generator.gen_list:GenList",
+    "llm_benchmark.sql.query:SqlQuery",
+    "llm_benchmark.strings.strops:StrOps",
+]
+
+# Upper bounds of the latency buckets, in seconds (1-2.5-5 steps)
+LATENCY_BUCKETS = [float(f"{m}e{e}") for e in range(-7, 1) for m in (1, 2.5, 5)]
+LATENCY_BUCKETS.append(10.0)
+
+# Upper bounds of the input-size buckets
+SIZE_BUCKETS = [10**e for e in range(0, 8)]
+
+
+class _Metrics:
+    """Counters of one instrumented function."""
+
+    __slots__ = ("count", "total", "size_total", "latency", "sizes")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.size_total = 0
+        # One slot per bucket plus +Inf
+        self.latency = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sizes = [0] * (len(SIZE_BUCKETS) + 1)
+
+
+_enabled = False
+_lock = threading.Lock()
+_metrics: Dict[str, _Metrics] = {}
+# (class, attribute name, original staticmethod) of every wrapped function
+_installed: List[Tuple[type, str, staticmethod]] = []
+
+_profile_remaining = 0
+_profile_active = False
+_profiler: Optional[cProfile.Profile] = None
+
+
+def _input_size(args: tuple) -> Optional[int]:
+    if not args:
+        return None
+    first = args[0]
+    if isinstance(first, int) and not isinstance(first, bool):
+        return abs(first)
+    try:
+        return len(first)
+    except TypeError:
+        return None
+
+
+def _record(name: str, elapsed: float, size: Optional[int]) -> None:
+    with _lock:
+        m = _metrics.get(name)
+        if m is None:
+            m = _metrics[name] = _Metrics()
+        m.count += 1
+        m.total += elapsed
+        m.latency[bisect.bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+        if size is not None:
+            m.size_total += size
+            m.sizes[bisect.bisect_left(SIZE_BUCKETS, size)] += 1
+
+
+def _profiled_call(func: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+    global _profile_remaining, _profile_active, _profiler
+    with _lock:
+        # Nested instrumented calls are already covered by the outer one
+        start = _profile_remaining > 0 and not _profile_active
+        if start:
+            _profile_remaining -= 1
+            _profile_active = True
+            if _profiler is None:
+                _profiler = cProfile.Profile()
+    if not start:
+        return func(*args, **kwargs)
+    _profiler.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _profiler.disable()
+        _profile_active = False
+
+
+def instrumented(func: Callable[..., Any], name: str) -> Callable[..., Any]:
+    """Wrap a function so that its calls are recorded while enabled
+
+    Args:
+        func (Callable[..., Any]): Function to wrap
+        name (str): Name the metrics are recorded under
+
+    Returns:
+        Callable[..., Any]: Wrapper with the signature of func
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            if _profile_remaining:
+                return _profiled_call(func, args, kwargs)
+            return func(*args, **kwargs)
+        finally:
+            _record(name, time.perf_counter() - start, _input_size(args))
+
+    return wrapper
+
+
+def install(targets: Optional[Sequence[str]] = None) -> None:
+    """Wrap the public static methods of the target classes and enable
+    recording
+
+    Installing twice is a no-op for classes that are already wrapped.
+
+    Args:
+        targets (Optional[Sequence[str]]): "module:Class" names, defaults to
+            DEFAULT_TARGETS
+    """
+    global _enabled
+    wrapped = {(cls, attr) for cls, attr, _ in _installed}
+    for target in targets or DEFAULT_TARGETS:
+        module_name, _, class_name = target.partition(":")
+        cls = getattr(importlib.import_module(module_name), class_name)
+        for attr, member in list(vars(cls).items()):
+            if attr.startswith("_") or not isinstance(member, staticmethod):
+                continue
+            if (cls, attr) in wrapped:
+                continue
+            name = f"{cls.__qualname__}.{attr}"
+            setattr(cls, attr, staticmethod(instrumented(member.__func__, name)))
+            _installed.append((cls, attr, member))
+    _enabled = True
+
+
+def uninstall() -> None:
+    """Restore every wrapped function and stop recording."""
+    global _enabled
+    _enabled = False
+    while _installed:
+        cls, attr, original = _installed.pop()
+        setattr(cls, attr, original)
+
+
+def enable() -> None:
+    """Resume recording in the installed wrappers."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Pause recording; wrappers stay installed and cost one check per call."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Whether calls are being recorded
+
+    Returns:
+        bool: True while enabled
+    """
+    return _enabled
+
+
+def reset() -> None:
+    """Clear all recorded metrics and any captured profile."""
+    global _profiler, _profile_remaining
+    with _lock:
+        _metrics.clear()
+        _profiler = None
+        _profile_remaining = 0
+
+
+def profile_next(n: int) -> None:
+    """Run the next n instrumented calls under cProfile
+
+    Profiles accumulate until reset(); read them with profile_stats().
+
+    Args:
+        n (int): Number of calls to profile
+    """
+    global _profile_remaining
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    with _lock:
+        _profile_remaining = n
+
+
+def profile_stats() -> Optional[pstats.Stats]:
+    """Statistics of the calls profiled so far
+
+    Returns:
+        Optional[pstats.Stats]: None if nothing was profiled yet
+    """
+    with _lock:
+        if _profiler is None or _profile_active:
+            return None
+        return pstats.Stats(_profiler)
+
+
+def _quantile(counts: List[int], q: float) -> Optional[float]:
+    """Estimate a quantile by interpolating inside the histogram buckets"""
+    total = sum(counts)
+    if total == 0:
+        return None
+    rank = q * total
+    seen = 0
+    for i, c in enumerate(counts):
+        if c and seen + c >= rank:
+            lo = LATENCY_BUCKETS[i - 1] if i else 0.0
+            if i == len(LATENCY_BUCKETS):
+                return lo
+            return lo + (LATENCY_BUCKETS[i] - lo) * (rank - seen) / c
+        seen += c
+    return LATENCY_BUCKETS[-1]
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """Copy of the recorded metrics
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Per function: count, total_seconds,
+            p50_seconds, p99_seconds and the non-cumulative bucket counts
+            latency_buckets and size_buckets keyed by upper bound
+            ("+Inf" for the overflow bucket)
+    """
+    with _lock:
+        copied = {
+            name: (m.count, m.total, list(m.latency), list(m.sizes))
+            for name, m in _metrics.items()
+        }
+    out = {}
+    for name, (count, total, latency, sizes) in sorted(copied.items()):
+        out[name] = {
+            "count": count,
+            "total_seconds": total,
+            "p50_seconds": _quantile(latency, 0.5),
+            "p99_seconds": _quantile(latency, 0.99),
+            "latency_buckets": _buckets(LATENCY_BUCKETS, latency),
+            "size_buckets": _buckets(SIZE_BUCKETS, sizes),
+        }
+    return out
+
+
+def _buckets(bounds: Sequence[float], counts: List[int]) -> Dict[str, int]:
+    labels = [repr(b) for b in bounds] + ["+Inf"]
+    return {label: c for label, c in zip(labels, counts) if c}
+
+
+def to_json() -> str:
+    """Snapshot as a JSON document
+
+    Returns:
+        str: JSON object keyed by function name
+    """
+    return json.dumps(snapshot(), indent=2)
+
+
+def to_prometheus(prefix: str = "llm_benchmark") -> str:
+    """Snapshot in the Prometheus text exposition format
+
+    Args:
+        prefix (str): Metric name prefix
+
+    Returns:
+        str: Histograms <prefix>_call_duration_seconds and
+            <prefix>_call_input_size, labelled by function
+    """
+    with _lock:
+        copied = {
+            name: (m.count, m.total, list(m.latency), list(m.sizes), m.size_total)
+            for name, m in _metrics.items()
+        }
+    lines = []
+    for metric, bounds, index, help_text in (
+        ("call_duration_seconds", LATENCY_BUCKETS, 2, "Call latency"),
+        ("call_input_size", SIZE_BUCKETS, 3, "Size of the first argument"),
+    ):
+        full = f"{prefix}_{metric}"
+        lines.append(f"# HELP {full} {help_text}.")
+        lines.append(f"# TYPE {full} histogram")
+        for name, data in sorted(copied.items()):
+            counts = data[index]
+            label = f'function="{name}"'
+            cumulative = 0
+            for bound, c in zip(bounds, counts):
+                cumulative += c
+                lines.append(f'{full}_bucket{{{label},le="{bound!r}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{full}_bucket{{{label},le="+Inf"}} {cumulative}')
+            total = data[1] if index == 2 else data[4]
+            lines.append(f"{full}_sum{{{label}}} {total!r}")
+            lines.append(f"{full}_count{{{label}}} {cumulative}")
+    return "\n".join(lines) + "\n"
@@ -1,19 +1,30 @@
 import sqlite3
 from textwrap import dedent
+from typing import Union
+
+DB_PATH = "data/chinook.db"
+
+
+def _connect(db: Union[str, sqlite3.Connection]) -> sqlite3.Connection:
+    # An open connection is reused as is, keeping its pragmas
+    if isinstance(db, sqlite3.Connection):
+        return db
+    return sqlite3.connect(db)
 
 
 class SqlQuery:
     @staticmethod
-    def query_album(name: str) -> bool:
+    def query_album(name: str, db: Union[str, sqlite3.Connection] = DB_PATH) -> bool:
         """Check if an album exists
 
         Args:
             name (str): Name of the album
+            db (Union[str, sqlite3.Connection]): Database path or open connection
 
         Returns:
             bool: True if the album exists, False otherwise
         """
-        with sqlite3.connect("data/chinook.db") as conn:
+        with _connect(db) as conn:
             cur = conn.cursor()
 
             cur.execute(
@@ -23,13 +34,16 @@ class SqlQuery:
             return cur.fetchone() is not None
 
     @staticmethod
-    def join_albums() -> list:
+    def join_albums(db: Union[str, sqlite3.Connection] = DB_PATH) -> list:
         """Join the Album, Artist, and Track tables
 
+        Args:
+            db (Union[str, sqlite3.Connection]): Database path or open connection
+
         Returns:
             list:
         """
-        with sqlite3.connect("data/chinook.db") as conn:
+        with _connect(db) as conn:
             cur = conn.cursor()
 
             cur.execute(
@@ -49,13 +63,16 @@ class SqlQuery:
             return cur.fetchall()
 
     @staticmethod
-    def top_invoices() -> list:
+    def top_invoices(db: Union[str, sqlite3.Connection] = DB_PATH) -> list:
         """Get the top 10 invoices by total
 
+        Args:
+            db (Union[str, sqlite3.Connection]): Database path or open connection
+
         Returns:
             list: List of tuples
         """
-        with sqlite3.connect("data/chinook.db") as conn:
+        with _connect(db) as conn:
             cur = conn.cursor()
 
             cur.execute(
@@ -73,4 +90,4 @@ class SqlQuery:
                     """
                 )
             )
-            return cur.fetchall()
\ No newline at end of file
+            return cur.fetchall()
@@ -0,0 +1,237 @@
+"""Synthetic chinook databases scaled beyond the stock data set.
+
+``generate`` builds a database with the exact schema of ``data/chinook.db``
+(the DDL is read from its ``sqlite_master``) holding ``scale`` times as many
+artists, albums, tracks, customers, invoices and invoice lines:
+
+- Artist, Album, Track and Customer rows are replicated ``scale`` times with
+  remapped keys, so every copy keeps the stock albums-per-artist and
+  tracks-per-album distributions and copy 0 is identical to the stock data.
+  Names in later copies get a `` #k`` suffix and stay distinct.
+- Invoices are drawn from scratch: customers and purchased tracks follow a
+  Zipf-like popularity curve, lines per invoice follow the stock
+  distribution and dates span the stock date range.
+- Employee, Genre, MediaType, Playlist and PlaylistTrack are copied as is.
+
+``scaled_db`` caches generated databases in a temporary directory, so only
+the first benchmark run at a given scale pays for generation.
+"""
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from random import Random
+from typing import List, Optional, Tuple
+
+from llm_benchmark.sql.query import DB_PATH
+
+# Bumped whenever the generated data changes, invalidating cached files
+FORMAT = 1
+
+COPIED = ("Employee", "Genre", "MediaType", "Playlist", "PlaylistTrack")
+
+# Replicated tables: key column and the SELECT list building copy k
+_REPLICATED = {
+    "Artist": ("ArtistId", "{key}, {Name}"),
+    "Album": ("AlbumId", "{key}, {Title}, ArtistId + k * :Artist"),
+    "Track": (
+        "TrackId",
+        "{key}, {Name}, AlbumId + k * :Album, MediaTypeId, GenreId, Composer, "
+        "Milliseconds, Bytes, UnitPrice",
+    ),
+    "Customer": (
+        "CustomerId",
+        "{key}, FirstName, LastName, Company, Address, City, State, Country, "
+        "PostalCode, Phone, Fax, "
+        "CASE WHEN k = 0 THEN Email ELSE k || '.' || Email END, SupportRepId",
+    ),
+}
+
+# Copy numbers 0 .. scale - 1
+_COPIES = (
+    "WITH RECURSIVE copies(k) AS "
+    "(SELECT 0 UNION ALL SELECT k + 1 FROM copies WHERE k + 1 < :scale) "
+)
+
+# Odd multiplier spreading popularity ranks over the key space
+_SCATTER = 2654435761
+
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _suffixed(column: str) -> str:
+    return f"CASE WHEN k = 0 THEN {column} ELSE {column} || ' #' || k END"
+
+
+def _zipf(rng: Random, n: int) -> int:
+    # Index in [0, n) drawn with P(i) roughly proportional to 1 / (i + 1)
+    return min(int((n + 1) ** rng.random()), n) - 1
+
+
+def _scatter(rank: int, n: int) -> int:
+    # Popular ranks land all over the table instead of in its first rows
+    return rank * _SCATTER % n
+
+
+def schema(source: str = DB_PATH) -> Tuple[List[str], List[str]]:
+    """Read the chinook DDL
+
+    Args:
+        source (str): Path of the stock chinook database
+
+    Returns:
+        Tuple[List[str], List[str]]: CREATE TABLE and CREATE INDEX statements
+    """
+    conn = sqlite3.connect(source)
+    try:
+        rows = conn.execute(
+            "SELECT type, sql FROM sqlite_master "
+            "WHERE type IN ('table', 'index') AND sql IS NOT NULL ORDER BY rowid"
+        ).fetchall()
+    finally:
+        conn.close()
+    tables = [sql for kind, sql in rows if kind == "table"]
+    indexes = [sql for kind, sql in rows if kind == "index"]
+    return tables, indexes
+
+
+def _invoices(conn: sqlite3.Connection, scale: int, rng: Random) -> None:
+    customers = conn.execute(
+        "SELECT CustomerId, Address, City, State, Country, PostalCode "
+        "FROM src.Customer ORDER BY CustomerId"
+    ).fetchall()
+    tracks = conn.execute(
+        "SELECT TrackId, UnitPrice FROM src.Track ORDER BY TrackId"
+    ).fetchall()
+    lines_per_invoice = [
+        n
+        for (n,) in conn.execute(
+            "SELECT COUNT(*) FROM src.InvoiceLine GROUP BY InvoiceId"
+        )
+    ]
+    first, last = conn.execute(
+        "SELECT MIN(InvoiceDate), MAX(InvoiceDate) FROM src.Invoice"
+    ).fetchone()
+    start = datetime.strptime(first, _DATE_FORMAT)
+    days = (datetime.strptime(last, _DATE_FORMAT) - start).days
+    customer_stride = customers[-1][0]
+    track_stride = tracks[-1][0]
+
+    n_invoices = scale * len(lines_per_invoice)
+    n_customers = scale * len(customers)
+    n_tracks = scale * len(tracks)
+    offsets = sorted(rng.randrange(days + 1) for _ in range(n_invoices))
+    invoices = []
+    lines = []
+    for invoice_id, offset in enumerate(offsets, 1):
+        k, j = divmod(_scatter(_zipf(rng, n_customers), n_customers), len(customers))
+        customer_id, *billing = customers[j]
+        total = 0.0
+        for _ in range(rng.choice(lines_per_invoice)):
+            k_track, t = divmod(_scatter(_zipf(rng, n_tracks), n_tracks), len(tracks))
+            track_id, price = tracks[t]
+            lines.append((invoice_id, track_id + k_track * track_stride, price, 1))
+            total += price
+        date = (start + timedelta(days=offset)).strftime(_DATE_FORMAT)
+        invoices.append(
+            (
+                invoice_id,
+                customer_id + k * customer_stride,
+                date,
+                *billing,
+                round(total, 2),
+            )
+        )
+    conn.executemany("INSERT INTO Invoice VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", invoices)
+    conn.executemany(
+        "INSERT INTO InvoiceLine (InvoiceId, TrackId, UnitPrice, Quantity) "
+        "VALUES (?, ?, ?, ?)",
+        lines,
+    )
+
+
+def generate(path: str, scale: int = 10, seed: int = 0, source: str = DB_PATH) -> str:
+    """Write a chinook database scaled by a factor
+
+    Args:
+        path (str): Path of the new database; an existing file is replaced
+        scale (int): Scale factor, 1 for the stock row counts
+        seed (int): Seed of the generated invoices
+        source (str): Path of the stock chinook database
+
+    Returns:
+        str: path
+    """
+    if scale < 1:
+        raise ValueError(f"scale must be at least 1, got {scale}")
+    tables, indexes = schema(source)
+    tmp = f"{path}.tmp{os.getpid()}"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("ATTACH DATABASE ? AS src", (source,))
+        for ddl in tables:
+            conn.execute(ddl)
+        strides = {"scale": scale}
+        for table, (key, _) in _REPLICATED.items():
+            strides[table] = conn.execute(
+                f"SELECT MAX({key}) FROM src.{table}"
+            ).fetchone()[0]
+        with conn:
+            for table in COPIED:
+                conn.execute(f"INSERT INTO {table} SELECT * FROM src.{table}")
+            for table, (key, columns) in _REPLICATED.items():
+                select = columns.format(
+                    key=f"{key} + k * :{table}",
+                    Name=_suffixed("Name"),
+                    Title=_suffixed("Title"),
+                )
+                conn.execute(
+                    f"{_COPIES}INSERT INTO {table} "
+                    f"SELECT {select} FROM copies, src.{table} ORDER BY k, {key}",
+                    strides,
+                )
+            _invoices(conn, scale, Random(seed))
+            for ddl in indexes:
+                conn.execute(ddl)
+        conn.execute("DETACH DATABASE src")
+        conn.execute(f"PRAGMA user_version = {FORMAT}")
+    finally:
+        conn.close()
+    os.replace(tmp, path)
+    return path
+
+
+def scaled_db(
+    scale: int, seed: int = 0, directory: Optional[str] = None, source: str = DB_PATH
+) -> str:
+    """Path of a cached scaled chinook database, generating it if needed
+
+    Callers that write to the database should work on a copy.
+
+    Args:
+        scale (int): Scale factor
+        seed (int): Seed of the generated invoices
+        directory (Optional[str]): Cache directory, a llm_benchmark folder in
+            the system temporary directory by default
+        source (str): Path of the stock chinook database
+
+    Returns:
+        str: Path of the database file
+    """
+    if directory is None:
+        directory = os.path.join(tempfile.gettempdir(), "llm_benchmark")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"chinook-x{scale}-seed{seed}.db")
+    if os.path.exists(path):
+        conn = sqlite3.connect(path)
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            conn.close()
+        if version == FORMAT:
+            return path
+    return generate(path, scale, seed, source)
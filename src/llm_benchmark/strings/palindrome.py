@@ -0,0 +1,159 @@
+"""Linear-time palindrome analytics (Manacher's algorithm).
+
+``PalindromeIndex`` computes, in one O(n) pass, the radius of the longest
+palindrome around every center of a string. From the radii it answers
+whole-string palindrome checks, the longest palindromic substring and the
+number of palindromic substrings.
+
+With ``normalize=True`` case and non-alphanumeric characters are ignored.
+The text is streamed once into an ``array`` of case-folded code points plus
+an ``array`` of original offsets (used to map results back), instead of
+building intermediate ``str`` copies with ``lower()`` and ``join``.
+"""
+from array import array
+from typing import Sequence, Tuple, Union
+
+Text = Union[str, Sequence[int]]
+
+
+def _normalized(s: str) -> Tuple[array, array]:
+    """Case-folded alphanumeric code points of s and their offsets"""
+    codes = array("I")
+    offsets = array("Q")
+    for i, c in enumerate(s):
+        if c.isalnum():
+            folded = c.casefold()
+            # A few characters fold to several (e.g. "ß" -> "ss")
+            for f in folded:
+                codes.append(ord(f))
+                offsets.append(i)
+    return codes, offsets
+
+
+def is_palindrome(s: str, normalize: bool = False) -> bool:
+    """Check if a string is a palindrome in a single two-pointer pass
+
+    With normalize=True the string is first normalized exactly like
+    PalindromeIndex(s, normalize=True) does, so characters with multi-character
+    case folds (e.g. "ß" -> "ss") give the same answer from both.
+
+    Args:
+        s (str): String to check
+        normalize (bool): Ignore case and non-alphanumeric characters
+
+    Returns:
+        bool: True if the string is a palindrome, False otherwise
+    """
+    t: Text = _normalized(s)[0] if normalize else s
+    n = len(t)
+    return all(t[i] == t[n - 1 - i] for i in range(n // 2))
+
+
+class PalindromeIndex:
+    """Per-center palindrome radii of a string.
+
+    Attributes:
+        odd: odd[i] is the number of odd-length palindromes centered at i,
+             i.e. the longest one is t[i - odd[i] + 1 : i + odd[i]]
+        even: even[i] is the number of even-length palindromes centered
+              between i - 1 and i, i.e. the longest is t[i - even[i] : i + even[i]]
+
+    where t is the (normalized) text.
+
+    Args:
+        s (str): Text to index
+        normalize (bool): Ignore case and non-alphanumeric characters
+    """
+
+    def __init__(self, s: str, normalize: bool = False) -> None:
+        self._s = s
+        if normalize:
+            t, self._offsets = _normalized(s)
+        else:
+            t, self._offsets = s, None
+        self._n = len(t)
+        self.odd = self._odd_radii(t)
+        self.even = self._even_radii(t)
+
+    @staticmethod
+    def _odd_radii(t: Text) -> array:
+        n = len(t)
+        d = array("I", bytes(4 * n))
+        left, right = 0, -1
+        for i in range(n):
+            k = 1 if i > right else min(d[left + right - i], right - i + 1)
+            while i - k >= 0 and i + k < n and t[i - k] == t[i + k]:
+                k += 1
+            d[i] = k
+            if i + k - 1 > right:
+                left, right = i - k + 1, i + k - 1
+        return d
+
+    @staticmethod
+    def _even_radii(t: Text) -> array:
+        n = len(t)
+        d = array("I", bytes(4 * n))
+        left, right = 0, -1
+        for i in range(n):
+            k = 0 if i > right else min(d[left + right - i + 1], right - i + 1)
+            while i - k - 1 >= 0 and i + k < n and t[i - k - 1] == t[i + k]:
+                k += 1
+            d[i] = k
+            if i + k - 1 > right:
+                left, right = i - k, i + k - 1
+        return d
+
+    def is_palindrome(self) -> bool:
+        """Whether the whole (normalized) text is a palindrome
+
+        Returns:
+            bool: True if the text is a palindrome
+        """
+        n = self._n
+        if n == 0:
+            return True
+        if n % 2:
+            return self.odd[n // 2] == n // 2 + 1
+        return self.even[n // 2] == n // 2
+
+    def longest_span(self) -> Tuple[int, int]:
+        """Bounds of the longest palindromic substring
+
+        Returns:
+            Tuple[int, int]: (start, end) offsets into the original string;
+                the leftmost longest palindrome is returned on ties
+        """
+        if self._n == 0:
+            return 0, 0
+        best_len, best_start = 0, 0
+        for i in range(self._n):
+            length = 2 * self.odd[i] - 1
+            if length > best_len:
+                best_len, best_start = length, i - self.odd[i] + 1
+            length = 2 * self.even[i]
+            if length > best_len:
+                best_len, best_start = length, i - self.even[i]
+        if self._offsets is None:
+            return best_start, best_start + best_len
+        return (
+            self._offsets[best_start],
+            self._offsets[best_start + best_len - 1] + 1,
+        )
+
+    def longest(self) -> str:
+        """Longest palindromic substring
+
+        Returns:
+            str: The substring of the original string, including any
+                ignored characters inside it when normalized
+        """
+        start, end = self.longest_span()
+        return self._s[start:end]
+
+    def count(self) -> int:
+        """Number of palindromic substrings, counted by position
+
+        Returns:
+            int: Number of (start, end) pairs whose substring is a palindrome
+        """
+        return sum(self.odd) + sum(self.even)
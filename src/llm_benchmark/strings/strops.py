@@ -1,27 +1,186 @@
+import os
+from typing import BinaryIO, List, Optional, Sequence, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+# Bytes handled per step by the chunked buffer operations
+CHUNK_SIZE = 1 << 20
+
+# Strings sent to a worker per task by the batch operations
+BATCH_CHUNK_SIZE = 1 << 14
+
+# Maps 0/1 flag bytes to ASCII digits for int(..., 2)
+_BITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def _reverse_chunk(strings: Sequence[str]) -> List[str]:
+    return [s[::-1] for s in strings]
+
+
+def _palindrome_chunk(strings: Sequence[str]) -> int:
+    """Bitmask with bit i set when strings[i] is a palindrome"""
+    if not strings:
+        return 0
+    flags = bytes(s == s[::-1] for s in strings)
+    return int(flags.translate(_BITS)[::-1], 2)
+
+
+def _byte_view(s: Buffer) -> memoryview:
+    """Flat unsigned-byte view of any contiguous buffer"""
+    view = memoryview(s)
+    return view if view.format == "B" and view.ndim == 1 else view.cast("B")
+
+
 class StrOps:
     @staticmethod
-    def str_reverse(s: str) -> str:
-        """Reverse a string
+    def str_reverse(s: Union[str, Buffer]) -> Union[str, bytes, bytearray]:
+        """Reverse a string or byte buffer
 
         Args:
-            s (str): String to reverse
+            s (Union[str, Buffer]): String, bytes, bytearray or memoryview
 
         Returns:
-            str: Reversed string
+            Union[str, bytes, bytearray]: Reversed copy; a memoryview
+                input gives a bytearray
         """
+        if isinstance(s, memoryview):
+            # Copied once and reversed in place; bytes would need a second copy
+            out = bytearray(_byte_view(s))
+            out.reverse()
+            return out
         return s[::-1]
 
     @staticmethod
-    def palindrome(s: str) -> bool:
-        """Check if a string is a palindrome
+    def reverse_inplace(buf: bytearray) -> None:
+        """Reverse a bytearray in place, without a copy
 
         Args:
-            s (str): String to check
+            buf (bytearray): Buffer to reverse
+        """
+        buf.reverse()
+
+    @staticmethod
+    def reverse_to_file(
+        buf: Buffer, out: BinaryIO, chunk_size: int = CHUNK_SIZE
+    ) -> int:
+        """Write the reverse of a buffer to a binary file, chunk by chunk
+
+        Only one chunk is copied at a time, so this works on mmap-ed inputs
+        larger than memory.
+
+        Args:
+            buf (Buffer): Any contiguous buffer, e.g. an mmap
+            out (BinaryIO): File opened for binary writing
+            chunk_size (int): Bytes reversed per write
+
+        Returns:
+            int: Number of bytes written
+        """
+        view = _byte_view(buf)
+        try:
+            for end in range(len(view), 0, -chunk_size):
+                out.write(view[max(0, end - chunk_size) : end].tobytes()[::-1])
+            return len(view)
+        finally:
+            view.release()
+
+    @staticmethod
+    def palindrome(s: Union[str, Buffer], chunk_size: int = CHUNK_SIZE) -> bool:
+        """Check if a string or byte buffer is a palindrome
+
+        Byte buffers are compared one chunk from each end at a time through
+        reversed memoryviews, without materializing a reversed copy.
+
+        Args:
+            s (Union[str, Buffer]): String, bytes, bytearray or memoryview
+            chunk_size (int): Bytes compared per step for buffers
 
         Returns:
             bool: True if the string is a palindrome, False otherwise
         """
-        for i in range(len(s)):
-            if s[i] != s[len(s) - 1 - i]:
+        if not isinstance(s, str):
+            return StrOps._buffer_palindrome(s, chunk_size)
+        n = len(s)
+        # Each mirrored pair only needs comparing once
+        for i in range(n // 2):
+            if s[i] != s[n - 1 - i]:
                 return False
         return True
+
+    @staticmethod
+    def _buffer_palindrome(buf: Buffer, chunk_size: int) -> bool:
+        view = _byte_view(buf)
+        n = len(view)
+        try:
+            for start in range(0, n // 2, chunk_size):
+                size = min(chunk_size, n // 2 - start)
+                front = view[start : start + size]
+                back = view[n - start - size : n - start]
+                if front != back[::-1]:
+                    return False
+            return True
+        finally:
+            view.release()
+
+    @staticmethod
+    def _map_chunks(
+        fn, strings: Sequence[str], workers: Optional[int], chunk_size: int
+    ) -> list:
+        chunks = [
+            strings[i : i + chunk_size] for i in range(0, len(strings), chunk_size)
+        ]
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(chunks) <= 1:
+            return [fn(chunk) for chunk in chunks]
+        # Imported here: multiprocessing is slow to import and only needed
+        # for parallel batches
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(min(workers, len(chunks))) as executor:
+            return list(executor.map(fn, chunks))
+
+    @staticmethod
+    def reverse_many(
+        strings: Sequence[str],
+        workers: Optional[int] = 1,
+        chunk_size: int = BATCH_CHUNK_SIZE,
+    ) -> List[str]:
+        """Reverse many strings in one call
+
+        Args:
+            strings (Sequence[str]): Strings to reverse
+            workers (Optional[int]): Worker processes, None for os.cpu_count();
+                batches are split into chunks of chunk_size per task
+            chunk_size (int): Strings per task
+
+        Returns:
+            List[str]: Reversed strings, in input order
+        """
+        out: List[str] = []
+        for part in StrOps._map_chunks(_reverse_chunk, strings, workers, chunk_size):
+            out += part
+        return out
+
+    @staticmethod
+    def palindrome_many(
+        strings: Sequence[str],
+        workers: Optional[int] = 1,
+        chunk_size: int = BATCH_CHUNK_SIZE,
+    ) -> int:
+        """Check many strings for palindromes in one call
+
+        Args:
+            strings (Sequence[str]): Strings to check
+            workers (Optional[int]): Worker processes, None for os.cpu_count();
+                batches are split into chunks of chunk_size per task
+            chunk_size (int): Strings per task
+
+        Returns:
+            int: Bitmask with bit i set when strings[i] is a palindrome,
+                test with (mask >> i) & 1
+        """
+        mask = 0
+        parts = StrOps._map_chunks(_palindrome_chunk, strings, workers, chunk_size)
+        for i, part in enumerate(parts):
+            mask |= part << (i * chunk_size)
+        return mask
@@ -0,0 +1,183 @@
+"""Suffix array index for repeated substring lookups over a fixed text.
+
+``SuffixArray`` sorts all suffixes of a text once by prefix doubling: at most
+O(log n) rounds, each an O(n log n) C-level sort, so O(n log^2 n) in all. It
+then builds the LCP array with Kasai's algorithm.
+``count`` and ``locate`` then binary-search the sorted suffixes in
+O(m log n) for a pattern of length m, instead of rescanning the text.
+
+The index can be saved as compact ``array`` data and memory-mapped back, so
+a large corpus is indexed once and opened at startup without rebuilding.
+"""
+import mmap
+import struct
+from array import array
+from typing import Any, List, Optional, Sequence, Tuple
+
+# magic, text length in characters, UTF-8 byte length, position typecode
+_HEADER = struct.Struct("<8sQQ1s")
+_HEADER_SIZE = 64
+_MAGIC = b"LLMBSA01"
+
+
+def _typecode(n: int) -> str:
+    return "I" if n < 1 << 32 else "Q"
+
+
+def _build_sa(text: str) -> array:
+    """Suffix array of text by prefix doubling"""
+    n = len(text)
+    sa = sorted(range(n), key=text.__getitem__)
+    rank = [0] * n
+    for prev, cur in zip(sa, sa[1:]):
+        rank[cur] = rank[prev] + (text[cur] != text[prev])
+    k = 1
+    while n and rank[sa[-1]] < n - 1:
+        # Sort by (rank of first k chars, rank of next k chars) packed in one int
+        keys = [
+            rank[i] * (n + 1) + (rank[i + k] + 1 if i + k < n else 0) for i in range(n)
+        ]
+        sa.sort(key=keys.__getitem__)
+        for prev, cur in zip(sa, sa[1:]):
+            rank[cur] = rank[prev] + (keys[cur] != keys[prev])
+        k *= 2
+    return array(_typecode(n), sa)
+
+
+def _build_lcp(text: str, sa: Sequence[int]) -> array:
+    """lcp[i] = longest common prefix of suffixes sa[i - 1] and sa[i] (Kasai)"""
+    n = len(text)
+    rank = [0] * n
+    for i, p in enumerate(sa):
+        rank[p] = i
+    lcp = array(_typecode(n), bytes(array(_typecode(n)).itemsize * n))
+    h = 0
+    for p in range(n):
+        r = rank[p]
+        if r == 0:
+            h = 0
+            continue
+        q = sa[r - 1]
+        while p + h < n and q + h < n and text[p + h] == text[q + h]:
+            h += 1
+        lcp[r] = h
+        if h:
+            h -= 1
+    return lcp
+
+
+class SuffixArray:
+    """Suffix array and LCP array of a text.
+
+    Args:
+        text (str): Text to index
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.sa: Sequence[int] = _build_sa(text)
+        self.lcp: Sequence[int] = _build_lcp(text, self.sa)
+        self._mmap: Optional[mmap.mmap] = None
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def _range(self, pattern: str) -> Tuple[int, int]:
+        """[lo, hi) range of suffixes starting with pattern"""
+        text, sa, m = self.text, self.sa, len(pattern)
+        lo, hi = 0, len(sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if text[sa[mid] : sa[mid] + m] < pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        start, hi = lo, len(sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if text[sa[mid] : sa[mid] + m] == pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        return start, lo
+
+    def count(self, pattern: str) -> int:
+        """Number of (possibly overlapping) occurrences of a pattern
+
+        Args:
+            pattern (str): Substring to look up
+
+        Returns:
+            int: Number of occurrences
+        """
+        start, stop = self._range(pattern)
+        return stop - start
+
+    def locate(self, pattern: str) -> List[int]:
+        """Positions of all occurrences of a pattern
+
+        Args:
+            pattern (str): Substring to look up
+
+        Returns:
+            List[int]: Start offsets in ascending order
+        """
+        start, stop = self._range(pattern)
+        return sorted(self.sa[start:stop])
+
+    def save(self, path: str) -> None:
+        """Write the index to a file that load() can memory-map
+
+        Args:
+            path (str): Destination path
+        """
+        encoded = self.text.encode("utf-8")
+        typecode = _typecode(len(self.text))
+        header = _HEADER.pack(_MAGIC, len(self.text), len(encoded), typecode.encode())
+        with open(path, "wb") as f:
+            f.write(header.ljust(_HEADER_SIZE, b"\0"))
+            array(typecode, self.sa).tofile(f)
+            array(typecode, self.lcp).tofile(f)
+            f.write(encoded)
+
+    @classmethod
+    def load(cls, path: str) -> "SuffixArray":
+        """Open a saved index, memory-mapping the suffix and LCP arrays
+
+        Args:
+            path (str): Path written by save()
+
+        Returns:
+            SuffixArray: Index backed by the file; call close() when done
+        """
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n, text_bytes, typecode = _HEADER.unpack_from(mm)
+        if magic != _MAGIC:
+            mm.close()
+            raise ValueError(f"{path} is not a suffix array file")
+        typecode = typecode.decode()
+        width = array(typecode).itemsize * n
+        view = memoryview(mm)
+        self = cls.__new__(cls)
+        self._mmap = mm
+        self.sa = view[_HEADER_SIZE : _HEADER_SIZE + width].cast(typecode)
+        self.lcp = view[_HEADER_SIZE + width : _HEADER_SIZE + 2 * width].cast(typecode)
+        end = _HEADER_SIZE + 2 * width
+        self.text = str(view[end : end + text_bytes], "utf-8")
+        view.release()
+        return self
+
+    def close(self) -> None:
+        """Release the memory mapping of a loaded index."""
+        if self._mmap is not None:
+            self.sa.release()
+            self.lcp.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "SuffixArray":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
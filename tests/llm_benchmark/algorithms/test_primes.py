@@ -3,6 +3,7 @@ from typing import List
 import pytest
 
 from llm_benchmark.algorithms.primes import Primes
+from llm_benchmark.bench.memory import KiB, MiB
 
 
 @pytest.mark.parametrize(
@@ -37,6 +38,12 @@ def test_benchmark_sum_primes(benchmark) -> None:
     benchmark(Primes.sum_primes, 20)
 
 
+# The sieve is a list of n object pointers
+@pytest.mark.memory_budget(peak=1 * MiB, retained=1 * KiB)
+def test_benchmark_sum_primes_large(benchmark) -> None:
+    benchmark(Primes.sum_primes, 100_000)
+
+
 @pytest.mark.parametrize(
     "n, factors",
     [
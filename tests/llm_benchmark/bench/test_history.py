@@ -0,0 +1,132 @@
+import json
+from random import Random
+from typing import Any, Dict, List
+
+import pytest
+
+from llm_benchmark.bench.history import (
+    MAX_SAMPLES,
+    History,
+    bootstrap_ratio,
+    compare,
+    fingerprint,
+    main,
+    mann_whitney,
+)
+
+MACHINE = {
+    "node": "host",
+    "system": "Linux",
+    "machine": "x86_64",
+    "python_implementation": "CPython",
+    "python_version": "3.11.7",
+    "cpu": {"brand_raw": "cpu", "count": 4},
+}
+
+
+def _samples(median: float, n: int = 200, seed: int = 0) -> List[float]:
+    rng = Random(seed)
+    return [median * rng.lognormvariate(0, 0.05) for _ in range(n)]
+
+
+def _report(commit: str, timings: Dict[str, List[float]]) -> Dict[str, Any]:
+    benchmarks = []
+    for name, data in timings.items():
+        ordered = sorted(data)
+        mean = sum(data) / len(data)
+        benchmarks.append(
+            {
+                "fullname": name,
+                "stats": {
+                    "median": ordered[len(ordered) // 2],
+                    "mean": mean,
+                    "stddev": 0.0,
+                    "rounds": len(data),
+                    "data": data,
+                },
+            }
+        )
+    return {
+        "machine_info": MACHINE,
+        "commit_info": {"id": commit, "dirty": False},
+        "benchmarks": benchmarks,
+    }
+
+
+def test_fingerprint() -> None:
+    assert fingerprint(MACHINE) == fingerprint(dict(MACHINE))
+    assert fingerprint(MACHINE) != fingerprint({**MACHINE, "node": "other"})
+
+
+def test_record(tmp_path) -> None:
+    with History(str(tmp_path / "db" / "history.sqlite")) as history:
+        first = history.record(_report("aaa", {"t::a": _samples(1.0)}))
+        second = history.record(_report("bbb", {"t::a": _samples(1.0, 5000)}))
+        assert [run.commit_id for run in history.runs()] == ["bbb", "aaa"]
+        assert history.baseline(history.run(second)).id == first
+        assert history.baseline(history.run(first)) is None
+        stats = history.stats(second)["t::a"]
+        assert stats.rounds == 5000
+        assert len(stats.samples) == MAX_SAMPLES
+        assert history.runs(python="CPython 3.8.0") == []
+
+
+def test_mann_whitney() -> None:
+    base = _samples(1.0)
+    assert mann_whitney(base, _samples(1.0, seed=1)) > 0.01
+    assert mann_whitney(base, _samples(1.1, seed=1)) < 1e-6
+    assert mann_whitney(base, _samples(0.9, seed=1)) > 0.99
+    assert mann_whitney([1.0] * 10, [1.0] * 10) == 0.5
+
+
+def test_bootstrap_ratio() -> None:
+    base = _samples(1.0)
+    lo, hi = bootstrap_ratio(base, _samples(1.0, seed=1), resamples=200)
+    assert lo < 1 < hi
+    lo, hi = bootstrap_ratio(base, _samples(1.2, seed=1), resamples=200)
+    assert 1.1 < lo < hi < 1.3
+
+
+@pytest.mark.parametrize("method", ["mannwhitney", "bootstrap"])
+def test_compare(tmp_path, method: str) -> None:
+    with History(str(tmp_path / "history.sqlite")) as history:
+        base = history.record(
+            _report("aaa", {"a": _samples(1.0), "b": _samples(1.0), "c": _samples(1.0)})
+        )
+        cur = history.record(
+            _report(
+                "bbb",
+                {
+                    "a": _samples(1.3, seed=1),
+                    "b": _samples(0.7, seed=1),
+                    "c": _samples(1.02, seed=1),
+                },
+            )
+        )
+        result = compare(history.stats(base), history.stats(cur), method=method)
+    assert [(c.name, c.status) for c in result] == [
+        ("a", "regression"),
+        ("b", "improvement"),
+        ("c", "unchanged"),
+    ]
+
+
+def test_main(tmp_path, capsys) -> None:
+    db = str(tmp_path / "history.sqlite")
+    for commit, median in (("aaa", 1.0), ("bbb", 1.0), ("ccc", 1.5)):
+        path = tmp_path / f"{commit}.json"
+        path.write_text(json.dumps(_report(commit, {"a": _samples(median)})))
+        assert main(["--db", db, "record", str(path)]) == 0
+    assert main(["--db", db, "compare", "--run", "2"]) == 0
+    assert main(["--db", db, "compare"]) == 1
+    assert main(["--db", db, "compare", "--baseline", "ccc"]) == 0
+    capsys.readouterr()
+    assert main(["--db", db, "trend"]) == 0
+    header, _, row = capsys.readouterr().out.splitlines()
+    assert header == "| benchmark | aaa | bbb | ccc |"
+    assert row.startswith("| a | 1") and row.endswith(" s |")
+
+
+def test_benchmark_mann_whitney(benchmark) -> None:
+    base, cur = _samples(1.0, MAX_SAMPLES), _samples(1.01, MAX_SAMPLES, seed=1)
+    benchmark(mann_whitney, base, cur)
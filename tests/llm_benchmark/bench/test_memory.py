@@ -0,0 +1,106 @@
+import os
+import tracemalloc
+
+import pytest
+
+import llm_benchmark
+from llm_benchmark.bench.memory import KiB, measure
+
+CONFTEST = """
+import pytest
+
+pytest_plugins = ["llm_benchmark.bench.memory"]
+
+
+@pytest.fixture
+def benchmark(request):
+    from llm_benchmark.bench.memory import benchmark_fixture
+
+    yield from benchmark_fixture(request)
+"""
+
+TESTS = """
+import pytest
+
+
+def make(n):
+    return bytearray(n)
+
+
+@pytest.mark.memory_budget(peak=64 * 1024)
+def test_within(benchmark):
+    benchmark.group = "memory"
+    assert len(benchmark(make, 1024)) == 1024
+
+
+@pytest.mark.memory_budget(retained=1024)
+def test_over(benchmark):
+    benchmark.pedantic(make, (8192,), rounds=1)
+
+
+def test_unbudgeted(benchmark):
+    benchmark(make, 16)
+"""
+
+
+def test_measure() -> None:
+    def temporary() -> int:
+        return len(bytearray(100 * KiB))
+
+    stats = measure(temporary)
+    assert stats.peak >= 100 * KiB
+    assert stats.retained < KiB
+
+    stats = measure(bytearray, 100 * KiB)
+    assert stats.retained >= 100 * KiB
+    assert stats.retained_blocks >= 1
+
+
+def test_measure_copies_arguments() -> None:
+    values = [3, 1, 2]
+    measure(list.sort, values)
+    measure(list.clear, values)
+    assert values == [3, 1, 2]
+    view = memoryview(b"abc")
+    assert measure(bytes, view).retained < KiB
+
+
+def test_measure_keeps_caller_tracing() -> None:
+    tracemalloc.start()
+    try:
+        kept = bytearray(100 * KiB)
+        traced = tracemalloc.get_traced_memory()[0]
+        stats = measure(bytearray, 10 * KiB)
+        assert tracemalloc.is_tracing()
+        assert tracemalloc.get_traced_memory()[0] >= traced
+        assert tracemalloc.get_object_traceback(kept) is not None
+    finally:
+        tracemalloc.stop()
+    assert 10 * KiB <= stats.retained < 20 * KiB
+    assert stats.peak < 50 * KiB
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_plugin(pytester, monkeypatch, enabled: bool) -> None:
+    src = os.path.dirname(os.path.dirname(llm_benchmark.__file__))
+    monkeypatch.setenv("PYTHONPATH", src)
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(TESTS)
+    args = ["--benchmark-disable", "-p", "no:cacheprovider"]
+    if enabled:
+        args.append("--benchmark-memory")
+    result = pytester.runpytest_subprocess(*args)
+    if enabled:
+        result.assert_outcomes(passed=2, failed=1)
+        result.stdout.fnmatch_lines(
+            [
+                "*retained 8.* KiB exceeds budget 1.0 KiB*",
+                "*benchmark memory*",
+                "*test_within*ok",
+                "*test_over*FAIL",
+                "*test_unbudgeted*-",
+            ]
+        )
+    else:
+        result.assert_outcomes(passed=3)
+        assert "benchmark memory" not in result.stdout.str()
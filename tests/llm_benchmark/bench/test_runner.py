@@ -0,0 +1,313 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from llm_benchmark.bench.runner import (
+    CONTENTION_LIMIT,
+    Sample,
+    Sampler,
+    Shard,
+    available_cpus,
+    collect,
+    format_summary,
+    main,
+    merge,
+    noise_flags,
+    run,
+    run_shards,
+    shard_conditions,
+    split,
+)
+from llm_benchmark.bench.runner import _pin, _wait_any
+
+linux = pytest.mark.skipif(
+    not os.path.exists("/proc/stat") or not hasattr(os, "sched_setaffinity"),
+    reason="needs /proc and sched_setaffinity",
+)
+
+BENCHMARKS = textwrap.dedent(
+    """
+    import pytest
+
+    @pytest.mark.parametrize("n", [10, 100, 1000])
+    def test_benchmark_sum(benchmark, n):
+        assert benchmark(sum, range(n)) == n * (n - 1) // 2
+
+    def test_benchmark_sorted(benchmark):
+        benchmark(sorted, range(100, 0, -1))
+
+    def test_sum():
+        assert sum([1, 2]) == 3
+    """
+)
+
+
+# Each benchmark records how many CPUs its shard may run on
+AFFINITY = textwrap.dedent(
+    """
+    import os
+
+    import pytest
+
+    def cpus():
+        return len(os.sched_getaffinity(0))
+
+    def test_benchmark_pinned(benchmark):
+        benchmark.extra_info["cpus"] = benchmark(cpus)
+
+    @pytest.mark.multiprocess
+    def test_benchmark_spawning(benchmark):
+        benchmark.extra_info["cpus"] = benchmark(cpus)
+    """
+)
+
+
+@pytest.fixture
+def bench_dir(tmp_path, monkeypatch):
+    (tmp_path / "test_sample.py").write_text(BENCHMARKS)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _report(*names, stats=None):
+    return {
+        "machine_info": {"node": "host"},
+        "commit_info": {"id": "abc"},
+        "version": "5.0",
+        "benchmarks": [
+            {
+                "name": name,
+                "fullname": f"test_x.py::{name}",
+                "stats": stats or {"median": 1.0, "iqr": 0.01},
+                "extra_info": {"size": 3},
+            }
+            for name in names
+        ],
+    }
+
+
+@pytest.mark.parametrize(
+    "n, expected",
+    [
+        (1, [["a", "b", "c", "d", "e"]]),
+        (2, [["a", "c", "e"], ["b", "d"]]),
+        (6, [["a"], ["b"], ["c"], ["d"], ["e"], []]),
+    ],
+)
+def test_split(n, expected):
+    assert split(["a", "b", "c", "d", "e"], n) == expected
+
+
+def test_available_cpus():
+    cpus = available_cpus()
+    assert cpus and cpus == sorted(set(cpus))
+
+
+@pytest.mark.parametrize(
+    "stats, conditions, flags",
+    [
+        ({"median": 1.0, "iqr": 0.05}, {}, []),
+        ({"median": 1.0, "iqr": 0.5}, {}, ["high-spread"]),
+        (
+            {"median": 1.0, "iqr": 0.0},
+            {"freq_mhz": {"min": 1200.0, "max": 3000.0, "mean": 2000.0}},
+            ["frequency-drift"],
+        ),
+        (
+            {"median": 1.0, "iqr": 0.0},
+            {"freq_mhz": {"min": 2990.0, "max": 3000.0, "mean": 2995.0}},
+            [],
+        ),
+        ({"median": 1.0, "iqr": 0.0}, {"contention": 0.3}, ["cpu-contention"]),
+        ({"median": 1.0, "iqr": 0.0}, {"contention": None}, []),
+        (
+            {"median": 1.0, "iqr": 0.0},
+            {"load": {"min": 1.0, "max": 9.0, "mean": 5.0}},
+            ["overloaded"],
+        ),
+    ],
+)
+def test_noise_flags(stats, conditions, flags):
+    assert noise_flags(stats, conditions, cpus=4) == flags
+
+
+def test_shard_conditions():
+    samples = [
+        Sample(0.0, 0.5, {1: 1000.0}, {1: 0.1}),
+        Sample(1.0, 1.0, {1: 2000.0}, {1: 1.0}),
+        Sample(2.0, 1.5, {1: 3000.0}, {1: 0.9}),
+        Sample(3.0, 2.0, {1: 4000.0}, {1: 0.2}),
+        Sample(4.0, 2.5, {1: 5000.0}, {1: 0.0}),
+    ]
+    conditions = shard_conditions(samples, 1, 0.5, 2.5)
+    assert conditions["freq_mhz"] == {"min": 2000.0, "max": 4000.0, "mean": 3000.0}
+    assert conditions["load"]["max"] == 2.0
+    assert shard_conditions(samples, 2, 0.5, 2.5)["freq_mhz"] is None
+
+
+def test_merge():
+    shards = [
+        Shard(0, 2, ["b"], 0, 0.0, 1.0, dict(_report("b"), runner={}), "", 0.0),
+        Shard(1, 3, ["a"], 0, 0.0, 2.0, dict(_report("a"), runner={}), "", 0.5),
+        Shard(2, 4, ["c"], 1, 0.0, 0.5, None, "boom", None),
+    ]
+    merged = merge(shards, {"jobs": 3})
+    assert [b["name"] for b in merged["benchmarks"]] == ["a", "b"]
+    assert merged["benchmarks"][0]["extra_info"] == {
+        "size": 3,
+        "cpu": 3,
+        "noise": ["cpu-contention"],
+    }
+    assert merged["benchmarks"][1]["extra_info"]["noise"] == []
+    assert merged["machine_info"] == {"node": "host"}
+    assert merged["runner"]["jobs"] == 3
+    assert [s["returncode"] for s in merged["runner"]["shards"]] == [0, 0, 1]
+    assert "2 benchmarks, 1 noisy" in format_summary(merged)
+
+
+def test_merge_no_reports():
+    with pytest.raises(RuntimeError):
+        merge([Shard(0, 0, ["a"], 2, 0.0, 1.0, None, "", None)], {})
+
+
+@linux
+def test_sampler():
+    cpu = available_cpus()[0]
+    with Sampler([cpu], interval=0.01) as sampler:
+        sum(range(10**6))
+    assert sampler.samples
+    last = sampler.samples[-1]
+    assert last.load is not None
+    assert 0.0 <= last.busy.get(cpu, 0.0) <= 1.0
+
+
+def test_collect(bench_dir):
+    assert collect(["."]) == [
+        "test_sample.py::test_benchmark_sum[10]",
+        "test_sample.py::test_benchmark_sum[100]",
+        "test_sample.py::test_benchmark_sum[1000]",
+        "test_sample.py::test_benchmark_sorted",
+    ]
+    assert collect(["."], keyword="sorted") == ["test_sample.py::test_benchmark_sorted"]
+
+
+def test_collect_error(bench_dir):
+    (bench_dir / "test_broken.py").write_text("import nosuchmodule\n")
+    with pytest.raises(RuntimeError):
+        collect(["."])
+
+
+@linux
+def test_run(bench_dir):
+    report = run(
+        ["."], jobs=1, disable_gc=True, pytest_args=["--benchmark-max-time=0.05"]
+    )
+    assert len(report["benchmarks"]) == 4
+    assert report["runner"]["pinned"] and report["runner"]["disable_gc"]
+    assert report["runner"]["failed"] == []
+    assert all(b["options"]["disable_gc"] for b in report["benchmarks"])
+    assert {b["extra_info"]["cpu"] for b in report["benchmarks"]} == {
+        available_cpus()[-1]
+    }
+
+
+@linux
+@pytest.mark.parametrize("keyword, shards", [(None, 2), ("spawning", 1)])
+def test_run_multiprocess_unpinned(bench_dir, keyword, shards):
+    (bench_dir / "test_affinity.py").write_text(AFFINITY)
+    report = run(
+        ["test_affinity.py"],
+        jobs=1,
+        keyword=keyword,
+        pytest_args=["--benchmark-max-time=0.01"],
+    )
+    extra = {b["name"]: b["extra_info"] for b in report["benchmarks"]}
+    if keyword is None:
+        assert extra["test_benchmark_pinned"]["cpus"] == 1
+        assert extra["test_benchmark_pinned"]["cpu"] == available_cpus()[-1]
+    # The serial shard runs last, on every CPU of the runner
+    assert extra["test_benchmark_spawning"]["cpus"] == len(available_cpus())
+    assert extra["test_benchmark_spawning"]["cpu"] is None
+    assert report["runner"]["serial"] == 1
+    assert len(report["runner"]["shards"]) == shards
+    assert report["runner"]["shards"][-1]["cpu"] is None
+    assert format_summary(report).splitlines()[shards].split()[0] == "all"
+
+
+@linux
+def test_run_shards_shared_cpu(bench_dir):
+    # Two workers on one CPU take time from each other
+    cpu = available_cpus()[0]
+    shards = run_shards(
+        split(collect(["."]), 2), [cpu, cpu], ["--benchmark-max-time=0.2"], 0.05
+    )
+    assert [s.index for s in shards] == [0, 1]
+    assert all(s.returncode == 0 for s in shards)
+    assert max(s.contention for s in shards) > CONTENTION_LIMIT
+    merged = merge(shards, {})
+    assert len(merged["benchmarks"]) == 4
+    assert any(
+        "cpu-contention" in b["extra_info"]["noise"] for b in merged["benchmarks"]
+    )
+
+
+@pytest.mark.skipif(not hasattr(os, "wait4"), reason="needs os.wait4")
+def test_wait_any_leaves_other_children():
+    other = subprocess.Popen([sys.executable, "-c", "raise SystemExit(3)"])
+    worker = subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(0.5); raise SystemExit(2)"]
+    )
+    try:
+        # other exits first but is not one of the processes waited on; a
+        # stolen exit status would show up as returncode 0 below
+        pid, cpu_seconds = _wait_any({worker.pid: worker})
+    finally:
+        worker.kill()
+    assert pid == worker.pid and worker.returncode == 2
+    assert cpu_seconds is not None
+    assert other.wait() == 3
+
+
+@linux
+def test_pin():
+    cpu = available_cpus()[-1]
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(1)"])
+    try:
+        _pin(proc.pid, cpu)
+        assert os.sched_getaffinity(proc.pid) == {cpu}
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def test_run_validation(bench_dir):
+    with pytest.raises(ValueError):
+        run(["."], cpus=[0, 0])
+    with pytest.raises(ValueError):
+        run(["."], jobs=2, cpus=[0])
+    with pytest.raises(RuntimeError):
+        run(["."], keyword="nosuch", cpus=[available_cpus()[0]])
+
+
+@linux
+def test_main(bench_dir, capsys):
+    out = bench_dir / "out" / "report.json"
+    argv = [".", "-k", "sum", "--warmup", "--json", str(out)]
+    assert main(argv + ["--pytest-arg=--benchmark-max-time=0.05"]) == 0
+    report = json.loads(out.read_text())
+    assert len(report["benchmarks"]) == 3
+    assert report["runner"]["warmup"] is True
+    assert "3 benchmarks" in capsys.readouterr().out
+
+
+@linux
+def test_main_failure(bench_dir, capsys):
+    (bench_dir / "test_fail.py").write_text(
+        "def test_benchmark_fail(benchmark):\n    assert benchmark(int) == 1\n"
+    )
+    assert main([".", "--json", str(bench_dir / "report.json")]) == 1
+    assert "test_benchmark_fail" in capsys.readouterr().out
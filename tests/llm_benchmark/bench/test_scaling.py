@@ -0,0 +1,109 @@
+import json
+import math
+from typing import List
+
+import pytest
+
+from llm_benchmark.bench import scaling
+from llm_benchmark.bench.scaling import (
+    CASES,
+    COMPLEXITIES,
+    EXCLUDED,
+    Case,
+    exceeds,
+    fit,
+    main,
+    measure,
+    public_functions,
+)
+
+SIZES = [1 << k for k in range(6, 14)]
+
+
+def test_every_public_function_has_case() -> None:
+    public = set(public_functions())
+    assert set(EXCLUDED) <= public
+    assert public - set(EXCLUDED) == set(CASES)
+
+
+def _curve(complexity: str, noise: float = 0.0) -> List[float]:
+    """a + b * f(n) with the growth term reaching 10x a at the largest size,
+    times alternating +-noise"""
+    growth = COMPLEXITIES[complexity]
+    scale = 10 / max(growth(SIZES[-1]), 1)
+    return [
+        (1 + scale * growth(n)) * (1 + noise if i % 2 else 1 - noise)
+        for i, n in enumerate(SIZES)
+    ]
+
+
+@pytest.mark.parametrize("complexity", list(COMPLEXITIES))
+def test_fit(complexity: str) -> None:
+    result = fit(SIZES, _curve(complexity), tolerance=0.01)
+    assert result.complexity == complexity
+    assert result.errors[complexity] < 1e-6
+
+
+@pytest.mark.parametrize("complexity", ["1", "n", "n^2"])
+def test_fit_noisy(complexity: str) -> None:
+    assert fit(SIZES, _curve(complexity, 0.05)).complexity == complexity
+
+
+def test_fit_invalid() -> None:
+    with pytest.raises(ValueError):
+        fit([1], [1.0])
+
+
+@pytest.mark.parametrize(
+    "fitted, expected, ref",
+    [("n", "n", False), ("n^2", "n log n", True), ("1", "log n", False)],
+)
+def test_exceeds(fitted: str, expected: str, ref: bool) -> None:
+    assert exceeds(fitted, expected) is ref
+
+
+class _Clock:
+    """Replaces the time module of scaling; the clock only moves when told"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def quadratic(self, n: int) -> None:
+        self.now += n * n * 1e-9
+
+
+def test_measure_detects_regression(monkeypatch) -> None:
+    clock = _Clock()
+    monkeypatch.setattr(scaling, "time", clock)
+    entry = Case("quadratic", clock.quadratic, lambda n: (n,), "n", SIZES)
+    result = measure(entry)
+    assert result.times == pytest.approx([n * n * 1e-9 for n in SIZES])
+    assert result.fitted == "n^2"
+    assert not result.ok
+
+
+def test_main_json(tmp_path, capsys) -> None:
+    path = tmp_path / "scaling.json"
+    assert main(["SingleForLoop.max_list", "--json", str(path)]) == 0
+    assert "SingleForLoop.max_list" in capsys.readouterr().out
+    (result,) = json.loads(path.read_text())["results"]
+    assert result["name"] == "SingleForLoop.max_list"
+    assert len(result["sizes"]) == len(result["times"])
+    assert all(t > 0 and math.isfinite(t) for t in result["times"])
+
+
+def test_main_unknown() -> None:
+    with pytest.raises(ValueError):
+        main(["no_such_function"])
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_benchmark_scaling(benchmark, name: str) -> None:
+    benchmark.group = "scaling"
+    result = benchmark.pedantic(measure, (CASES[name],), rounds=1)
+    benchmark.extra_info["expected"] = result.expected
+    benchmark.extra_info["fitted"] = result.fitted
+    assert result.ok, f"{name} fitted {result.fitted}, expected {result.expected}"
@@ -0,0 +1,154 @@
+import copy
+import json
+from random import Random
+
+import pytest
+
+from llm_benchmark.bench.variants import (
+    OPERATIONS,
+    Operation,
+    check,
+    compare,
+    format_mismatches,
+    format_table,
+    main,
+    operation,
+    time_call,
+)
+
+
+def _broken_sort(v):
+    # Drops duplicates, so only some random inputs expose it
+    return sorted(set(v))
+
+
+BROKEN = Operation(
+    "broken",
+    {"sorted": sorted, "sorted_set": _broken_sort},
+    lambda rng, n: ([rng.randrange(n) for _ in range(n)],),
+    [4, 16],
+)
+
+
+@pytest.mark.parametrize("name", list(OPERATIONS))
+def test_variants_match_baseline(name: str) -> None:
+    op = OPERATIONS[name]
+    assert check(op, trials=5, sizes=op.sizes[:2]) == []
+
+
+def test_registered_operations() -> None:
+    assert {"is_prime", "sort_list", "count_pairs", "sum_modulus"} <= set(OPERATIONS)
+    assert OPERATIONS["is_prime"].baseline == "Primes.is_prime_ineff"
+    assert list(OPERATIONS["sort_list"].implementations) == [
+        "Sort.sort_list",
+        "DsList.sort_list",
+        "list.sort",
+    ]
+
+
+def test_check_detects_mismatch() -> None:
+    mismatches = check(BROKEN, trials=5)
+    assert mismatches
+    assert {m.variant for m in mismatches} == {"sorted_set"}
+    assert "baseline" in format_mismatches(mismatches[:1])
+
+
+def test_check_copies_inputs_of_fresh_operations() -> None:
+    seen = []
+
+    def clearing(v):
+        seen.append(list(v))
+        v.clear()
+        return 0
+
+    op = Operation(
+        "fresh", {"a": clearing, "b": clearing}, BROKEN.generate, [8], fresh=True
+    )
+    assert check(op, trials=2) == []
+    assert all(len(v) == 8 for v in seen)
+
+
+def test_operation_validation() -> None:
+    with pytest.raises(ValueError):
+        operation("single", BROKEN.generate, sorted, sizes=[4])
+    with pytest.raises(ValueError):
+        operation("duplicate", BROKEN.generate, sorted, sorted, sizes=[4])
+    assert "single" not in OPERATIONS and "duplicate" not in OPERATIONS
+
+
+def test_time_call_fresh() -> None:
+    args = ([3, 1, 2],)
+    assert time_call(list.sort, args, fresh=True, min_time=1e-4) > 0
+    assert args == ([3, 1, 2],)
+
+
+def test_compare() -> None:
+    op = Operation(
+        "sum",
+        {"loop": lambda v: sum(x for x in v), "builtin": sum},
+        lambda rng, n: ([rng.randrange(n) for _ in range(n)],),
+        [100, 1000],
+    )
+    timings = compare(op, repeat=1, min_time=1e-4)
+    assert [(t.n, t.implementation) for t in timings] == [
+        (100, "loop"),
+        (100, "builtin"),
+        (1000, "loop"),
+        (1000, "builtin"),
+    ]
+    assert timings[0].speedup == 1.0
+    assert timings[3].speedup > 1.0
+    table = format_table(timings).splitlines()
+    assert table[0].split() == ["operation", "n", "implementation", "time", "speedup"]
+    assert table[1].split()[:3] == ["sum", "100", "loop"]
+    assert table[1].endswith("1.0x")
+
+
+def test_main_json(tmp_path, capsys) -> None:
+    out = tmp_path / "variants.json"
+    assert (
+        main(["sum_modulus", "--trials", "2", "--repeat", "1", "--json", str(out)]) == 0
+    )
+    data = json.loads(out.read_text())
+    assert data["mismatches"] == []
+    assert {t["implementation"] for t in data["timings"]} == {
+        "sum_modulus[loop]",
+        "SingleForLoop.sum_modulus",
+    }
+    assert "SingleForLoop.sum_modulus" in capsys.readouterr().out
+
+
+def test_main_mismatch(monkeypatch, capsys) -> None:
+    monkeypatch.setitem(OPERATIONS, "broken", BROKEN)
+    assert main(["broken", "--trials", "5"]) == 1
+    assert "sorted_set at n=" in capsys.readouterr().out
+
+
+def test_main_unknown() -> None:
+    with pytest.raises(ValueError):
+        main(["nosuch"])
+
+
+def _cases():
+    # Every implementation at the middle size, grouped per operation so
+    # pytest-benchmark reports them side by side
+    for op in OPERATIONS.values():
+        n = op.sizes[len(op.sizes) // 2]
+        for label in op.implementations:
+            yield pytest.param(op.name, label, n, id=f"{op.name}-{label}-{n}")
+
+
+@pytest.mark.parametrize("name, label, n", list(_cases()))
+def test_benchmark_variant(benchmark, name: str, label: str, n: int) -> None:
+    op = OPERATIONS[name]
+    func = op.implementations[label]
+    args = op.generate(Random(0), n)
+    benchmark.group = f"variants: {name} n={n}"
+    benchmark.extra_info["baseline"] = label == op.baseline
+    if op.fresh:
+        result = benchmark.pedantic(
+            func, setup=lambda: (copy.deepcopy(args), {}), rounds=5
+        )
+    else:
+        result = benchmark(func, *args)
+    assert op.equal(result, op.implementations[op.baseline](*copy.deepcopy(args)))
@@ -0,0 +1,276 @@
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+from typing import Optional
+
+import pytest
+
+from llm_benchmark.bench.workload import (
+    MIX,
+    QUERIES,
+    Report,
+    Settings,
+    connect,
+    format_reports,
+    main,
+    percentiles,
+    plan,
+    run_workload,
+    set_journal_mode,
+    sweep,
+    to_json,
+)
+from llm_benchmark.sql.synth import scaled_db
+
+READ_ONLY = dict(MIX, insert_invoice=0.0)
+
+
+@pytest.fixture(scope="module")
+def source(tmp_path_factory) -> str:
+    return scaled_db(2, directory=str(tmp_path_factory.mktemp("chinook")))
+
+
+@pytest.fixture
+def db(source: str, tmp_path) -> str:
+    return str(shutil.copyfile(source, tmp_path / "workload.db"))
+
+
+def _count(db: str, table: str) -> int:
+    conn = sqlite3.connect(db)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+@pytest.mark.parametrize(
+    "latencies, expected",
+    [
+        ([], {}),
+        ([1.0], {"count": 1, "mean": 1.0, "max": 1.0, "p50": 1.0, "p99": 1.0}),
+        (
+            [float(i) for i in range(100, 0, -1)],
+            {"count": 100, "mean": 50.5, "max": 100.0, "p50": 50.0, "p99": 99.0},
+        ),
+        (
+            [4.0, 1.0, 3.0, 2.0],
+            {"count": 4, "mean": 2.5, "max": 4.0, "p50": 2.0, "p99": 4.0},
+        ),
+    ],
+)
+def test_percentiles(latencies, expected) -> None:
+    assert percentiles(latencies, (50, 99)) == expected
+
+
+def test_plan(db: str) -> None:
+    calls = plan(db, 2000)
+    assert calls == plan(db, 2000)
+    assert {name for name, _ in calls} == set(QUERIES)
+    share = sum(name == "query_album" for name, _ in calls) / len(calls)
+    assert abs(share - MIX["query_album"]) < 0.05
+    for name, args in calls:
+        if name == "insert_invoice":
+            customer_id, track_ids = args
+            assert customer_id >= 1 and 1 <= len(track_ids) <= 5
+        elif name != "query_album":
+            assert args == ()
+
+
+def test_plan_mix(db: str) -> None:
+    assert {name for name, _ in plan(db, 200, {"top_invoices": 1})} == {"top_invoices"}
+    assert "insert_invoice" not in {name for name, _ in plan(db, 500, READ_ONLY)}
+    with pytest.raises(ValueError):
+        plan(db, 10, {"nosuch": 1.0})
+    with pytest.raises(ValueError):
+        plan(db, 10, {"top_invoices": 0.0})
+
+
+def test_connect(db: str) -> None:
+    conn = connect(db, Settings(cache_size=-4096))
+    try:
+        assert conn.execute("PRAGMA cache_size").fetchone() == (-4096,)
+    finally:
+        conn.close()
+    with pytest.raises(ValueError):
+        connect(db, Settings("off"))
+
+
+@pytest.mark.parametrize("journal_mode", ["delete", "truncate", "persist", "wal"])
+def test_connect_journal_mode(db: str, journal_mode: str) -> None:
+    # Rollback modes are per connection, so set_journal_mode alone is not enough
+    set_journal_mode(db, journal_mode)
+    conn = connect(db, Settings(journal_mode))
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone() == (journal_mode,)
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize(
+    "journal_mode, journal_size",
+    [("delete", None), ("truncate", 0), ("persist", 512)],
+)
+def test_run_workload_rollback_mode(
+    db: str, journal_mode: str, journal_size: Optional[int]
+) -> None:
+    # Each mode leaves its own trace: delete removes the journal after every
+    # commit, truncate empties it, persist keeps it with a zeroed header
+    run_workload(db, 2, 20, {"insert_invoice": 1.0}, Settings(journal_mode))
+    path = db + "-journal"
+    if journal_size is None:
+        assert not os.path.exists(path)
+    elif journal_size == 0:
+        assert os.path.getsize(path) == 0
+    else:
+        assert os.path.getsize(path) >= journal_size
+
+
+def test_set_journal_mode(db: str) -> None:
+    assert set_journal_mode(db, "wal") == "wal"
+    conn = sqlite3.connect(db)
+    assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    conn.close()
+    assert set_journal_mode(db, "delete") == "delete"
+    with pytest.raises(ValueError):
+        set_journal_mode(db, "off")
+
+
+@pytest.mark.parametrize("journal_mode", ["delete", "wal"])
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_run_workload(db: str, journal_mode: str, concurrency: int) -> None:
+    invoices = _count(db, "Invoice")
+    report = run_workload(db, concurrency, 300, settings=Settings(journal_mode), seed=1)
+    assert report.concurrency == concurrency
+    assert report.completed == 300 and report.errors == {}
+    assert report.throughput > 0
+    assert set(report.latency) == set(QUERIES) | {"all"}
+    assert sum(report.latency[name]["count"] for name in QUERIES) == 300
+    assert report.latency["all"]["p50"] <= report.latency["all"]["p99"]
+    inserted = report.latency["insert_invoice"]["count"]
+    assert _count(db, "Invoice") == invoices + inserted
+
+
+def test_run_workload_inserts(db: str) -> None:
+    run_workload(db, 2, 50, {"insert_invoice": 1.0})
+    conn = sqlite3.connect(db)
+    try:
+        assert conn.execute(
+            "SELECT COUNT(*) FROM Invoice i WHERE ABS(i.Total - (SELECT "
+            "SUM(UnitPrice * Quantity) FROM InvoiceLine l "
+            "WHERE l.InvoiceId = i.InvoiceId)) > 0.001"
+        ).fetchone() == (0,)
+    finally:
+        conn.close()
+
+
+def test_run_workload_locked(db: str) -> None:
+    # Writers give up at once while another connection holds the write lock;
+    # readers are not blocked
+    blocker = sqlite3.connect(db)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        report = run_workload(db, 1, 20, {"insert_invoice": 1.0}, timeout=0.0)
+    finally:
+        blocker.rollback()
+        blocker.close()
+    assert report.completed == 0
+    assert report.errors == {"insert_invoice": 20}
+    assert report.latency == {"all": {}}
+
+
+def test_sweep(source: str) -> None:
+    before = _digest(source)
+    reports = sweep(source, (1, 2), ("delete", "wal"), (0, 1 << 20), operations=40)
+    assert [(r.settings, r.concurrency) for r in reports] == [
+        (Settings(mode, mmap, -2000), threads)
+        for mode in ("delete", "wal")
+        for mmap in (0, 1 << 20)
+        for threads in (1, 2)
+    ]
+    assert all(r.completed == 40 for r in reports)
+    assert _digest(source) == before
+
+
+def test_format_reports() -> None:
+    latency = {"all": {"p50": 0.001, "p90": 0.002, "p99": 0.0105}}
+    report = Report(
+        Settings("wal", 1 << 20, -2000), 4, 100, {"x": 2}, 0.5, 200.0, latency
+    )
+    lines = format_reports([report]).splitlines()
+    assert lines[0].split() == [
+        "journal",
+        "mmap",
+        "cache",
+        "threads",
+        "ops/s",
+        "errors",
+        "p50",
+        "ms",
+        "p90",
+        "ms",
+        "p99",
+        "ms",
+    ]
+    assert lines[1].split() == [
+        "wal",
+        "1048576",
+        "-2000",
+        "4",
+        "200.0",
+        "2",
+        "1.000",
+        "2.000",
+        "10.500",
+    ]
+    data = json.loads(to_json([report]))
+    assert data[0]["settings"] == {
+        "journal_mode": "wal",
+        "mmap_size": 1 << 20,
+        "cache_size": -2000,
+    }
+
+
+def test_main(source: str, tmp_path, capsys) -> None:
+    out = tmp_path / "workload.json"
+    argv = ["--db", source, "-c", "2", "-n", "30", "--journal-mode", "wal"]
+    assert main(argv + ["--mix", "insert_invoice=0", "--json", str(out)]) == 0
+    data = json.loads(out.read_text())
+    assert len(data) == 1
+    assert data[0]["concurrency"] == 2
+    assert "insert_invoice" not in data[0]["latency"]
+    assert capsys.readouterr().out.startswith("journal")
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [["--mix", "nosuch=1"], ["--mix", "query_album"], ["--mix", "query_album=-1"]],
+)
+def test_main_bad_mix(argv) -> None:
+    with pytest.raises(SystemExit) as e:
+        main(argv)
+    assert e.value.code == 2
+
+
+@pytest.mark.parametrize("journal_mode", ["delete", "wal"])
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_benchmark_workload(
+    benchmark, source: str, tmp_path, journal_mode: str, concurrency: int
+) -> None:
+    benchmark.group = "sql: workload"
+    benchmark.extra_info["journal_mode"] = journal_mode
+    benchmark.extra_info["concurrency"] = concurrency
+
+    def fresh_copy():
+        db = shutil.copyfile(source, tmp_path / "workload.db")
+        return (db, concurrency, 200), {"settings": Settings(journal_mode)}
+
+    report = benchmark.pedantic(run_workload, setup=fresh_copy, rounds=3)
+    benchmark.extra_info["p99"] = report.latency["all"]["p99"]
+    assert report.errors == {}
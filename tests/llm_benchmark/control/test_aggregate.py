@@ -0,0 +1,97 @@
+import os
+import statistics
+import tracemalloc
+from array import array
+from random import Random
+
+import pytest
+
+from llm_benchmark.control.aggregate import RunningStats
+from llm_benchmark.control.single import SingleForLoop
+from llm_benchmark.generator.stream import ChunkedDataset
+
+
+@pytest.mark.parametrize(
+    "chunks, values",
+    [
+        ([[1, 2, 3], [4, 5]], [1, 2, 3, 4, 5]),
+        ([[5], [], [-3, 8, 8]], [5, -3, 8, 8]),
+        ([array("q", [10, 20]), memoryview(array("q", [30]))], [10, 20, 30]),
+        (
+            [[0.5, 1.5], [2.25], (x / 3 for x in range(5))],
+            [0.5, 1.5, 2.25] + [x / 3 for x in range(5)],
+        ),
+    ],
+)
+def test_running_stats(chunks, values) -> None:
+    stats = RunningStats.from_chunks(chunks)
+    assert stats.count == len(values)
+    assert stats.total == sum(values)
+    assert stats.min == min(values)
+    assert stats.max == max(values)
+    assert stats.mean == pytest.approx(statistics.fmean(values))
+    assert stats.variance == pytest.approx(statistics.pvariance(values))
+    assert stats.sample_variance == pytest.approx(statistics.variance(values))
+
+    pushed = RunningStats()
+    for x in values:
+        pushed.push(x)
+    assert pushed.variance == pytest.approx(stats.variance)
+
+
+def test_merge_matches_single_pass() -> None:
+    rng = Random(1)
+    parts = [
+        [rng.randint(-1000, 1000) for _ in range(rng.randint(0, 50))] for _ in range(20)
+    ]
+    whole = RunningStats.from_chunks(parts)
+    merged = RunningStats()
+    for part in parts:
+        merged.merge(RunningStats().update(part))
+    assert merged.count == whole.count
+    assert merged.total == whole.total
+    assert merged.variance == pytest.approx(whole.variance)
+
+
+def test_empty_stream() -> None:
+    stats = RunningStats.from_chunks([[], []])
+    assert stats.count == 0 and stats.total == 0
+    for name in ("min", "max", "mean", "variance", "sample_variance"):
+        with pytest.raises(ValueError):
+            getattr(stats, name)
+    with pytest.raises(ValueError):
+        SingleForLoop.max_stream([[], []])
+
+
+def test_max_stream() -> None:
+    assert SingleForLoop.max_stream([[1, 5], [], [-2, 3]]) == 5
+    assert SingleForLoop.max_stream(iter([array("q", [-7])])) == -7
+
+
+def _peak(n: int) -> int:
+    dataset = ChunkedDataset(n, 1000, chunk_size=2_000)
+    dataset.chunk(0)  # warm up lazy imports outside the traced region
+    tracemalloc.start()
+    RunningStats.from_chunks(dataset)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def test_constant_memory() -> None:
+    assert _peak(200_000) < 2 * _peak(20_000)
+
+
+N = 10**8 if os.environ.get("LLM_BENCHMARK_LARGE") == "1" else 10**6
+
+
+def test_benchmark_running_stats(benchmark) -> None:
+    dataset = ChunkedDataset(N, 1000)
+    benchmark.extra_info["elements"] = N
+    benchmark.pedantic(RunningStats.from_chunks, (dataset,), rounds=3)
+
+
+def test_benchmark_max_stream(benchmark) -> None:
+    dataset = ChunkedDataset(N, 1000)
+    benchmark.extra_info["elements"] = N
+    benchmark.pedantic(SingleForLoop.max_stream, (dataset,), rounds=3)
@@ -1,7 +1,9 @@
+from array import array
 from typing import List
 
 import pytest
 
+from llm_benchmark import backend
 from llm_benchmark.control.double import DoubleForLoop
 
 
@@ -73,3 +75,57 @@ def test_sum_matrix(matrix: List[List[int]], S: int) -> None:
 
 def test_benchmark_sum_matrix(benchmark) -> None:
     benchmark(DoubleForLoop.sum_matrix, [[0, 1, 2], [3, 4, 5], [6, 7, 8]])
+
+
+BACKENDS = [
+    "python",
+    pytest.param(
+        "numpy",
+        marks=pytest.mark.skipif(
+            "numpy" not in backend.available_backends(), reason="numpy not installed"
+        ),
+    ),
+]
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize(
+    "ns",
+    [
+        [],
+        [-3, 0, 1, 2, 3, 10],
+        array("q", range(1_000)),
+        [10**6, 2 * 10**6, 10**7],
+        [2, 10**18],
+        [-(10**30), 5],
+        [10**30],
+    ],
+)
+def test_closed_form_many(name: str, ns: List[int]) -> None:
+    squares = DoubleForLoop.sum_square_many(ns, backend=name)
+    triangles = DoubleForLoop.sum_triangle_many(ns, backend=name)
+    assert list(squares) == [DoubleForLoop.sum_square(n) for n in ns]
+    assert list(triangles) == [DoubleForLoop.sum_triangle(n) for n in ns]
+    fits = all(DoubleForLoop.sum_square(n) * 6 < 2**63 for n in ns)
+    assert isinstance(squares, array) == fits
+
+
+BATCH = list(range(1_000_000))
+
+
+@pytest.mark.benchmark(group="sum_square_batch")
+def test_benchmark_sum_square_loop(benchmark) -> None:
+    benchmark.pedantic(lambda: [DoubleForLoop.sum_square(n) for n in BATCH], rounds=3)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.benchmark(group="sum_square_batch")
+def test_benchmark_sum_square_many(benchmark, name: str) -> None:
+    benchmark.pedantic(DoubleForLoop.sum_square_many, (BATCH, name), rounds=3)
+
+
+@pytest.mark.benchmark(group="sum_square_batch_bigint")
+def test_benchmark_sum_square_many_bigint(benchmark) -> None:
+    benchmark.pedantic(
+        DoubleForLoop.sum_square_many, ([10**12 + n for n in BATCH],), rounds=3
+    )
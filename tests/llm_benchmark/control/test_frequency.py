@@ -0,0 +1,77 @@
+from collections import Counter
+from random import Random
+from typing import List
+
+import pytest
+
+from llm_benchmark.control.double import DoubleForLoop
+from llm_benchmark.control.frequency import FrequencyTable, sliding_count_pairs
+
+
+@pytest.mark.parametrize(
+    "arr",
+    [[0], [1, 2, 3], [1, 1, 1], [1, 1, 2], [1, 1, 2, 2], []],
+)
+def test_pairs_match_count_pairs(arr: List[int]) -> None:
+    assert FrequencyTable(arr).pairs == DoubleForLoop.count_pairs(arr)
+
+
+def test_add_remove() -> None:
+    table = FrequencyTable([1, 1, 1, 2, 2, 3])
+    assert (table.exactly(1), table.exactly(2), table.exactly(3)) == (1, 1, 1)
+    table.remove(1)
+    assert table.count(1) == 2 and table.pairs == 2 and table.exactly(3) == 0
+    table.remove(3)
+    assert 3 not in table and table.distinct == 2 and len(table) == 4
+    with pytest.raises(KeyError):
+        table.remove(3)
+
+
+def test_exactly_random() -> None:
+    rng = Random(2)
+    table = FrequencyTable()
+    mirror: Counter = Counter()
+    for _ in range(2_000):
+        x = rng.randint(0, 20)
+        if mirror[x] and rng.random() < 0.4:
+            table.remove(x)
+            mirror[x] -= 1
+        else:
+            table.add(x)
+            mirror[x] += 1
+        k = rng.randint(1, 6)
+        assert table.exactly(k) == sum(1 for c in mirror.values() if c == k)
+
+
+@pytest.mark.parametrize("window", [1, 3, 10])
+def test_sliding_count_pairs(window: int) -> None:
+    rng = Random(window)
+    values = [rng.randint(0, 8) for _ in range(200)]
+    ref = [
+        DoubleForLoop.count_pairs(values[i : i + window])
+        for i in range(len(values) - window + 1)
+    ]
+    assert list(sliding_count_pairs(values, window)) == ref
+    assert list(sliding_count_pairs(values[: window - 1], window)) == []
+
+
+rng = Random(0)
+STREAM = [rng.randint(0, 500) for _ in range(5_000)]
+
+
+@pytest.mark.parametrize("window", [100, 1_000])
+def test_benchmark_sliding_count_pairs(benchmark, window: int) -> None:
+    benchmark.group = f"sliding_count_pairs_{window}"
+    benchmark(lambda: list(sliding_count_pairs(STREAM, window)))
+
+
+@pytest.mark.parametrize("window", [100, 1_000])
+def test_benchmark_recount_per_window(benchmark, window: int) -> None:
+    benchmark.group = f"sliding_count_pairs_{window}"
+    benchmark.pedantic(
+        lambda: [
+            DoubleForLoop.count_pairs(STREAM[i : i + window])
+            for i in range(len(STREAM) - window + 1)
+        ],
+        rounds=3,
+    )
@@ -0,0 +1,79 @@
+from array import array
+from random import Random
+
+import pytest
+
+from llm_benchmark.bench.runner import available_cpus
+from llm_benchmark.control.double import DoubleForLoop
+from llm_benchmark.control.reduction import MatrixReducer
+
+MATRIX = [[3, -1, 4], [1, 5, -9], [2, 6, 5], [3, 5, 8]]
+FLAT = array("q", [x for row in MATRIX for x in row])
+
+
+@pytest.mark.parametrize(
+    "op, ref",
+    [
+        ("sum", 32),
+        ("min", -9),
+        ("max", 8),
+        ("row_sums", [6, -3, 13, 16]),
+        ("col_sums", [9, 15, 8]),
+    ],
+)
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reduce(op: str, ref, workers: int) -> None:
+    reducer = MatrixReducer(workers, chunk_size=1)
+    assert reducer.reduce(MATRIX, op) == ref
+    assert reducer.reduce(FLAT, op, shape=(4, 3)) == ref
+
+
+def test_reduce_reuses_pool() -> None:
+    with MatrixReducer(2, chunk_size=3) as reducer:
+        assert reducer.reduce(MATRIX) == 32
+        assert reducer.reduce(FLAT, "max", shape=(4, 3)) == 8
+
+
+def test_reduce_empty() -> None:
+    reducer = MatrixReducer(1)
+    assert reducer.reduce([]) == 0
+    assert reducer.reduce([], "row_sums") == []
+    with pytest.raises(ValueError):
+        reducer.reduce([], "max")
+    with pytest.raises(ValueError):
+        reducer.reduce(MATRIX, "median")
+    with pytest.raises(ValueError):
+        reducer.reduce(FLAT, shape=(3, 3))
+
+
+def test_sum_matrix_workers() -> None:
+    assert DoubleForLoop.sum_matrix(MATRIX, workers=2) == 32
+
+
+ROWS, COLS = 2_000, 500
+# CPUs this process may use; under the runner, pinned shards see only one
+CORES = len(available_cpus())
+WORKERS = sorted({w for w in (1, 2, 4, 8, 16, 32) if w <= CORES} | {CORES})
+
+
+@pytest.fixture(scope="module")
+def flat_matrix() -> array:
+    rng = Random(0)
+    return array("q", [rng.randint(0, 100) for _ in range(ROWS * COLS)])
+
+
+@pytest.mark.multiprocess
+@pytest.mark.parametrize("workers", WORKERS)
+@pytest.mark.benchmark(group="reduction_scaling_list")
+def test_benchmark_reduce_list(benchmark, flat_matrix: array, workers: int) -> None:
+    matrix = [flat_matrix[i : i + COLS].tolist() for i in range(0, ROWS * COLS, COLS)]
+    with MatrixReducer(workers) as reducer:
+        benchmark(reducer.reduce, matrix)
+
+
+@pytest.mark.multiprocess
+@pytest.mark.parametrize("workers", WORKERS)
+@pytest.mark.benchmark(group="reduction_scaling_shared")
+def test_benchmark_reduce_shared(benchmark, flat_matrix: array, workers: int) -> None:
+    with MatrixReducer(workers) as reducer:
+        benchmark(reducer.reduce, flat_matrix, shape=(ROWS, COLS))
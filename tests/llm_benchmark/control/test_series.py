@@ -0,0 +1,79 @@
+from random import Random
+from typing import List
+
+import pytest
+
+from llm_benchmark.control.series import (
+    sum_multiples,
+    sum_multiples_any,
+    sum_multiples_many,
+)
+from llm_benchmark.control.single import SingleForLoop
+
+
+def _brute(n: int, divisors: List[int]) -> int:
+    return sum(i for i in range(n) if any(i % d == 0 for d in divisors))
+
+
+@pytest.mark.parametrize("n", [-5, 0, 1, 2, 10, 11, 100])
+@pytest.mark.parametrize("m", [1, 2, 3, 7, -3, 100, 101])
+def test_sum_multiples(n: int, m: int) -> None:
+    assert sum_multiples(n, m) == _brute(n, [m])
+    assert SingleForLoop.sum_modulus(n, m) == _brute(n, [m])
+
+
+def test_sum_multiples_big() -> None:
+    n = 10**18
+    k = (n - 1) // 7
+    assert sum_multiples(n, 7) == 7 * (k * (k + 1) // 2)
+    assert sum_multiples(n, 1) == n * (n - 1) // 2
+    with pytest.raises(ZeroDivisionError):
+        SingleForLoop.sum_modulus(10, 0)
+
+
+@pytest.mark.parametrize(
+    "n, divisors",
+    [
+        (1000, [3, 5]),
+        (1000, [3, 5, 15, 6]),
+        (1000, [2, 3, 5, 7, 11, 13]),
+        (50, [1, 4]),
+        (50, [60, 70]),
+        (50, []),
+        (0, [2]),
+    ],
+)
+def test_sum_multiples_any(n: int, divisors: List[int]) -> None:
+    assert sum_multiples_any(n, divisors) == _brute(n, divisors)
+
+
+def test_sum_multiples_any_random() -> None:
+    rng = Random(0)
+    for _ in range(50):
+        n = rng.randint(1, 2_000)
+        divisors = [rng.randint(1, 60) for _ in range(rng.randint(1, 8))]
+        assert sum_multiples_any(n, divisors) == _brute(n, divisors)
+    with pytest.raises(ZeroDivisionError):
+        sum_multiples_any(10, [2, 0])
+
+
+def test_sum_multiples_many() -> None:
+    queries = [(10, 2), (10, 3), (0, 5), (10**18, 10**9)]
+    assert sum_multiples_many(queries) == [sum_multiples(n, m) for n, m in queries]
+
+
+@pytest.mark.parametrize("n", [10**2, 10**6, 10**12, 10**18])
+@pytest.mark.benchmark(group="sum_modulus_scaling")
+def test_benchmark_sum_modulus(benchmark, n: int) -> None:
+    benchmark(SingleForLoop.sum_modulus, n, 7)
+
+
+@pytest.mark.parametrize("n", [10**6, 10**18])
+@pytest.mark.benchmark(group="sum_multiples_any_scaling")
+def test_benchmark_sum_multiples_any(benchmark, n: int) -> None:
+    benchmark(sum_multiples_any, n, [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+
+
+def test_benchmark_sum_multiples_many(benchmark) -> None:
+    queries = [(n, n % 97 + 1) for n in range(10**12, 10**12 + 10_000)]
+    benchmark(sum_multiples_many, queries)
@@ -0,0 +1,32 @@
+from random import Random
+from typing import List
+
+import pytest
+
+from llm_benchmark.bench.memory import KiB
+from llm_benchmark.datastructures.bst import Tree
+
+TREE_INPUT = Random(0).sample(range(10_000), 1_000)
+
+
+@pytest.mark.parametrize(
+    "values, size, height",
+    [
+        ([], 0, -1),
+        ([5], 1, 0),
+        ([2, 1, 3], 3, 1),
+        ([1, 2, 3, 4], 4, 3),
+        ([3, 1, 3, 1], 2, 1),
+    ],
+)
+def test_tree(values: List[int], size: int, height: int) -> None:
+    tree = Tree(values)
+    assert tree.size == size
+    assert tree.height == height
+    assert tree._is_valid_bst()
+
+
+# Two blocks (object and attribute dict) per Node
+@pytest.mark.memory_budget(retained=128 * KiB, retained_blocks=2 * len(TREE_INPUT) + 64)
+def test_benchmark_tree(benchmark) -> None:
+    benchmark.pedantic(Tree, (TREE_INPUT,), rounds=3)
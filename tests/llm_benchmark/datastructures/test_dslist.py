@@ -2,6 +2,7 @@ from typing import List
 
 import pytest
 
+from llm_benchmark.bench.memory import KiB
 from llm_benchmark.datastructures.dslist import DsList
 
 
@@ -85,3 +86,36 @@ def test_rotate_list(v: List[int], n: int, ref: List[int]) -> None:
 
 def test_benchmark_rotate_list(benchmark) -> None:
     benchmark(DsList.rotate_list, [1, 2, 3, 4, 5], 2)
+
+
+COPY_INPUT = list(range(10_000))
+
+
+# Each copying function should allocate one output list, not more
+@pytest.mark.parametrize(
+    "fn, args",
+    [
+        pytest.param(
+            DsList.sort_list, (COPY_INPUT,), marks=pytest.mark.memory_budget(96 * KiB)
+        ),
+        pytest.param(
+            DsList.reverse_list,
+            (COPY_INPUT,),
+            marks=pytest.mark.memory_budget(96 * KiB),
+        ),
+        pytest.param(
+            DsList.rotate_list,
+            (COPY_INPUT, 3),
+            marks=pytest.mark.memory_budget(96 * KiB),
+        ),
+        pytest.param(
+            DsList.merge_lists,
+            (COPY_INPUT, COPY_INPUT),
+            marks=pytest.mark.memory_budget(192 * KiB),
+        ),
+    ],
+    ids=["sort_list", "reverse_list", "rotate_list", "merge_lists"],
+)
+def test_benchmark_copy_memory(benchmark, fn, args) -> None:
+    benchmark.group = "dslist_copy"
+    benchmark(fn, *args)
@@ -0,0 +1,83 @@
+from random import Random
+from typing import List
+
+import pytest
+
+from llm_benchmark.datastructures.dslist import DsList
+from llm_benchmark.datastructures.list_index import ListIndex
+
+
+@pytest.mark.parametrize(
+    "v, search_value, ref",
+    [
+        ([1, 2, 3, 4, 5], 1, [0]),
+        ([1, 2, 3, 4, 5], 2, [1]),
+        ([1, 2, 3, 4, 5], 9, []),
+        ([3, 1, 3, 3, 2], 3, [0, 2, 3]),
+        ([], 0, []),
+    ],
+)
+def test_search(v: List[int], search_value: int, ref: List[int]) -> None:
+    index = ListIndex(v)
+    assert index.search(search_value) == ref
+    assert index.search(search_value) == DsList.search_list(v, search_value)
+    assert index.count(search_value) == len(ref)
+
+
+def test_search_many() -> None:
+    v = [5, 1, 5, 2, 1]
+    assert ListIndex(v).search_many([1, 5, 7]) == [[1, 4], [0, 2], []]
+
+
+def test_incremental_updates() -> None:
+    v = [1, 2, 1]
+    index = ListIndex(v)
+    index.append(2)
+    index.extend([1, 3])
+    assert v == [1, 2, 1, 2, 1, 3]
+    assert index.search(1) == [0, 2, 4]
+    assert len(index) == 6
+
+    v.extend([3, 3])
+    assert index.refresh() == 2
+    assert index.refresh() == 0
+    assert index.search(3) == [5, 6, 7]
+    assert len(index) == 8
+
+
+SIZE = 10_000
+rng = Random(0)
+VALUES = [rng.randint(0, 100) for _ in range(SIZE)]
+
+
+def test_benchmark_build_index(benchmark) -> None:
+    benchmark(ListIndex, VALUES)
+
+
+def test_benchmark_search_index(benchmark) -> None:
+    benchmark(ListIndex(VALUES).search, 50)
+
+
+def _scan_queries(v: List[int], queries: int) -> None:
+    for q in range(queries):
+        DsList.search_list(v, q)
+
+
+def _index_queries(v: List[int], queries: int) -> None:
+    index = ListIndex(v)
+    for q in range(queries):
+        index.search(q)
+
+
+# Building the index costs about three scans of VALUES, so it pays off from
+# the third query on
+@pytest.mark.parametrize("queries", [1, 2, 4, 16])
+@pytest.mark.benchmark(group="list_index_break_even")
+def test_benchmark_scan_queries(benchmark, queries: int) -> None:
+    benchmark(_scan_queries, VALUES, queries)
+
+
+@pytest.mark.parametrize("queries", [1, 2, 4, 16])
+@pytest.mark.benchmark(group="list_index_break_even")
+def test_benchmark_index_queries(benchmark, queries: int) -> None:
+    benchmark(_index_queries, VALUES, queries)
@@ -0,0 +1,79 @@
+import os
+import sys
+from typing import List
+
+import pytest
+
+from llm_benchmark.control.double import DoubleForLoop
+from llm_benchmark.control.reduction import MatrixReducer
+from llm_benchmark.datastructures.matrix import Matrix
+from llm_benchmark.generator.gen_list import GenList
+
+
+@pytest.mark.parametrize(
+    "m",
+    [
+        [[0]],
+        [[0, 1], [2, 3]],
+        [[0, 1, 2], [3, 4, 5]],
+        [],
+    ],
+)
+def test_round_trip(m: List[List[int]]) -> None:
+    matrix = Matrix.from_lists(m)
+    assert matrix.tolist() == m
+    assert [list(row) for row in matrix] == m
+    assert DoubleForLoop.sum_matrix(matrix) == DoubleForLoop.sum_matrix(m)
+
+
+def test_views_share_buffer() -> None:
+    matrix = Matrix.from_lists([[0, 1, 2], [3, 4, 5]])
+    assert matrix.shape == (2, 3)
+    assert matrix.strides == (3, 1)
+    assert matrix.row(1).tolist() == [3, 4, 5]
+    assert matrix.col(-1).tolist() == [2, 5]
+    row, col = matrix.row(0), matrix.col(1)
+    matrix[0, 1] = 9
+    assert row[1] == 9 and col[0] == 9
+    assert matrix[0, 1] == 9
+    with pytest.raises(IndexError):
+        matrix.row(2)
+    with pytest.raises(ValueError):
+        Matrix.from_lists([[1, 2], [3]])
+
+
+def test_random_compact_matrix() -> None:
+    matrix = GenList.random_compact_matrix(10, 5)
+    assert matrix.shape == (10, 10)
+    assert all(0 <= x <= 5 for x in matrix.buffer)
+    assert MatrixReducer(1).reduce(matrix) == matrix.sum()
+
+
+def _list_nbytes(m: List[List[int]]) -> int:
+    return sys.getsizeof(m) + sum(
+        sys.getsizeof(row) + sum(sys.getsizeof(x) for x in row) for row in m
+    )
+
+
+LARGE = os.environ.get("LLM_BENCHMARK_LARGE") == "1"
+SIZES = [100, 1_000] + ([10_000] if LARGE else [])
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_memory(n: int) -> None:
+    matrix = GenList.random_compact_matrix(n, 1_000)
+    assert matrix.nbytes == 8 * n * n
+    # Nested lists need a pointer and a boxed int per cell on top of that
+    assert matrix.nbytes * 3 < _list_nbytes(matrix.tolist())
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_benchmark_sum_compact_matrix(benchmark, n: int) -> None:
+    benchmark.group = f"sum_matrix_{n}"
+    benchmark(DoubleForLoop.sum_matrix, GenList.random_compact_matrix(n, 1_000))
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_benchmark_sum_list_matrix(benchmark, n: int) -> None:
+    benchmark.group = f"sum_matrix_{n}"
+    benchmark(DoubleForLoop.sum_matrix, GenList.random_matrix(n, 1_000))
@@ -0,0 +1,85 @@
+from collections import Counter
+
+import pytest
+
+from llm_benchmark import backend
+from llm_benchmark.generator.gen_list import GenList
+
+BACKENDS = [
+    "python",
+    pytest.param(
+        "numpy",
+        marks=pytest.mark.skipif(
+            "numpy" not in backend.available_backends(), reason="numpy not installed"
+        ),
+    ),
+]
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("m", [0, 1, 2, 255, 256, 1_000, 2**40, 2**63 - 1])
+def test_fast_random_list_range(name: str, m: int) -> None:
+    values = GenList.fast_random_list(5_000, m, seed=1, backend=name)
+    assert values.typecode == "q"
+    assert len(values) == 5_000
+    assert min(values) >= 0 and max(values) <= m
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_fast_random_list_seed(name: str) -> None:
+    a = GenList.fast_random_list(1_000, 100, seed=7, backend=name)
+    b = GenList.fast_random_list(1_000, 100, seed=7, backend=name)
+    c = GenList.fast_random_list(1_000, 100, seed=8, backend=name)
+    assert a == b
+    assert a != c
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("m", [2, 9, 999])
+def test_fast_random_list_uniform(name: str, m: int) -> None:
+    n = 30_000
+    counts = Counter(GenList.fast_random_list(n, m, seed=3, backend=name))
+    expected = n / (m + 1)
+    chi2 = sum((counts[k] - expected) ** 2 / expected for k in range(m + 1))
+    # Mean of the chi-square statistic is m, its standard deviation sqrt(2m)
+    assert chi2 < m + 5 * (2 * m) ** 0.5
+
+
+@pytest.mark.parametrize("default", BACKENDS)
+@pytest.mark.parametrize("n", [10, 5_000])
+def test_fast_random_list_seed_ignores_backend(default: str, n: int) -> None:
+    # Seeded calls give the same values whatever the global backend and n
+    expected = GenList.fast_random_list(n, 100, seed=7, backend="python")
+    with backend.use_backend(default):
+        assert GenList.fast_random_list(n, 100, seed=7) == expected
+
+
+def test_fast_random_list_invalid() -> None:
+    with pytest.raises(ValueError):
+        GenList.fast_random_list(10, -1)
+    with pytest.raises(ValueError):
+        GenList.fast_random_list(10, 2**63)
+
+
+def test_random_compact_matrix_seed() -> None:
+    a = GenList.random_compact_matrix(20, 10, seed=5)
+    assert a == GenList.random_compact_matrix(20, 10, seed=5)
+    assert a.shape == (20, 20)
+
+
+N = 100_000
+
+
+@pytest.mark.parametrize("m", [100, 10**6])
+def test_benchmark_random_list(benchmark, m: int) -> None:
+    benchmark.group = f"random_list_{m}"
+    benchmark.extra_info["elements"] = N
+    benchmark(GenList.random_list, N, m)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("m", [100, 10**6])
+def test_benchmark_fast_random_list(benchmark, name: str, m: int) -> None:
+    benchmark.group = f"random_list_{m}"
+    benchmark.extra_info["elements"] = N
+    benchmark(GenList.fast_random_list, N, m, backend=name)
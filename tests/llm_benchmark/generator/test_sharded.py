@@ -0,0 +1,45 @@
+import pytest
+
+from llm_benchmark import backend
+from llm_benchmark.bench.runner import available_cpus
+from llm_benchmark.generator.sharded import ShardedGenerator
+from llm_benchmark.generator.stream import ChunkedDataset
+
+
+@pytest.mark.parametrize("n", [0, 1, 999, 1_000, 2_345])
+def test_deterministic_across_workers(n: int) -> None:
+    ref = ShardedGenerator(1, shard_size=250).random_list(n, 77, seed=9)
+    assert len(ref) == n
+    for workers in (2, 3):
+        assert ShardedGenerator(workers, shard_size=250).random_list(n, 77, 9) == ref
+    dataset = ChunkedDataset(n, 77, chunk_size=250, seed=9, backend="python")
+    assert ShardedGenerator(2, 250, "python").random_list(n, 77, 9).tolist() == list(
+        dataset.values()
+    )
+    assert ShardedGenerator(2, 250).random_list(n, 77, 9) == ref
+
+
+@pytest.mark.parametrize("default", backend.available_backends())
+def test_default_backend(default: str) -> None:
+    with backend.use_backend(default):
+        assert ShardedGenerator(1, shard_size=1_000).backend == "python"
+        assert ChunkedDataset(10, 5, chunk_size=1_000).backend == "python"
+
+
+def test_random_matrix() -> None:
+    matrix = ShardedGenerator(2, shard_size=7).random_matrix(10, 5, seed=1)
+    assert matrix.shape == (10, 10)
+    assert matrix == ShardedGenerator(1, shard_size=7).random_matrix(10, 5, seed=1)
+
+
+N = 2_000_000
+# CPUs this process may use; under the runner, pinned shards see only one
+CORES = len(available_cpus())
+WORKERS = sorted({w for w in (1, 2, 4, 8, 16, 32) if w <= CORES} | {CORES})
+
+
+@pytest.mark.multiprocess
+@pytest.mark.parametrize("workers", WORKERS)
+@pytest.mark.benchmark(group="sharded_generation")
+def test_benchmark_sharded_random_list(benchmark, workers: int) -> None:
+    benchmark(ShardedGenerator(workers).random_list, N, 1_000)
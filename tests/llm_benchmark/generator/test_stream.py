@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from llm_benchmark.generator.gen_list import GenList
+from llm_benchmark.generator.stream import ChunkedDataset, chunk_seed
+
+
+def test_chunks_are_independent() -> None:
+    dataset = ChunkedDataset(1_000, 50, chunk_size=128, seed=4)
+    chunks = list(dataset)
+    assert dataset.num_chunks == 8
+    assert [len(c) for c in chunks] == [128] * 7 + [104]
+    assert dataset.chunk(5) == chunks[5]
+    assert list(dataset.values()) == [x for c in chunks for x in c]
+    assert ChunkedDataset(1_000, 50, chunk_size=128, seed=5).chunk(0) != chunks[0]
+    with pytest.raises(IndexError):
+        dataset.chunk(8)
+
+
+def test_chunk_seed() -> None:
+    assert chunk_seed(1, 2) == chunk_seed(1, 2)
+    assert len({chunk_seed(s, i) for s in range(10) for i in range(10)}) == 100
+
+
+def test_iter_random_matrix() -> None:
+    rows = list(GenList.iter_random_matrix(6, 9, seed=1))
+    assert len(rows) == 6
+    assert all(len(row) == 6 and max(row) <= 9 for row in rows)
+    assert rows == list(GenList.iter_random_matrix(6, 9, seed=1))
+
+
+def test_cache(tmp_path) -> None:
+    path = str(tmp_path / "data.bin")
+    dataset = ChunkedDataset(1_000, 50, chunk_size=300, seed=2)
+    with dataset.cache(path) as mapped:
+        assert len(mapped) == 1_000
+        assert mapped.num_chunks == 4
+        assert mapped.chunk(2).tolist() == dataset.chunk(2).tolist()
+    mtime = os.stat(path).st_mtime_ns
+    with dataset.cache(path) as mapped:
+        assert mapped.data.tolist() == list(dataset.values())
+    assert os.stat(path).st_mtime_ns == mtime
+
+    other = ChunkedDataset(500, 50, chunk_size=300, seed=2)
+    with other.cache(path) as mapped:
+        assert mapped.data.tolist() == list(other.values())
+
+
+@pytest.mark.parametrize("seed", [2**63 - 1, -(2**63)])
+def test_cache_large_seed(tmp_path, seed: int) -> None:
+    dataset = ChunkedDataset(10, 100, chunk_size=4, seed=seed)
+    with dataset.cache(str(tmp_path / "data.bin")) as mapped:
+        assert mapped.data.tolist() == list(dataset.values())
+
+
+@pytest.mark.parametrize("seed", [2**63, -(2**63) - 1])
+def test_seed_out_of_range(seed: int) -> None:
+    with pytest.raises(ValueError):
+        ChunkedDataset(10, 100, chunk_size=4, seed=seed)
+
+
+N = 1_000_000
+
+
+def test_benchmark_stream_list(benchmark) -> None:
+    benchmark(lambda: sum(sum(c) for c in GenList.iter_random_list(N, 100)))
+
+
+def test_benchmark_cached_list(benchmark, tmp_path) -> None:
+    path = str(tmp_path / "data.bin")
+    ChunkedDataset(N, 100).cache(path).close()
+
+    def read() -> int:
+        with ChunkedDataset(N, 100).cache(path) as mapped:
+            return sum(mapped.data)
+
+    benchmark(read)
@@ -1,6 +1,12 @@
+import sqlite3
+
 import pytest
 
-from llm_benchmark.sql.query import SqlQuery
+from llm_benchmark.bench.memory import MiB
+from llm_benchmark.sql.query import DB_PATH, SqlQuery
+from llm_benchmark.sql.synth import scaled_db
+
+SCALE = 10
 
 
 @pytest.mark.parametrize(
@@ -26,6 +32,8 @@ def test_join_albums() -> None:
     )
 
 
+# fetchall() materializes every joined row
+@pytest.mark.memory_budget(peak=2 * MiB, retained=2 * MiB)
 def test_benchmark_join_albums(benchmark) -> None:
     benchmark(SqlQuery.join_albums)
 
@@ -39,3 +47,43 @@ def test_top_invoices() -> None:
 
 def test_benchmark_top_invoices(benchmark) -> None:
     benchmark(SqlQuery.top_invoices)
+
+
+@pytest.fixture(scope="module")
+def scaled(tmp_path_factory) -> str:
+    return scaled_db(SCALE, directory=str(tmp_path_factory.mktemp("chinook")))
+
+
+def test_query_connection() -> None:
+    # An open connection is reused and stays open
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        assert SqlQuery.query_album("Presence", conn)
+        assert len(SqlQuery.join_albums(conn)) == 3503
+        assert SqlQuery.top_invoices(db=conn)[0][2] == 25.86
+        assert conn.execute("SELECT COUNT(*) FROM Album").fetchone() == (347,)
+    finally:
+        conn.close()
+
+
+def test_query_scaled(scaled: str) -> None:
+    assert SqlQuery.query_album("Presence #2", scaled)
+    assert not SqlQuery.query_album(f"Presence #{SCALE}", scaled)
+    assert len(SqlQuery.join_albums(scaled)) == SCALE * 3503
+    assert len(SqlQuery.top_invoices(scaled)) == 10
+
+
+@pytest.mark.parametrize("scale", [1, SCALE])
+@pytest.mark.parametrize("query", ["query_album", "join_albums", "top_invoices"])
+def test_benchmark_query_scaled(
+    benchmark, tmp_path_factory, query: str, scale: int
+) -> None:
+    benchmark.group = f"sql: {query} by scale"
+    benchmark.extra_info["scale"] = scale
+    db = scaled_db(scale, directory=str(tmp_path_factory.getbasetemp() / "chinook"))
+    conn = sqlite3.connect(db)
+    try:
+        args = ("Presence",) if query == "query_album" else ()
+        benchmark(getattr(SqlQuery, query), *args, db=conn)
+    finally:
+        conn.close()
@@ -0,0 +1,145 @@
+import os
+import sqlite3
+
+import pytest
+
+from llm_benchmark.sql.query import DB_PATH
+from llm_benchmark.sql.synth import FORMAT, generate, scaled_db, schema
+
+SCALE = 3
+
+
+def _rows(db: str, sql: str) -> list:
+    conn = sqlite3.connect(db)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def _count(db: str, table: str) -> int:
+    return _rows(db, f"SELECT COUNT(*) FROM {table}")[0][0]
+
+
+@pytest.fixture(scope="module")
+def scaled(tmp_path_factory) -> str:
+    return generate(str(tmp_path_factory.mktemp("synth") / "chinook.db"), SCALE)
+
+
+def test_schema() -> None:
+    tables, indexes = schema()
+    assert len(tables) == 11
+    assert tables[0].startswith("CREATE TABLE [Album]")
+    assert len(indexes) == 10
+    assert all(ddl.startswith("CREATE INDEX") for ddl in indexes)
+
+
+def test_generate_schema(scaled: str) -> None:
+    assert _rows(scaled, "SELECT type, name, sql FROM sqlite_master") == _rows(
+        DB_PATH, "SELECT type, name, sql FROM sqlite_master"
+    )
+    assert _rows(scaled, "PRAGMA user_version") == [(FORMAT,)]
+
+
+@pytest.mark.parametrize(
+    "table, factor",
+    [
+        ("Artist", SCALE),
+        ("Album", SCALE),
+        ("Track", SCALE),
+        ("Customer", SCALE),
+        ("Invoice", SCALE),
+        ("Employee", 1),
+        ("Genre", 1),
+        ("MediaType", 1),
+        ("Playlist", 1),
+        ("PlaylistTrack", 1),
+    ],
+)
+def test_generate_counts(scaled: str, table: str, factor: int) -> None:
+    assert _count(scaled, table) == factor * _count(DB_PATH, table)
+
+
+def test_generate_first_copy_is_stock(scaled: str) -> None:
+    for table, key in [("Album", "AlbumId"), ("Track", "TrackId")]:
+        sql = f"SELECT * FROM {table} ORDER BY {key}"
+        stock = _rows(DB_PATH, sql)
+        assert _rows(scaled, sql)[: len(stock)] == stock
+
+
+def test_generate_copies_keep_distribution(scaled: str) -> None:
+    stock = _rows(DB_PATH, "SELECT COUNT(*) FROM Track GROUP BY AlbumId ORDER BY 1")
+    copies = _rows(scaled, "SELECT COUNT(*) FROM Track GROUP BY AlbumId ORDER BY 1")
+    assert sorted(stock * SCALE) == copies
+    assert _rows(scaled, "SELECT Title FROM Album WHERE AlbumId = 348") == [
+        ("For Those About To Rock We Salute You #1",)
+    ]
+    assert _rows(scaled, "SELECT COUNT(DISTINCT Email) FROM Customer") == [
+        (SCALE * _count(DB_PATH, "Customer"),)
+    ]
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT COUNT(*) FROM Album a LEFT JOIN Artist r USING (ArtistId) "
+        "WHERE r.ArtistId IS NULL",
+        "SELECT COUNT(*) FROM Track t LEFT JOIN Album a USING (AlbumId) "
+        "WHERE t.AlbumId IS NOT NULL AND a.AlbumId IS NULL",
+        "SELECT COUNT(*) FROM Invoice i LEFT JOIN Customer c USING (CustomerId) "
+        "WHERE c.CustomerId IS NULL",
+        "SELECT COUNT(*) FROM InvoiceLine l LEFT JOIN Track t USING (TrackId) "
+        "WHERE t.TrackId IS NULL",
+        "SELECT COUNT(*) FROM Invoice i WHERE ABS(i.Total - (SELECT SUM(UnitPrice) "
+        "FROM InvoiceLine l WHERE l.InvoiceId = i.InvoiceId)) > 0.001",
+    ],
+)
+def test_generate_consistent(scaled: str, sql: str) -> None:
+    assert _rows(scaled, sql) == [(0,)]
+
+
+def test_generate_skewed_invoices(scaled: str) -> None:
+    # The most popular customer buys far more than a uniform share
+    invoices = _count(scaled, "Invoice")
+    customers = _count(scaled, "Customer")
+    top = _rows(
+        scaled,
+        "SELECT COUNT(*) n FROM Invoice GROUP BY CustomerId ORDER BY n DESC LIMIT 1",
+    )[0][0]
+    assert top > 5 * invoices / customers
+
+
+def test_generate_deterministic(tmp_path) -> None:
+    a = generate(str(tmp_path / "a.db"), 1, seed=1)
+    b = generate(str(tmp_path / "b.db"), 1, seed=1)
+    c = generate(str(tmp_path / "c.db"), 1, seed=2)
+    sql = "SELECT * FROM InvoiceLine"
+    assert _rows(a, sql) == _rows(b, sql) != _rows(c, sql)
+
+
+def test_generate_invalid(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        generate(str(tmp_path / "x.db"), 0)
+    assert not os.listdir(tmp_path)
+
+
+def test_scaled_db(tmp_path) -> None:
+    path = scaled_db(2, directory=str(tmp_path))
+    assert os.path.basename(path) == "chinook-x2-seed0.db"
+    mtime = os.path.getmtime(path)
+    assert scaled_db(2, directory=str(tmp_path)) == path
+    assert os.path.getmtime(path) == mtime
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA user_version = 0")
+    conn.close()
+    assert scaled_db(2, directory=str(tmp_path)) == path
+    assert _rows(path, "PRAGMA user_version") == [(FORMAT,)]
+
+
+@pytest.mark.parametrize("scale", [1, 10])
+def test_benchmark_generate(benchmark, tmp_path, scale: int) -> None:
+    benchmark.group = "synth: generate"
+    path = str(tmp_path / "chinook.db")
+    benchmark.pedantic(generate, args=(path, scale), rounds=3)
+    assert _count(path, "Track") == scale * _count(DB_PATH, "Track")
@@ -0,0 +1,91 @@
+from random import Random
+
+import pytest
+
+from llm_benchmark.strings.palindrome import PalindromeIndex, is_palindrome
+from llm_benchmark.strings.strops import StrOps
+
+
+def _brute_count(s: str) -> int:
+    return sum(
+        1
+        for i in range(len(s))
+        for j in range(i + 1, len(s) + 1)
+        if s[i:j] == s[i:j][::-1]
+    )
+
+
+def _brute_longest(s: str) -> str:
+    best = ""
+    for i in range(len(s)):
+        for j in range(i + 1, len(s) + 1):
+            if j - i > len(best) and s[i:j] == s[i:j][::-1]:
+                best = s[i:j]
+    return best
+
+
+@pytest.mark.parametrize(
+    "s", ["", "a", "ab", "aa", "racecar", "abba", "abacdfgdcaba", "forgeeksskeegfor"]
+)
+def test_palindrome_index(s: str) -> None:
+    index = PalindromeIndex(s)
+    assert index.is_palindrome() == StrOps.palindrome(s) == is_palindrome(s)
+    assert index.longest() == _brute_longest(s)
+    assert index.count() == _brute_count(s)
+
+
+def test_palindrome_index_random() -> None:
+    rng = Random(0)
+    for _ in range(100):
+        s = "".join(rng.choice("ab") for _ in range(rng.randint(0, 30)))
+        index = PalindromeIndex(s)
+        assert index.is_palindrome() == (s == s[::-1])
+        assert len(index.longest()) == len(_brute_longest(s))
+        assert index.count() == _brute_count(s)
+
+
+@pytest.mark.parametrize(
+    "s, expected",
+    [
+        ("A man, a plan, a canal: Panama", True),
+        ("No 'x' in Nixon", True),
+        ("race a car", False),
+        ("!!", True),
+        # "ß" folds to "ss"
+        ("sß", True),
+        ("ßs s", True),
+        ("Straße essartS", True),
+        ("ßa", False),
+        ("STRASSE essarts", True),
+    ],
+)
+def test_normalized(s: str, expected: bool) -> None:
+    assert is_palindrome(s, normalize=True) == expected
+    assert PalindromeIndex(s, normalize=True).is_palindrome() == expected
+
+
+def test_normalized_longest() -> None:
+    s = "xyz Was it a car, or a cat I saw? q"
+    assert (
+        PalindromeIndex(s, normalize=True).longest() == "Was it a car, or a cat I saw"
+    )
+
+
+rng = Random(1)
+TEXT = "".join(rng.choice("abc") for _ in range(100_000))
+PALINDROME = TEXT + TEXT[::-1]
+
+
+def test_benchmark_strops_palindrome(benchmark) -> None:
+    benchmark.group = "palindrome_check"
+    benchmark(StrOps.palindrome, PALINDROME)
+
+
+def test_benchmark_is_palindrome(benchmark) -> None:
+    benchmark.group = "palindrome_check"
+    benchmark(is_palindrome, PALINDROME)
+
+
+def test_benchmark_palindrome_index(benchmark) -> None:
+    benchmark.group = "palindrome_check"
+    benchmark.pedantic(PalindromeIndex, (PALINDROME,), rounds=3)
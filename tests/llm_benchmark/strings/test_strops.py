@@ -0,0 +1,175 @@
+import io
+import mmap
+import os
+
+import pytest
+
+from llm_benchmark.bench.memory import KiB, MiB, measure
+from llm_benchmark.bench.runner import available_cpus
+from llm_benchmark.strings.strops import CHUNK_SIZE, StrOps
+
+
+@pytest.mark.parametrize(
+    "s, ref",
+    [
+        ("", ""),
+        ("abc", "cba"),
+        (b"abc", b"cba"),
+        (bytearray(b"abc"), bytearray(b"cba")),
+        (memoryview(b"abc"), bytearray(b"cba")),
+    ],
+)
+def test_str_reverse(s, ref) -> None:
+    assert StrOps.str_reverse(s) == ref
+    assert type(StrOps.str_reverse(s)) is type(ref)
+
+
+def test_str_reverse_memoryview_copies_once() -> None:
+    view = memoryview(bytes(range(256)) * 4096)
+    stats = measure(StrOps.str_reverse, view)
+    assert stats.peak < len(view) + 64 * KiB
+    assert StrOps.str_reverse(view[1:-1:2]) == view.tobytes()[1:-1:2][::-1]
+
+
+@pytest.mark.parametrize(
+    "s, expected",
+    [
+        ("", True),
+        ("racecar", True),
+        ("abca", False),
+        (b"abba", True),
+        (b"abab", False),
+        (bytearray(b"xyzyx"), True),
+        (memoryview(b"level"), True),
+    ],
+)
+def test_palindrome(s, expected: bool) -> None:
+    assert StrOps.palindrome(s) == expected
+
+
+@pytest.mark.parametrize("n", [0, 1, 6, 7, 64, 101])
+@pytest.mark.parametrize("chunk_size", [1, 4, 1 << 20])
+def test_chunked_buffers(n: int, chunk_size: int) -> None:
+    data = bytes(range(n))
+    assert StrOps.palindrome(data + data[::-1], chunk_size) is True
+    assert StrOps.palindrome(data + b"x" + data[::-1], chunk_size) is True
+    if n > 1:
+        assert StrOps.palindrome(data + data, chunk_size) is False
+    out = io.BytesIO()
+    assert StrOps.reverse_to_file(data, out, chunk_size) == n
+    assert out.getvalue() == data[::-1]
+
+
+def test_reverse_inplace() -> None:
+    buf = bytearray(b"hello")
+    StrOps.reverse_inplace(buf)
+    assert buf == bytearray(b"olleh")
+
+
+def test_reverse_mmap_to_file(tmp_path) -> None:
+    src, dst = tmp_path / "in.bin", tmp_path / "out.bin"
+    data = os.urandom(10_000)
+    src.write_bytes(data)
+    with open(src, "rb") as f, open(dst, "wb") as out:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            StrOps.reverse_to_file(mm, out, chunk_size=3_000)
+            assert StrOps.palindrome(mm) is False
+    assert dst.read_bytes() == data[::-1]
+
+
+LARGE = os.environ.get("LLM_BENCHMARK_LARGE") == "1"
+SIZES = [100 << 20, 1 << 30] if LARGE else [10 << 20]
+
+
+def _palindrome_buffer(size: int) -> bytes:
+    half = os.urandom(size // 2)
+    return half + half[::-1]
+
+
+# Peak memory is recorded with --benchmark-memory; none of these should copy
+# more than a chunk at a time, whatever the buffer size
+@pytest.mark.memory_budget(peak=64 * KiB)
+@pytest.mark.parametrize("size", SIZES)
+def test_benchmark_buffer_palindrome(benchmark, size: int) -> None:
+    data = _palindrome_buffer(size)
+    benchmark.extra_info["bytes"] = size
+    assert benchmark.pedantic(StrOps.palindrome, (data,), rounds=3)
+
+
+@pytest.mark.memory_budget(peak=64 * KiB)
+@pytest.mark.parametrize("size", SIZES)
+def test_benchmark_reverse_inplace(benchmark, size: int) -> None:
+    buf = bytearray(size)
+    benchmark.extra_info["bytes"] = size
+    benchmark.pedantic(StrOps.reverse_inplace, (buf,), rounds=3)
+
+
+@pytest.mark.memory_budget(peak=2 * CHUNK_SIZE + 1 * MiB)
+@pytest.mark.parametrize("size", SIZES)
+def test_benchmark_reverse_to_file(benchmark, size: int, tmp_path) -> None:
+    data = bytes(size)
+    benchmark.extra_info["bytes"] = size
+
+    def run() -> None:
+        with open(tmp_path / "out.bin", "wb") as out:
+            StrOps.reverse_to_file(data, out)
+
+    benchmark.pedantic(run, rounds=3)
+
+
+STRINGS = ["", "a", "ab", "aba", "abba", "abc", "racecar", "xy"] * 5
+
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, 3), (2, 3), (2, 1_000)])
+def test_batch(workers: int, chunk_size: int) -> None:
+    assert StrOps.reverse_many(STRINGS, workers, chunk_size) == [
+        StrOps.str_reverse(s) for s in STRINGS
+    ]
+    mask = StrOps.palindrome_many(STRINGS, workers, chunk_size)
+    assert [(mask >> i) & 1 == 1 for i in range(len(STRINGS))] == [
+        StrOps.palindrome(s) for s in STRINGS
+    ]
+    assert mask >> len(STRINGS) == 0
+    assert StrOps.palindrome_many([]) == 0
+    assert StrOps.reverse_many([]) == []
+
+
+# CPUs this process may use; under the runner, pinned shards see only one
+CORES = len(available_cpus())
+WORKERS = sorted({w for w in (1, 2, 4, 8, 16, 32) if w <= CORES} | {CORES})
+BATCHES = [10**3, 10**5] + ([10**7] if LARGE else [])
+
+
+def _batch(n: int) -> list:
+    words = ["level", "python", "noon", "benchmark", "a", "abcba"]
+    return [words[i % len(words)] for i in range(n)]
+
+
+@pytest.mark.multiprocess
+@pytest.mark.parametrize("workers", WORKERS)
+@pytest.mark.parametrize("n", BATCHES)
+def test_benchmark_palindrome_many(benchmark, n: int, workers: int) -> None:
+    benchmark.group = f"palindrome_many_{n}"
+    benchmark(StrOps.palindrome_many, _batch(n), workers)
+
+
+@pytest.mark.parametrize("n", BATCHES)
+def test_benchmark_palindrome_loop(benchmark, n: int) -> None:
+    benchmark.group = f"palindrome_many_{n}"
+    strings = _batch(n)
+    benchmark(lambda: [StrOps.palindrome(s) for s in strings])
+
+
+@pytest.mark.multiprocess
+@pytest.mark.parametrize("workers", WORKERS)
+@pytest.mark.parametrize("n", BATCHES)
+def test_benchmark_reverse_many(benchmark, n: int, workers: int) -> None:
+    benchmark.group = f"reverse_many_{n}"
+    benchmark(StrOps.reverse_many, _batch(n), workers)
+
+
+@pytest.mark.parametrize("n", BATCHES)
+def test_benchmark_reverse_loop(benchmark, n: int) -> None:
+    benchmark.group = f"reverse_many_{n}"
+    strings = _batch(n)
+    benchmark(lambda: [StrOps.str_reverse(s) for s in strings])
@@ -0,0 +1,90 @@
+from random import Random
+from typing import List
+
+import pytest
+
+from llm_benchmark.strings.suffix_array import SuffixArray
+
+
+def _occurrences(text: str, pattern: str) -> List[int]:
+    return [
+        i for i in range(len(text) - len(pattern) + 1) if text.startswith(pattern, i)
+    ]
+
+
+@pytest.mark.parametrize("text", ["", "a", "banana", "mississippi", "aaaaa", "abcäbcä"])
+def test_suffix_array(text: str) -> None:
+    index = SuffixArray(text)
+    assert list(index.sa) == sorted(range(len(text)), key=lambda i: text[i:])
+    suffixes = [text[i:] for i in index.sa]
+    for r in range(1, len(text)):
+        a, b = suffixes[r - 1], suffixes[r]
+        common = next(
+            (k for k in range(min(len(a), len(b))) if a[k] != b[k]), min(len(a), len(b))
+        )
+        assert index.lcp[r] == common
+
+
+@pytest.mark.parametrize("pattern", ["a", "ana", "nan", "banana", "x", "bananas", "n"])
+def test_queries(pattern: str) -> None:
+    index = SuffixArray("banana")
+    assert index.locate(pattern) == _occurrences("banana", pattern)
+    assert index.count(pattern) == len(_occurrences("banana", pattern))
+
+
+def test_queries_random() -> None:
+    rng = Random(0)
+    text = "".join(rng.choice("acgt") for _ in range(2_000))
+    index = SuffixArray(text)
+    for _ in range(200):
+        pattern = "".join(rng.choice("acgt") for _ in range(rng.randint(1, 6)))
+        assert index.locate(pattern) == _occurrences(text, pattern)
+
+
+def test_save_load(tmp_path) -> None:
+    path = str(tmp_path / "index.sa")
+    index = SuffixArray("mississippi ü")
+    index.save(path)
+    with SuffixArray.load(path) as loaded:
+        assert loaded.text == index.text
+        assert list(loaded.sa) == list(index.sa)
+        assert list(loaded.lcp) == list(index.lcp)
+        assert loaded.locate("ssi") == [2, 5]
+    (tmp_path / "bad").write_bytes(bytes(64))
+    with pytest.raises(ValueError):
+        SuffixArray.load(str(tmp_path / "bad"))
+
+
+rng = Random(1)
+CORPUS = "".join(rng.choice("abcdefgh ") for _ in range(100_000))
+PATTERNS = ["abc", "hea", "dd g", "cab", "fff"] * 20
+
+
+def test_patterns_occur() -> None:
+    # The benchmarks time successful searches, not misses
+    index = SuffixArray(CORPUS)
+    for p in set(PATTERNS):
+        assert index.count(p) == len(_occurrences(CORPUS, p)) > 0
+
+
+def test_benchmark_build(benchmark) -> None:
+    benchmark.pedantic(SuffixArray, (CORPUS,), rounds=3)
+
+
+def test_benchmark_count_index(benchmark) -> None:
+    benchmark.group = "substring_count"
+    index = SuffixArray(CORPUS)
+    assert all(benchmark(lambda: [index.count(p) for p in PATTERNS]))
+
+
+def test_benchmark_count_find(benchmark) -> None:
+    benchmark.group = "substring_count"
+
+    def count(pattern: str) -> int:
+        n, i = 0, CORPUS.find(pattern)
+        while i != -1:
+            n += 1
+            i = CORPUS.find(pattern, i + 1)
+        return n
+
+    assert all(benchmark(lambda: [count(p) for p in PATTERNS]))
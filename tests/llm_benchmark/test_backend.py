@@ -0,0 +1,95 @@
+from array import array
+from random import Random
+
+import pytest
+
+from llm_benchmark import backend
+from llm_benchmark.control.double import DoubleForLoop
+from llm_benchmark.datastructures.dslist import DsList
+
+HAS_NUMPY = "numpy" in backend.available_backends()
+BACKENDS = [
+    "python",
+    pytest.param(
+        "numpy", marks=pytest.mark.skipif(not HAS_NUMPY, reason="numpy not installed")
+    ),
+]
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_kernels(name: str) -> None:
+    assert DsList.modify_list([1, 2, 3], backend=name) == [2, 3, 4]
+    assert DsList.search_list([1, 2, 1, 3], 1, backend=name) == [0, 2]
+    assert DsList.search_list([1, 2, 3], 9, backend=name) == []
+    assert DoubleForLoop.sum_matrix([[0, 1], [2, 3]], backend=name) == 6
+    assert DoubleForLoop.count_duplicates([1, 1, 2], [1, 2, 2, 5], backend=name) == 2
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_kernels_fall_back_on_wide_values(name: str) -> None:
+    big = 2**70
+    assert DsList.modify_list([big, 2**63 - 1], backend=name) == [big + 1, 2**63]
+    assert DsList.search_list([big, 1, big], big, backend=name) == [0, 2]
+    assert DoubleForLoop.sum_matrix(
+        [[2**62, 2**62], [2**62, 1]], backend=name
+    ) == (3 * 2**62 + 1)
+    assert DoubleForLoop.sum_matrix([[1, 2], [3]], backend=name) == 6
+
+
+def test_selection() -> None:
+    threshold = backend.get_threshold()
+    buffer = array("q", range(threshold))
+    assert backend.get_backend("python", buffer).name == "python"
+    assert backend.get_backend(data=buffer[:-1]).name == "python"
+    assert backend.get_backend(data=list(buffer)).name == "python"
+    expected = "numpy" if HAS_NUMPY else "python"
+    assert backend.get_backend(data=buffer).name == expected
+    with backend.use_backend("python"):
+        assert backend.get_backend(data=buffer).name == "python"
+    assert backend.get_backend(data=buffer).name == expected
+    with pytest.raises(ValueError):
+        backend.get_backend("fortran")
+    with pytest.raises(ValueError):
+        backend.set_backend("fortran")
+
+
+SIZES = [100, 1_000, 10_000, 100_000]
+
+
+def _values(size: int, kind: str = "list"):
+    rng = Random(size)
+    values = [rng.randint(0, 100) for _ in range(size)]
+    return values if kind == "list" else array("q", values)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("kind", ["list", "array"])
+@pytest.mark.parametrize("size", SIZES)
+def test_benchmark_modify_list(benchmark, name: str, kind: str, size: int) -> None:
+    benchmark.group = f"backend_modify_list_{kind}_{size}"
+    benchmark(DsList.modify_list, _values(size, kind), backend=name)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("kind", ["list", "array"])
+@pytest.mark.parametrize("size", SIZES)
+def test_benchmark_search_list(benchmark, name: str, kind: str, size: int) -> None:
+    benchmark.group = f"backend_search_list_{kind}_{size}"
+    benchmark(DsList.search_list, _values(size, kind), 50, backend=name)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("kind", ["list", "array"])
+@pytest.mark.parametrize("size", SIZES)
+def test_benchmark_count_duplicates(benchmark, name: str, kind: str, size: int) -> None:
+    benchmark.group = f"backend_count_duplicates_{kind}_{size}"
+    arr0, arr1 = _values(size, kind), _values(size + 1, kind)
+    benchmark(DoubleForLoop.count_duplicates, arr0, arr1, backend=name)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("rows", [10, 32, 100, 316])
+def test_benchmark_sum_matrix(benchmark, name: str, rows: int) -> None:
+    benchmark.group = f"backend_sum_matrix_{rows * rows}"
+    matrix = [_values(rows) for _ in range(rows)]
+    benchmark(DoubleForLoop.sum_matrix, matrix, backend=name)
@@ -0,0 +1,105 @@
+import json
+import pstats
+
+import pytest
+
+from llm_benchmark import instrument
+from llm_benchmark.algorithms.primes import Primes
+from llm_benchmark.control.single import SingleForLoop
+from llm_benchmark.datastructures.dslist import DsList
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    yield
+    instrument.uninstall()
+    instrument.reset()
+
+
+def test_install_uninstall() -> None:
+    original = vars(Primes)["is_prime"]
+    instrument.install()
+    assert vars(Primes)["is_prime"] is not original
+    assert Primes.is_prime.__name__ == "is_prime"
+    instrument.install()
+    instrument.uninstall()
+    assert vars(Primes)["is_prime"] is original
+    assert not instrument.is_enabled()
+
+
+def test_counts_and_sizes() -> None:
+    instrument.install()
+    for n in (5, 50, 500):
+        Primes.sum_primes(n)
+    assert DsList.reverse_list([1, 2, 3]) == [3, 2, 1]
+    snap = instrument.snapshot()
+    assert snap["Primes.sum_primes"]["count"] == 3
+    assert snap["Primes.sum_primes"]["size_buckets"] == {"10": 1, "100": 1, "1000": 1}
+    assert snap["DsList.reverse_list"]["size_buckets"] == {"10": 1}
+    assert sum(snap["DsList.reverse_list"]["latency_buckets"].values()) == 1
+    assert snap["Primes.sum_primes"]["total_seconds"] > 0
+    assert json.loads(instrument.to_json()) == snap
+
+
+def test_disable() -> None:
+    instrument.install()
+    instrument.disable()
+    SingleForLoop.sum_range(10)
+    assert instrument.snapshot() == {}
+    instrument.enable()
+    SingleForLoop.sum_range(10)
+    assert instrument.snapshot()["SingleForLoop.sum_range"]["count"] == 1
+
+
+def test_exceptions_are_recorded() -> None:
+    instrument.install()
+    with pytest.raises(ValueError):
+        SingleForLoop.max_list([])
+    assert instrument.snapshot()["SingleForLoop.max_list"]["count"] == 1
+
+
+def test_quantiles() -> None:
+    for _ in range(98):
+        instrument._record("f", 2e-6, None)
+    instrument._record("f", 0.3, None)
+    instrument._record("f", 0.3, None)
+    snap = instrument.snapshot()["f"]
+    assert 1e-6 < snap["p50_seconds"] <= 2.5e-6
+    assert 2.5e-6 < snap["p99_seconds"] <= 0.5
+
+
+def test_prometheus() -> None:
+    instrument.install()
+    Primes.sum_primes(100)
+    Primes.sum_primes(100)
+    text = instrument.to_prometheus()
+    assert "# TYPE llm_benchmark_call_duration_seconds histogram" in text
+    label = 'function="Primes.sum_primes"'
+    assert f'llm_benchmark_call_duration_seconds_bucket{{{label},le="+Inf"}} 2' in text
+    assert f"llm_benchmark_call_duration_seconds_count{{{label}}} 2" in text
+    assert f'llm_benchmark_call_input_size_bucket{{{label},le="100"}} 2' in text
+    assert f"llm_benchmark_call_input_size_sum{{{label}}} 200" in text
+
+
+def test_profile_next() -> None:
+    instrument.install()
+    assert instrument.profile_stats() is None
+    instrument.profile_next(2)
+    for _ in range(3):
+        Primes.sum_primes(1000)
+    stats = instrument.profile_stats()
+    assert isinstance(stats, pstats.Stats)
+    calls = {key[2]: value[1] for key, value in stats.stats.items()}
+    assert calls["sum_primes"] == 2
+    with pytest.raises(ValueError):
+        instrument.profile_next(-1)
+
+
+@pytest.mark.parametrize("mode", ["uninstalled", "disabled", "enabled"])
+def test_benchmark_overhead(benchmark, mode: str) -> None:
+    benchmark.group = "instrument_overhead"
+    if mode != "uninstalled":
+        instrument.install(["llm_benchmark.control.single:SingleForLoop"])
+    if mode == "disabled":
+        instrument.disable()
+    benchmark(SingleForLoop.sum_range, 100)
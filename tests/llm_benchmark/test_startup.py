@@ -0,0 +1,121 @@
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Set
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Cumulative `-X importtime` of `import main`, in microseconds. Before lazy
+# loading it was ~120 ms, mostly sqlite3 and multiprocessing.
+IMPORT_BUDGET_US = 80_000
+
+# Wall time of a cold `python -c "import main"`, in seconds, interpreter
+# startup included
+COLD_START_BUDGET = 0.5
+
+# Modules that must not be imported until the code using them runs
+HEAVY = ["sqlite3", "multiprocessing", "concurrent.futures", "numpy"]
+
+
+def _python(
+    code: str, *flags: str, cwd: Optional["os.PathLike[str]"] = None
+) -> "subprocess.CompletedProcess[str]":
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([ROOT, os.path.join(ROOT, "src")])
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _loaded(code: str, cwd: Optional["os.PathLike[str]"] = None) -> Set[str]:
+    out = _python(code + "\nimport sys\nprint('\\n'.join(sys.modules))", cwd=cwd)
+    return set(out.stdout.split())
+
+
+def _import_times(module: str) -> Dict[str, int]:
+    """Cumulative import time in microseconds per imported module"""
+    err = _python(f"import {module}", "-X", "importtime").stderr
+    times = {}
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", ["llm_benchmark", "main"])
+def test_import_is_light(module: str, tmp_path) -> None:
+    loaded = _loaded(f"import {module}", cwd=tmp_path)
+    assert not loaded & set(HEAVY)
+    assert not [m for m in loaded if m.startswith("llm_benchmark.")]
+
+
+def test_import_creates_no_logs(tmp_path) -> None:
+    _python("import main", cwd=tmp_path)
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize(
+    "code, expected, absent",
+    [
+        ("llm_benchmark.StrOps", "llm_benchmark.strings.strops", ["sqlite3"]),
+        ("llm_benchmark.Primes", "llm_benchmark.algorithms.primes", ["sqlite3"]),
+        ("llm_benchmark.SqlQuery", "sqlite3", []),
+        ("llm_benchmark.instrument", "llm_benchmark.instrument", ["sqlite3"]),
+    ],
+)
+def test_lazy_attribute(code: str, expected: str, absent: List[str], tmp_path) -> None:
+    loaded = _loaded(f"import llm_benchmark\n{code}", cwd=tmp_path)
+    assert expected in loaded
+    assert not loaded & set(absent)
+
+
+def test_strops_section_skips_sql_and_multiprocessing(tmp_path) -> None:
+    loaded = _loaded("import main\nmain.strops()", cwd=tmp_path)
+    assert "llm_benchmark.strings.strops" in loaded
+    assert not loaded & set(HEAVY)
+
+
+def test_unknown_attribute() -> None:
+    import llm_benchmark
+
+    with pytest.raises(AttributeError):
+        llm_benchmark.NoSuchThing
+    assert "StrOps" in dir(llm_benchmark)
+
+
+def test_lazy_attribute_is_the_class() -> None:
+    import llm_benchmark
+    from llm_benchmark.strings.strops import StrOps
+
+    assert llm_benchmark.StrOps is StrOps
+
+
+def test_configure_logging(tmp_path) -> None:
+    _python("import main\nmain.configure_logging('logs').stop()", cwd=tmp_path)
+    assert os.listdir(tmp_path / "logs") == ["main.log"]
+
+
+def test_benchmark_import_time(benchmark) -> None:
+    benchmark.group = "startup"
+    times = benchmark.pedantic(_import_times, args=("main",), rounds=3)
+    benchmark.extra_info["import_us"] = times["main"]
+    assert times["main"] < IMPORT_BUDGET_US
+
+
+def test_benchmark_cold_start(benchmark, tmp_path) -> None:
+    benchmark.group = "startup"
+    benchmark.pedantic(
+        _python, args=("import main",), kwargs={"cwd": tmp_path}, rounds=5
+    )
+    if benchmark.stats is not None:
+        assert benchmark.stats.stats.min < COLD_START_BUDGET
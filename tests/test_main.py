@@ -0,0 +1,356 @@
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import time
+from typing import Dict, Iterator, List, Optional, Union
+
+import pytest
+
+import main
+from llm_benchmark import SingleForLoop
+
+# Mean time a log call may take on the calling thread, in seconds
+LOG_CALL_BUDGET = 50e-6
+
+
+class SlowHandler(logging.Handler):
+    """Handler standing in for a slow disk or terminal"""
+
+    def __init__(self, delay: float = 1e-4) -> None:
+        super().__init__()
+        self.delay = delay
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        time.sleep(self.delay)
+        self.count += 1
+
+
+@pytest.fixture
+def root_logger() -> Iterator[logging.Logger]:
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield root
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+@pytest.fixture
+def listener(tmp_path, root_logger: logging.Logger) -> Iterator[main.LogListener]:
+    listener = main.configure_logging(str(tmp_path), level="DEBUG", console=False)
+    yield listener
+    if listener._thread is not None:
+        listener.stop()
+
+
+def _lines(path: "os.PathLike[str]") -> List[str]:
+    with open(path) as f:
+        return f.read().splitlines()
+
+
+def test_import_leaves_logging_alone() -> None:
+    assert not any(
+        isinstance(h, logging.handlers.QueueHandler)
+        for h in logging.getLogger().handlers
+    )
+
+
+def test_configure_logging(tmp_path, listener: main.LogListener) -> None:
+    # pytest adds its own capture handlers around each test
+    queue_handlers = [
+        h
+        for h in logging.getLogger().handlers
+        if isinstance(h, logging.handlers.QueueHandler)
+    ]
+    assert len(queue_handlers) == 1
+    logging.getLogger("test").debug("hello %s", "world")
+    listener.stop()
+    lines = _lines(tmp_path / "main.log")
+    assert lines[0].endswith(
+        "INFO - configure_logging - Logging infrastructure initialized"
+    )
+    assert lines[1].endswith("DEBUG - test_configure_logging - hello world")
+
+
+@pytest.mark.parametrize("level", ["WARNING", logging.WARNING])
+def test_configure_logging_level(
+    tmp_path, root_logger: logging.Logger, level: Union[int, str]
+) -> None:
+    listener = main.configure_logging(str(tmp_path), level=level, console=False)
+    log = logging.getLogger("test")
+    log.info("dropped")
+    log.warning("kept")
+    listener.stop()
+    assert [line.rsplit(" - ", 1)[1] for line in _lines(tmp_path / "main.log")] == [
+        "kept"
+    ]
+
+
+def test_configure_logging_rotation(tmp_path, root_logger: logging.Logger) -> None:
+    listener = main.configure_logging(
+        str(tmp_path), console=False, max_bytes=1000, backup_count=2
+    )
+    for i in range(100):
+        logging.getLogger("test").info("record %d", i)
+    listener.stop()
+    assert sorted(os.listdir(tmp_path)) == ["main.log", "main.log.1", "main.log.2"]
+    assert _lines(tmp_path / "main.log")[-1].endswith("record 99")
+
+
+def test_batching_handler(tmp_path) -> None:
+    path = str(tmp_path / "batch.log")
+    handler = main.BatchingRotatingFileHandler(path, capacity=4, flush_interval=60)
+    log = logging.getLogger("batch")
+    log.propagate = False
+    log.addHandler(handler)
+    try:
+        for i in range(3):
+            log.warning("record %d", i)
+        assert os.path.getsize(path) == 0
+        log.warning("record 3")
+        assert len(_lines(path)) == 4
+        log.warning("record 4")
+        log.error("record 5")
+        assert len(_lines(path)) == 6
+    finally:
+        log.removeHandler(handler)
+        log.propagate = True
+        handler.close()
+
+
+def test_batching_handler_interval(tmp_path) -> None:
+    path = str(tmp_path / "batch.log")
+    handler = main.BatchingRotatingFileHandler(path, flush_interval=0)
+    handler.emit(logging.makeLogRecord({"msg": "now", "levelno": logging.INFO}))
+    assert _lines(path) == ["now"]
+    handler.close()
+
+
+def test_log_call_budget(listener: main.LogListener) -> None:
+    slow = SlowHandler()
+    listener.handlers += (slow,)
+    log = logging.getLogger("test")
+    n = 2000
+    start = time.perf_counter()
+    for i in range(n):
+        log.info("record %d", i)
+    elapsed = time.perf_counter() - start
+    listener.stop()
+    assert slow.count >= n
+    assert elapsed / n < LOG_CALL_BUDGET
+
+
+def test_main_logs_sections(tmp_path, root_logger: logging.Logger, capsys) -> None:
+    argv = ["single", "strops", "--logs-dir", str(tmp_path), "--log-level", "DEBUG"]
+    assert main.main(argv) == 0
+    lines = _lines(tmp_path / "main.log")
+    assert "single finished in" in lines[1]
+    assert "strops finished in" in lines[2]
+    out = capsys.readouterr().out
+    assert out.index("SingleForLoop") < out.index("Strops") < out.index("Timing")
+
+
+@pytest.mark.parametrize(
+    "argv, sections, sizes, jobs, efficient",
+    [
+        ([], list(main.SECTIONS), {}, 1, False),
+        (["primes", "sort"], ["primes", "sort"], {}, 1, False),
+        (["-j", "4", "--efficient"], list(main.SECTIONS), {}, 4, True),
+        (
+            ["--size", "primes=97", "--size=sort=3"],
+            list(main.SECTIONS),
+            {"primes": 97, "sort": 3},
+            1,
+            False,
+        ),
+    ],
+)
+def test_parse_args(
+    argv: List[str],
+    sections: List[str],
+    sizes: Dict[str, int],
+    jobs: int,
+    efficient: bool,
+) -> None:
+    args = main.parse_args(argv)
+    assert args.sections == sections
+    assert args.sizes == sizes
+    assert args.jobs == jobs
+    assert args.efficient == efficient
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["nosuch"],
+        ["--size", "primes"],
+        ["--size", "primes=x"],
+        ["--size", "primes=0"],
+        ["--size", "sql=3"],
+        ["--jobs", "0"],
+        ["single", "primes", "--efficient"],
+    ],
+)
+def test_parse_args_error(argv: List[str], capsys) -> None:
+    with pytest.raises(SystemExit) as e:
+        main.parse_args(argv)
+    assert e.value.code == 2
+
+
+@pytest.mark.parametrize(
+    "name, n, expected",
+    [
+        ("single", None, "sum_range(10): 45"),
+        ("single", 100, "sum_range(100): 4950"),
+        ("primes", 97, "is_prime(97): True"),
+        ("sort", 3, "sort_list([3, 2, 1]): [1, 2, 3]"),
+        ("dslist", 3, "Original list: [1, 2, 3]"),
+        ("strops", 2, "Original string: racecarracecar"),
+    ],
+)
+def test_run_section(name: str, n: Optional[int], expected: str) -> None:
+    result = main.run_section(name, n)
+    assert result.name == name
+    assert expected in result.output.splitlines()
+    assert result.seconds > 0
+
+
+@pytest.mark.parametrize("name", ["primes", "sort"])
+def test_run_section_efficient(name: str) -> None:
+    # The efficient variants compute the same results
+    assert main.run_section(name, 50).output == main.run_section(name, 50, True).output
+
+
+def test_run_section_efficient_sql() -> None:
+    assert main.run_section("sql").output == main.run_section("sql", None, True).output
+
+
+def test_run_section_no_efficient_variant() -> None:
+    assert main.EFFICIENT == ["double", "sql", "primes", "sort"]
+    with pytest.raises(ValueError):
+        main.run_section("strops", efficient=True)
+
+
+def test_run_section_efficient_double() -> None:
+    lines = main.run_section("double", 20, True).output.splitlines()
+    assert "sum_square(20): 2470" in lines
+    assert lines[-2].startswith("sum_matrix(random_matrix(20, 10)): ")
+
+
+def test_run_sections_jobs() -> None:
+    names = ["strops", "single", "sort", "primes"]
+    sizes = {"primes": 97}
+    sequential = list(main.run_sections(names, sizes))
+    parallel = list(main.run_sections(names, sizes, jobs=3))
+    assert [r.name for r in parallel] == names
+    assert [r.output for r in parallel] == [r.output for r in sequential]
+
+
+def test_run_sections_efficient() -> None:
+    names = ["single", "primes"]
+    results = list(main.run_sections(names, {"primes": 97}, efficient=True))
+    assert [r.output for r in results] == [
+        main.run_section("single").output,
+        main.run_section("primes", 97, True).output,
+    ]
+
+
+def _logging_section(n: int = 1) -> None:
+    logging.getLogger("main").info("section %d", n)
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="workers must inherit the patched SECTIONS",
+)
+def test_run_sections_jobs_logs(monkeypatch, caplog) -> None:
+    monkeypatch.setitem(main.SECTIONS, "logs", _logging_section)
+    with caplog.at_level(logging.INFO):
+        names = [r.name for r in main.run_sections(["logs", "single"], jobs=2)]
+    assert names == ["logs", "single"]
+    assert [r.getMessage() for r in caplog.records if r.name == "main"] == ["section 1"]
+
+
+def test_format_timings() -> None:
+    results = [
+        main.SectionResult("single", "", 0.001),
+        main.SectionResult("primes", "", 0.5),
+    ]
+    assert main.format_timings(results, 0.25, 2).splitlines() == [
+        "Timing",
+        "------",
+        "single       1.000 ms",
+        "primes     500.000 ms",
+        "total      501.000 ms",
+        "wall       250.000 ms (2 jobs)",
+    ]
+
+
+@pytest.mark.parametrize("efficient", [False, True])
+def test_benchmark_primes_section(benchmark, efficient: bool) -> None:
+    benchmark.group = "main: primes section"
+    benchmark.extra_info["efficient"] = efficient
+    result = benchmark.pedantic(
+        main.run_section, args=("primes", None, efficient), rounds=3
+    )
+    assert "is_prime(1700): False" in result.output
+
+
+@pytest.mark.multiprocess
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_benchmark_run_sections(benchmark, jobs: int) -> None:
+    benchmark.group = "main: sections"
+    benchmark.extra_info["jobs"] = jobs
+    names = ["single", "double", "primes", "sort", "dslist", "strops"]
+    results = benchmark.pedantic(
+        lambda: list(main.run_sections(names, jobs=jobs)), rounds=3
+    )
+    assert [r.name for r in results] == names
+
+
+@pytest.mark.parametrize("mode", ["queue", "sync"])
+def test_benchmark_log_slow_handler(
+    benchmark, root_logger: logging.Logger, mode: str
+) -> None:
+    benchmark.group = "logging: slow handler"
+    slow = SlowHandler()
+    root_logger.setLevel(logging.INFO)
+    if mode == "queue":
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, slow)
+        root_logger.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+        listener.start()
+    else:
+        root_logger.handlers[:] = [slow]
+    log = logging.getLogger("test")
+
+    def log_loop() -> None:
+        for i in range(100):
+            log.info("record %d", i)
+
+    benchmark.pedantic(log_loop, rounds=10)
+    if mode == "queue":
+        listener.stop()
+    assert slow.count % 100 == 0 and slow.count > 0
+
+
+@pytest.mark.parametrize("level", ["INFO", "DEBUG"])
+def test_benchmark_section_loop(
+    benchmark, listener: main.LogListener, level: str
+) -> None:
+    # DEBUG logs every iteration, INFO filters the calls out
+    benchmark.group = "logging: demo loop"
+    benchmark.extra_info["level"] = level
+    logging.getLogger().setLevel(level)
+    log = logging.getLogger("main")
+
+    def section_loop() -> int:
+        total = 0
+        for n in range(200):
+            total += SingleForLoop.sum_range(n)
+            log.debug("sum_range(%d) = %d", n, total)
+        return total
+
+    assert benchmark(section_loop) == sum(n * (n - 1) // 2 for n in range(200))